@@ -0,0 +1,187 @@
+import argparse
+import json
+import platform
+import statistics
+import sys
+import time
+from benchmarks.scenarios import all_scenarios
+from core.sim_thread import take_snapshot
+from core.stream import StreamEncoder
+from ui.renderer import CanvasRenderer
+
+
+def summarize(samples):
+    samples = sorted(samples)
+    return {
+        "ticks": len(samples),
+        "mean_ms": round(statistics.fmean(samples) * 1000, 4),
+        "p50_ms": round(samples[len(samples) // 2] * 1000, 4),
+        "p95_ms": round(samples[min(len(samples) - 1, int(len(samples) * 0.95))] * 1000, 4),
+        "max_ms": round(samples[-1] * 1000, 4),
+    }
+
+
+def time_simulation(build, seed, use_arrays, ticks, warmup):
+    sim = build(seed, use_arrays)
+    for _ in range(warmup):
+        sim.step()
+    samples = []
+    for _ in range(ticks):
+        started = time.perf_counter()
+        sim.step()
+        samples.append(time.perf_counter() - started)
+    result = summarize(samples)
+    result["enemies"] = len(sim.enemies)
+    result["projectiles"] = len(sim.projectiles)
+    result["pools"] = sim.pool_stats()
+    return result
+
+
+def time_render(root, build, seed, use_arrays, ticks, warmup):
+    import tkinter as tk
+    canvas = tk.Canvas(root, width=800, height=600)
+    canvas.pack()
+    renderer = CanvasRenderer(canvas)
+    sim = build(seed, use_arrays)
+    samples = []
+    try:
+        for tick in range(warmup + ticks):
+            started = time.perf_counter()
+            sim.step()
+            renderer.render(sim.towers, sim.enemy_states(), sim.projectile_states(), True)
+            canvas.update_idletasks()
+            if tick >= warmup:
+                samples.append(time.perf_counter() - started)
+    finally:
+        canvas.destroy()
+    return summarize(samples)
+
+
+def time_stream(build, seed, use_arrays, ticks, warmup):
+    # Spectator stream encode cost and bandwidth; the snapshot itself isn't timed
+    sim = build(seed, use_arrays)
+    encoder = StreamEncoder()
+    samples = []
+    sizes = []
+    entities = 0
+    for tick in range(warmup + ticks):
+        sim.step()
+        snapshot = take_snapshot(sim, 0.0)
+        started = time.perf_counter()
+        message = encoder.encode(snapshot)
+        elapsed = time.perf_counter() - started
+        if tick >= warmup:
+            samples.append(elapsed)
+            sizes.append(len(message))
+            entities += len(snapshot.towers) + len(snapshot.enemies) + len(snapshot.projectiles)
+    result = summarize(samples)
+    result["bytes_per_tick"] = round(statistics.fmean(sizes), 1)
+    result["keyframe_bytes"] = len(encoder.keyframe())
+    result["us_per_entity"] = round(sum(samples) / max(entities, 1) * 1e6, 3)
+    return result
+
+
+def make_offscreen_root():
+    try:
+        import tkinter as tk
+        root = tk.Tk()
+    except Exception as e:  # No display (CI) or no Tk: render timings are skipped
+        print(f"Render benchmarks skipped: {e}", file=sys.stderr)
+        return None
+    root.withdraw()
+    return root
+
+
+def check_baseline(results, baseline):
+    # Timings from another backend or seed aren't comparable
+    for key in ("backend", "seed"):
+        if baseline.get(key) != results[key]:
+            raise ValueError(f"baseline {key} is {baseline.get(key)!r}, this run's is {results[key]!r}")
+
+
+def compare(results, baseline, threshold):
+    """
+    Regressions where a scenario's mean tick time grew by more than `threshold`
+    (a fraction) over the baseline. Raises ValueError if the baseline was run with
+    a different backend or seed, since its timings aren't comparable.
+    """
+    check_baseline(results, baseline)
+    regressions = []
+    for name, phases in results["scenarios"].items():
+        for phase, stats in phases.items():
+            base = baseline.get("scenarios", {}).get(name, {}).get(phase)
+            if not base or not base["mean_ms"]:
+                continue
+            change = stats["mean_ms"] / base["mean_ms"] - 1
+            stats["change"] = round(change, 4)
+            if change > threshold:
+                regressions.append((name, phase, base["mean_ms"], stats["mean_ms"], change))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Time fixed, seeded simulation and render scenarios.")
+    parser.add_argument("--filter", default="", help="only run scenarios whose name contains this")
+    parser.add_argument("--ticks", type=int, default=120, help="measured ticks per scenario")
+    parser.add_argument("--warmup", type=int, default=10, help="untimed ticks before measuring")
+    parser.add_argument("--seed", type=int, default=1234)
+    parser.add_argument("--arrays", action="store_true", help="use the NumPy array-backed simulation")
+    parser.add_argument("--no-render", action="store_true", help="skip the simulation+render phase")
+    parser.add_argument("--no-stream", action="store_true", help="skip the spectator stream encode phase")
+    parser.add_argument("--output", help="write the JSON results here instead of stdout")
+    parser.add_argument("--baseline", help="JSON results to compare against; exits 1 on regression")
+    parser.add_argument("--threshold", type=float, default=0.10,
+                        help="allowed slowdown against the baseline (default 0.10 = 10%%)")
+    args = parser.parse_args(argv)
+
+    root = None if args.no_render else make_offscreen_root()
+    results = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "backend": "arrays" if args.arrays else "objects",
+        "seed": args.seed,
+        "scenarios": {},
+    }
+    baseline = None
+    if args.baseline:
+        with open(args.baseline, "r") as f:
+            baseline = json.load(f)
+        try:
+            check_baseline(results, baseline)  # Before spending minutes on the run
+        except ValueError as e:
+            parser.error(f"can't compare with {args.baseline}: {e}")
+
+    try:
+        for name, build in all_scenarios():
+            if args.filter not in name:
+                continue
+            phases = {"simulation": time_simulation(build, args.seed, args.arrays, args.ticks, args.warmup)}
+            if root is not None:
+                phases["render"] = time_render(root, build, args.seed, args.arrays, args.ticks, args.warmup)
+            if not args.no_stream:
+                phases["stream"] = time_stream(build, args.seed, args.arrays, args.ticks, args.warmup)
+            results["scenarios"][name] = phases
+            print(f"{name}: {phases['simulation']['mean_ms']:.3f} ms/tick", file=sys.stderr)
+    finally:
+        if root is not None:
+            root.destroy()
+
+    regressions = []
+    if baseline is not None:
+        regressions = compare(results, baseline, args.threshold)
+
+    output = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output + "\n")
+    else:
+        print(output)
+
+    for name, phase, before, after, change in regressions:
+        print(f"REGRESSION {name} [{phase}]: {before:.3f} -> {after:.3f} ms/tick (+{change:.0%})",
+              file=sys.stderr)
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
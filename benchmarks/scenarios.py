@@ -0,0 +1,80 @@
+import os
+import random
+from core.levels import LEVELS_DIR, list_level_files, load_level_data
+from core.simulation import Simulation
+from entities.tower import Tower
+
+# A fixed serpentine path across the default 800x600 canvas, so synthetic scenes
+# don't change when a shipped level is edited
+BENCH_PATH = [(0, 75), (750, 75), (750, 225), (50, 225), (50, 375),
+              (750, 375), (750, 525), (0, 525)]
+
+
+def make_simulation(path, towers, seed, use_arrays):
+    if use_arrays:
+        from core.arrays import ArraySimulation
+        return ArraySimulation(path, towers, seed=seed)
+    return Simulation(path, towers, seed=seed)
+
+
+def populate(sim, tower_count, enemy_count, rng, enemy_health=1e9, enemy_speed=0.5):
+    """
+    Add seeded random towers and enemies spread evenly along the path. Enemies are
+    effectively immortal and lives unlimited, so entity counts stay steady.
+    """
+    sim.lives = 10 ** 9
+    for _ in range(tower_count):
+        sim.towers.append(Tower(rng.uniform(0, 800), rng.uniform(0, 600)))
+
+    path = sim.get_compiled_path()
+    for i in range(enemy_count):
+        enemy = sim.create_enemy(False)
+        enemy.distance = path.length * i / enemy_count
+        enemy.x, enemy.y = path.position_at(enemy.distance)
+        enemy.health = enemy_health
+        enemy.speed = enemy_speed
+        sim.add_enemy(enemy)
+
+
+def level_scenario(level_file):
+    def build(seed, use_arrays):
+        level_data = load_level_data(level_file)
+        sim = make_simulation(level_data["path"], level_data["towers"], seed, use_arrays)
+        sim.ENEMIES_PER_WAVE = 50
+        sim.SPAWN_INTERVAL = 200
+        sim.start_wave()
+        return sim
+    return build
+
+
+def crowd_scenario(tower_count, enemy_count):
+    def build(seed, use_arrays):
+        sim = make_simulation(BENCH_PATH, [], seed, use_arrays)
+        populate(sim, tower_count, enemy_count, random.Random(seed))
+        return sim
+    return build
+
+
+def projectile_storm(seed, use_arrays):
+    # Many fast-firing towers packed around a dense crowd
+    sim = make_simulation(BENCH_PATH, [], seed, use_arrays)
+    populate(sim, 200, 1000, random.Random(seed))
+    for tower in sim.towers:
+        tower.fire_rate = 0.02
+    return sim
+
+
+def all_scenarios(levels_dir=LEVELS_DIR):
+    """
+    (name, builder) pairs; builder(seed, use_arrays) returns a ready Simulation.
+    """
+    scenarios = []
+    for level_file in list_level_files(levels_dir):
+        name = os.path.splitext(level_file)[0].lower().replace(" ", "_")
+        scenarios.append((f"level:{name}", level_scenario(os.path.join(levels_dir, level_file))))
+    for tower_count in (10, 100, 1000):
+        for enemy_count in (100, 1000, 10000):
+            scenarios.append((f"towers{tower_count}_enemies{enemy_count}",
+                              crowd_scenario(tower_count, enemy_count)))
+    scenarios.append(("projectile_storm", projectile_storm))
+    return scenarios
@@ -0,0 +1,290 @@
+import math
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; only the array-backed simulation needs it
+    np = None
+
+from core.simulation import Simulation
+
+
+class EntityArrays:
+    """
+    Struct-of-arrays storage: one NumPy column per field, live rows packed at the
+    front. Rows are removed in bulk with compact() instead of one list.remove each.
+    """
+
+    FIELDS = ()  # (name, dtype) pairs
+
+    def __init__(self, capacity=64):
+        self.count = 0
+        self.capacity = capacity
+        for name, dtype in self.FIELDS:
+            setattr(self, name, np.zeros(capacity, dtype=dtype))
+
+    def __len__(self):
+        return self.count
+
+    def append(self, **values):
+        if self.count == self.capacity:
+            self.grow()
+        index = self.count
+        for name, value in values.items():
+            getattr(self, name)[index] = value
+        self.count += 1
+        return index
+
+    def grow(self):
+        self.capacity *= 2
+        for name, dtype in self.FIELDS:
+            column = np.zeros(self.capacity, dtype=dtype)
+            column[:self.count] = getattr(self, name)[:self.count]
+            setattr(self, name, column)
+
+    def compact(self, keep):
+        """
+        Drop every live row where `keep` is False, preserving order. Returns an array
+        mapping old row indices to new ones (-1 for dropped rows).
+        """
+        kept = np.flatnonzero(keep)
+        for name, _ in self.FIELDS:
+            column = getattr(self, name)
+            column[:len(kept)] = column[kept]
+
+        remap = np.full(self.count, -1, dtype=np.int64)
+        remap[kept] = np.arange(len(kept))
+        self.count = len(kept)
+        return remap
+
+    def clear(self):
+        self.count = 0
+
+
+class EnemyArrays(EntityArrays):
+    FIELDS = (
+        ("ids", "i8"),
+        ("x", "f8"),
+        ("y", "f8"),
+        ("speed", "f8"),
+        ("health", "f8"),
+        ("size_multiplier", "f8"),
+        ("distance", "f8"),  # Distance travelled along the path
+    )
+
+
+class ProjectileArrays(EntityArrays):
+    FIELDS = (
+        ("ids", "i8"),
+        ("x", "f8"),
+        ("y", "f8"),
+        ("prev_x", "f8"),
+        ("prev_y", "f8"),
+        ("speed", "f8"),
+        ("target", "i8"),  # Row of the target in EnemyArrays
+        ("source", "i8"),  # Index of the firing tower in Simulation.towers
+        ("damage", "f8"),
+    )
+
+
+class ArraySimulation(Simulation):
+    """
+    Simulation whose enemies and projectiles live in EnemyArrays/ProjectileArrays.
+    Movement, end-of-path detection, culling, targeting and projectile homing each
+    run as one batched NumPy pass per tick. Towers stay regular Tower objects.
+    """
+
+    def __init__(self, enemy_path=None, towers=None, seed=None, settings=None):
+        if np is None:
+            raise ImportError("ArraySimulation requires NumPy")
+        super().__init__(enemy_path, towers, seed, settings)
+        self.enemies = EnemyArrays()
+        self.projectiles = ProjectileArrays()
+        self.path_arrays = None
+        self.path_arrays_source = None  # CompiledPath the arrays were taken from
+
+    def release_entities(self):
+        # Rows aren't pooled; the pools only lend templates to add_enemy()
+        self.enemies = EnemyArrays()
+        self.projectiles = ProjectileArrays()
+
+    def enemy_states(self):
+        e = self.enemies
+        n = e.count
+        return list(zip(e.ids[:n].tolist(), e.x[:n].tolist(), e.y[:n].tolist(),
+                        e.health[:n].tolist(), e.size_multiplier[:n].tolist()))
+
+    def projectile_states(self):
+        p = self.projectiles
+        n = p.count
+        return list(zip(p.ids[:n].tolist(), p.x[:n].tolist(), p.y[:n].tolist()))
+
+    def entity_columns(self):
+        e = self.enemies
+        p = self.projectiles
+        enemies = {name: getattr(e, name)[:e.count] for name, _ in e.FIELDS}
+        projectiles = {name: getattr(p, name)[:p.count] for name, _ in p.FIELDS}
+        projectiles["target"] = e.ids[p.target[:p.count]]  # Rows to ids
+        return enemies, projectiles
+
+    def restore_entities(self, enemies, projectiles):
+        e = self.enemies = EnemyArrays(max(64, len(enemies["ids"])))
+        for name, _ in e.FIELDS:
+            getattr(e, name)[:len(enemies[name])] = enemies[name]
+        e.count = len(enemies["ids"])
+
+        # Ids back to rows; the id column is sorted (see resolve_hit)
+        target_ids = np.asarray(projectiles["target"], dtype=np.int64)
+        rows = np.minimum(np.searchsorted(e.ids[:e.count], target_ids), max(e.count - 1, 0))
+        keep = (e.ids[rows] == target_ids) if e.count else np.zeros(len(target_ids), dtype=bool)
+        p = self.projectiles = ProjectileArrays(max(64, len(target_ids)))
+        for name, _ in p.FIELDS:
+            values = rows if name == "target" else np.asarray(projectiles[name])
+            getattr(p, name)[:len(target_ids)] = values
+        p.count = len(target_ids)
+        p.compact(keep)
+        return None  # Hits are resolved by enemy id
+
+    def get_path_arrays(self):
+        # Array copies of the compiled path, which is rebuilt whenever the path is edited
+        path = self.get_compiled_path()
+        if self.path_arrays_source is not path:
+            self.path_arrays = (
+                np.asarray(path.points, dtype=np.float64).reshape(-1, 2),
+                np.asarray(path.cumulative, dtype=np.float64),
+                np.asarray(path.directions, dtype=np.float64).reshape(-1, 2),
+            )
+            self.path_arrays_source = path
+        return self.path_arrays
+
+    def add_enemy(self, enemy):
+        self.enemies.append(ids=enemy.id, x=enemy.x, y=enemy.y, speed=enemy.speed,
+                            health=enemy.health, size_multiplier=enemy.size_multiplier,
+                            distance=enemy.distance)
+        self.enemy_pool.release(enemy)  # Only a template for the new row
+
+    def update_enemies(self):
+        e = self.enemies
+        n = e.count
+        if n == 0:
+            return
+
+        # Advance along the path, then look every position up in the arc-length table
+        path = self.get_compiled_path()
+        points, cumulative, directions = self.get_path_arrays()
+        distance = e.distance[:n]
+        distance += e.speed[:n]
+        reached_end = distance >= path.length
+        np.minimum(distance, path.length, out=distance)
+
+        segment = np.searchsorted(cumulative, distance, side='right') - 1
+        np.clip(segment, 0, len(directions) - 1, out=segment)
+        offset = distance - cumulative[segment]
+        e.x[:n] = points[segment, 0] + directions[segment, 0] * offset
+        e.y[:n] = points[segment, 1] + directions[segment, 1] * offset
+
+        leaked = int(np.count_nonzero(reached_end))
+        if leaked:
+            self.lives -= leaked
+            if self.lives <= 0:
+                self.game_over = True
+                self.events.append(("game_over", self.score))
+                return
+
+        dead = (e.health[:n] <= 0) & ~reached_end
+        defeated = int(np.count_nonzero(dead))
+        if defeated:
+            self.enemies_defeated += defeated
+            self.money += defeated * self.ENEMY_REWARD
+            self.score += defeated * self.ENEMY_SCORE
+
+        if leaked or defeated:
+            remap = e.compact(~(reached_end | dead))
+            self.retarget_projectiles(remap)
+            self.check_wave_completion()
+
+    def resolve_hit(self, target, target_id, tower, damage):
+        # Rows only ever get appended with new ids and compacted in order, so the
+        # id column is sorted; a missing id means the enemy is gone
+        e = self.enemies
+        row = int(np.searchsorted(e.ids[:e.count], target_id))
+        if row < e.count and e.ids[row] == target_id:
+            e.health[row] -= damage
+            tower.damage_dealt += damage
+
+    def retarget_projectiles(self, remap):
+        # Point projectiles at their targets' new rows; drop those whose target is gone
+        p = self.projectiles
+        if p.count == 0:
+            return
+        target = p.target[:p.count]
+        target[:] = remap[target]
+        p.compact(target >= 0)
+
+    def update_towers(self):
+        e = self.enemies
+        n = e.count
+        x, y = e.x[:n], e.y[:n]
+        for index, tower in enumerate(self.towers):
+            tower.can_shoot = self.time - tower.last_shot >= tower.fire_rate
+            if n == 0:
+                continue
+
+            distance = np.hypot(x - tower.x, y - tower.y)
+            distance[distance >= tower.range] = np.inf
+            closest = int(np.argmin(distance))
+            if distance[closest] == np.inf:
+                continue
+
+            tower.turret_angle = math.degrees(math.atan2(y[closest] - tower.y, x[closest] - tower.x))
+            if tower.can_shoot:
+                if self.COMBAT_MODEL == "analytic":
+                    self.schedule_hit(tower, None, int(e.ids[closest]), self.get_compiled_path(),
+                                      float(e.distance[closest]), float(e.speed[closest]),
+                                      float(e.size_multiplier[closest]))
+                else:
+                    self.projectiles.append(ids=self.new_entity_id(), x=tower.x, y=tower.y,
+                                            prev_x=tower.x, prev_y=tower.y,
+                                            speed=self.PROJECTILE_SPEED, target=closest,
+                                            source=index, damage=tower.damage)
+                tower.last_shot = self.time
+                tower.shots_fired += 1
+
+    def update_projectiles(self):
+        p = self.projectiles
+        m = p.count
+        if m == 0:
+            return
+
+        e = self.enemies
+        target = p.target[:m]
+        x, y = p.x[:m], p.y[:m]
+        tx, ty = e.x[target], e.y[target]
+
+        # Home in on the target
+        p.prev_x[:m] = x
+        p.prev_y[:m] = y
+        dx = tx - x
+        dy = ty - y
+        distance = np.hypot(dx, dy)
+        scale = np.divide(p.speed[:m], distance, out=np.zeros(m), where=distance > 0)
+        x += dx * scale
+        y += dy * scale
+
+        # Swept hit test: closest approach of this tick's segment to the target centre
+        sx = x - p.prev_x[:m]
+        sy = y - p.prev_y[:m]
+        length_sq = sx * sx + sy * sy
+        t = np.divide((tx - p.prev_x[:m]) * sx + (ty - p.prev_y[:m]) * sy, length_sq,
+                      out=np.zeros(m), where=length_sq > 0)
+        np.clip(t, 0.0, 1.0, out=t)
+        miss = np.hypot(tx - (p.prev_x[:m] + t * sx), ty - (p.prev_y[:m] + t * sy))
+        hit = miss < self.ENEMY_RADIUS * e.size_multiplier[target]
+
+        if hit.any():
+            damage = p.damage[:m][hit]
+            np.subtract.at(e.health, target[hit], damage)
+            dealt = np.bincount(p.source[:m][hit], weights=damage).tolist()
+            for source, amount in enumerate(dealt[:len(self.towers)]):
+                if amount:
+                    self.towers[source].damage_dealt += amount
+            p.compact(~hit)
@@ -0,0 +1,178 @@
+import itertools
+import os
+import random
+import time
+from multiprocessing import Pool
+from core.levels import load_level_data
+from core.simulation import Simulation
+from core.checkpoint import EXTENSION as CHECKPOINT_EXTENSION, load_checkpoint
+from core.telemetry import Telemetry, TelemetryWriter
+
+# Level data already read by this (worker) process, keyed by file name
+_level_cache = {}
+
+
+def check_settings(names):
+    """
+    Raise ValueError for any name that isn't one of the Simulation constants
+    (its upper-case instance attributes), so a typo can't run a sweep on defaults.
+    """
+    known = {name for name in vars(Simulation()) if name.isupper()}
+    unknown = sorted(set(names) - known)
+    if unknown:
+        raise ValueError(f"unknown setting(s) {', '.join(unknown)}; "
+                         f"settings are one of {', '.join(sorted(known))}")
+
+
+def make_jobs(level_files, runs, waves, layouts=None, random_towers=0, settings=None,
+              base_seed=0, use_arrays=False, grid_size=50, width=800, height=600,
+              telemetry_dir=None):
+    """
+    Expand a batch description into one job dict per simulated game: every level,
+    times every tower layout, times every combination of setting values, times
+    `runs` seeds. `settings` maps Simulation constant names to lists of values.
+
+    A checkpoint (.tdc) in `level_files` forks the saved game instead: the
+    layout's towers are bought on top of the saved ones and the seed replaces
+    the saved random state.
+
+    With `telemetry_dir`, every game writes its samples and wave stats to a
+    job_<n> directory in it.
+    """
+    settings = settings or {}
+    names = sorted(settings)
+    check_settings(names)
+    combinations = list(itertools.product(*(settings[name] for name in names)))
+    layouts = layouts or [None]  # None means "the level's own towers"
+
+    jobs = []
+    for level_file in level_files:
+        for layout_index, layout in enumerate(layouts):
+            for values in combinations:
+                for run in range(runs):
+                    jobs.append({
+                        "level": level_file,
+                        "layout_index": layout_index,
+                        "layout": layout,
+                        "random_towers": random_towers,
+                        "settings": dict(zip(names, values)),
+                        "seed": base_seed + run,
+                        "waves": waves,
+                        "use_arrays": use_arrays,
+                        "grid": (grid_size, width, height),
+                        "telemetry": (os.path.join(telemetry_dir, f"job_{len(jobs):05d}")
+                                      if telemetry_dir else None),
+                    })
+    return jobs
+
+
+def random_layout(rng, count, grid_size, width, height):
+    cells = [(x, y)
+             for x in range(grid_size, width, grid_size)
+             for y in range(grid_size, height, grid_size)]
+    return rng.sample(cells, min(count, len(cells)))
+
+
+def fork_checkpoint(job, rng):
+    # Checkpoint bytes are cached like level data; every job gets its own copy of the game
+    checkpoint_file = job["level"]
+    if checkpoint_file not in _level_cache:
+        with open(checkpoint_file, "rb") as f:
+            _level_cache[checkpoint_file] = f.read()
+    simulation_class = Simulation
+    if job["use_arrays"]:
+        from core.arrays import ArraySimulation
+        simulation_class = ArraySimulation
+    sim = load_checkpoint(_level_cache[checkpoint_file], simulation_class, job["settings"])
+    sim.seed = job["seed"]
+    sim.random.seed(job["seed"])
+
+    if job["random_towers"]:
+        towers = random_layout(rng, job["random_towers"], *job["grid"])
+    else:
+        towers = job["layout"] or []
+    for x, y in towers:
+        sim.place_tower(x, y)
+    return sim
+
+
+def run_job(job):
+    """
+    Play one headless game and return its result as a JSON-serializable dict.
+    """
+    started = time.perf_counter()
+    level_file = job["level"]
+    rng = random.Random(job["seed"])
+    if level_file.endswith(CHECKPOINT_EXTENSION):
+        sim = fork_checkpoint(job, rng)
+    else:
+        if level_file not in _level_cache:
+            _level_cache[level_file] = load_level_data(level_file)
+        level_data = _level_cache[level_file]
+
+        if job["random_towers"]:
+            towers = random_layout(rng, job["random_towers"], *job["grid"])
+        elif job["layout"] is not None:
+            towers = job["layout"]
+        else:
+            towers = level_data["towers"]
+
+        if job["use_arrays"]:
+            from core.arrays import ArraySimulation
+            sim = ArraySimulation(level_data["path"], towers, seed=job["seed"], settings=job["settings"])
+        else:
+            sim = Simulation(level_data["path"], towers, seed=job["seed"], settings=job["settings"])
+        sim.wave_definitions = level_data.get("waves", [])
+
+    writer = None
+    if job.get("telemetry"):
+        sim.telemetry = Telemetry()
+        writer = TelemetryWriter(sim.telemetry, job["telemetry"])
+        writer.start()
+
+    starting_lives = sim.lives
+    money_curve = [sim.money]
+    for _ in range(job["waves"]):
+        sim.run_waves(1)
+        money_curve.append(sim.money)
+        if sim.game_over:
+            break
+    if writer is not None:
+        writer.close()
+
+    return {
+        "level": os.path.splitext(os.path.basename(level_file))[0],
+        "layout": job["layout_index"],
+        "settings": job["settings"],
+        "seed": job["seed"],
+        "towers": [[tower.x, tower.y] for tower in sim.towers],
+        "wave_reached": sim.wave,
+        "waves_completed": sim.wave - 1,
+        "game_over": sim.game_over,
+        "lives_lost": starting_lives - sim.lives,
+        "score": sim.score,
+        "money_curve": money_curve,  # Money at the start and after each wave
+        "tower_dps": [round(tower.damage_dealt / sim.time, 3) if sim.time else 0.0
+                      for tower in sim.towers],
+        "ticks": sim.tick_count,
+        "sim_seconds": round(sim.time, 3),
+        "wall_seconds": round(time.perf_counter() - started, 4),
+    }
+
+
+def run_batch(jobs, workers=None, chunksize=None):
+    """
+    Run jobs across a process pool, yielding results as they finish (not in job
+    order). workers=1 runs everything in this process.
+    """
+    if workers == 1:
+        for job in jobs:
+            yield run_job(job)
+        return
+
+    workers = workers or os.cpu_count() or 1
+    if chunksize is None:
+        chunksize = max(1, len(jobs) // (workers * 8))
+    with Pool(workers) as pool:
+        for result in pool.imap_unordered(run_job, jobs, chunksize):
+            yield result
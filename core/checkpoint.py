@@ -0,0 +1,268 @@
+"""
+Checkpoints (.tdc): the complete state of a running Simulation, to resume a game
+later or fork what-if runs from it.
+
+Layout, little-endian, every section 8-byte aligned:
+
+    header       magic "TDCK", version u16, flags u16 (0), state byte count u32,
+                 tower, enemy and projectile counts u32
+    state        UTF-8 JSON, zero padded: settings, economy and wave counters,
+                 path, wave definitions, pending timed events
+    random       625 u32: the Mersenne Twister words and its position
+    towers       one column per TOWER_COLUMNS field
+    enemies      one column per ENEMY_COLUMNS field
+    projectiles  one column per PROJECTILE_COLUMNS field
+
+Entities are stored a column at a time, the way ArraySimulation holds them, so
+that backend writes and reads each column as one block copy. Projectiles refer
+to their target by enemy id and to their tower by index, so either backend can
+restore a checkpoint written by the other.
+
+Summarize a checkpoint (and time loading it) with:
+
+    python -m core.checkpoint saves/<file>.tdc [--arrays]
+"""
+import json
+import os
+import struct
+import sys
+import time
+from array import array
+from core.simulation import Simulation
+from entities.tower import Tower
+
+MAGIC = b"TDCK"
+VERSION = 1
+HEADER = struct.Struct("<4sHHIIII")
+EXTENSION = ".tdc"
+
+# (field, array typecode): "q" is i64, "d" is f64
+TOWER_COLUMNS = (
+    ("x", "d"), ("y", "d"), ("range", "d"), ("damage", "d"), ("fire_rate", "d"),
+    ("last_shot", "d"), ("level", "q"), ("turret_angle", "d"), ("shots_fired", "q"),
+    ("damage_dealt", "d"),
+)
+ENEMY_COLUMNS = (
+    ("ids", "q"), ("x", "d"), ("y", "d"), ("speed", "d"), ("health", "d"),
+    ("size_multiplier", "d"), ("distance", "d"),
+)
+PROJECTILE_COLUMNS = (
+    ("ids", "q"), ("x", "d"), ("y", "d"), ("prev_x", "d"), ("prev_y", "d"), ("speed", "d"),
+    ("target", "q"),  # Enemy id
+    ("source", "q"),  # Index of the firing tower, -1 for none
+    ("damage", "d"),
+)
+INTEGRAL_TOWER_FIELDS = ("x", "y", "range", "damage", "damage_dealt")  # Ints unless made otherwise
+
+# Simulation attributes saved as they are
+COUNTERS = (
+    "seed", "tick_count", "money", "score", "lives", "wave", "wave_in_progress",
+    "enemies_spawned", "enemies_defeated", "wave_enemy_count", "wave_cooldown_start",
+    "game_over", "next_entity_id",
+)
+
+
+class CheckpointError(ValueError):
+    pass
+
+
+def padding(size):
+    return b"\0" * (-size % 8)
+
+
+def column_bytes(values, code):
+    if hasattr(values, "astype"):  # NumPy column: a single copy
+        return values.astype("<i8" if code == "q" else "<f8", copy=False).tobytes()
+    column = array(code, values)
+    if sys.byteorder != "little":
+        column.byteswap()
+    return column.tobytes()
+
+
+def read_column(data, offset, code, count):
+    column = array(code)
+    column.frombytes(data[offset:offset + column.itemsize * count])
+    if len(column) != count:
+        raise CheckpointError("truncated checkpoint")
+    if sys.byteorder != "little":
+        column.byteswap()
+    return column, offset + column.itemsize * count
+
+
+def number(value):
+    return int(value) if value.is_integer() else value
+
+
+def dump_events(sim):
+    # Timed events hold live objects; store enemies by id and towers by index
+    tower_index = {id(tower): index for index, tower in enumerate(sim.towers)}
+    events = []
+    for due, sequence, kind, args in sorted(sim.scheduler.heap):
+        if kind == "hit":
+            _, target_id, tower, damage = args
+            args = (target_id, tower_index[id(tower)], damage)
+        elif kind == "notify":
+            args = (list(args[0]),)
+        events.append([due, sequence, kind, list(args)])
+    return events
+
+
+def restore_events(sim, events, targets):
+    heap = []
+    for due, sequence, kind, args in events:
+        if kind == "hit":
+            target_id, tower_index, damage = args
+            target = None
+            if targets is not None:
+                target = targets.get(target_id)
+                if target is None:
+                    continue  # Already gone; the hit would have done nothing
+            args = [target, target_id, sim.towers[tower_index], damage]
+        elif kind == "notify":
+            args = [tuple(args[0])]
+        heap.append((due, sequence, kind, tuple(args)))
+    sim.scheduler.heap = heap  # Saved in heap order, which sorted() keeps a valid heap
+
+
+def dump_checkpoint(sim):
+    """
+    Serialize `sim` between ticks. Returns the checkpoint as bytes.
+    """
+    version, words, gauss_next = sim.random.getstate()
+    state = {name: getattr(sim, name) for name in COUNTERS}
+    state.update({
+        "settings": {name: value for name, value in vars(sim).items() if name.isupper()},
+        "path": [list(point) for point in sim.enemy_path],
+        "waves": sim.wave_definitions,
+        "random_version": version,
+        "gauss_next": gauss_next,
+        "sequence": sim.scheduler.sequence,
+        "events": dump_events(sim),
+    })
+    state_bytes = json.dumps(state, separators=(",", ":")).encode("utf-8")
+    enemies, projectiles = sim.entity_columns()
+
+    sections = [
+        HEADER.pack(MAGIC, VERSION, 0, len(state_bytes), len(sim.towers),
+                    len(enemies["ids"]), len(projectiles["ids"])),
+        state_bytes, padding(len(state_bytes)),
+    ]
+    random_bytes = column_bytes(words, "I")
+    sections += [random_bytes, padding(len(random_bytes))]
+    for name, code in TOWER_COLUMNS:
+        sections.append(column_bytes([getattr(tower, name) for tower in sim.towers], code))
+    for columns, layout in ((enemies, ENEMY_COLUMNS), (projectiles, PROJECTILE_COLUMNS)):
+        for name, code in layout:
+            sections.append(column_bytes(columns[name], code))
+    return b"".join(sections)
+
+
+def load_checkpoint(data, simulation_class=Simulation, settings=None):
+    """
+    A new `simulation_class` in the state a checkpoint was taken in, with
+    `settings` overriding the constants it was saved with.
+    """
+    if len(data) < HEADER.size:
+        raise CheckpointError("not a checkpoint (too short)")
+    magic, version, flags, state_size, tower_count, enemy_count, projectile_count = \
+        HEADER.unpack_from(data, 0)
+    if magic != MAGIC:
+        raise CheckpointError("not a checkpoint (bad magic)")
+    if version != VERSION:
+        raise CheckpointError(f"unsupported checkpoint version {version}")
+
+    offset = HEADER.size
+    try:
+        state = json.loads(bytes(data[offset:offset + state_size]).decode("utf-8"))
+    except ValueError as e:
+        raise CheckpointError(f"corrupt checkpoint state: {e}")
+    offset += state_size + len(padding(state_size))
+    words, offset = read_column(data, offset, "I", 625)
+    offset += len(padding(4 * 625))
+
+    towers = {}
+    for name, code in TOWER_COLUMNS:
+        towers[name], offset = read_column(data, offset, code, tower_count)
+    enemies = {}
+    for name, code in ENEMY_COLUMNS:
+        enemies[name], offset = read_column(data, offset, code, enemy_count)
+    projectiles = {}
+    for name, code in PROJECTILE_COLUMNS:
+        projectiles[name], offset = read_column(data, offset, code, projectile_count)
+
+    sim = simulation_class(seed=state["seed"], settings=dict(state["settings"], **(settings or {})))
+    for name in COUNTERS:
+        setattr(sim, name, state[name])
+    sim.time = sim.tick_count / sim.TICK_RATE
+    sim.enemy_path = [tuple(point) for point in state["path"]]
+    sim.invalidate_path()
+    sim.wave_definitions = state["waves"]
+    sim.random.setstate((state["random_version"], tuple(words), state["gauss_next"]))
+
+    sim.towers = []
+    for index in range(tower_count):
+        tower = Tower(0, 0)
+        for name, _ in TOWER_COLUMNS:
+            value = towers[name][index]
+            setattr(tower, name, number(value) if name in INTEGRAL_TOWER_FIELDS else value)
+        sim.towers.append(tower)
+    targets = sim.restore_entities(enemies, projectiles)
+
+    sim.scheduler.sequence = state["sequence"]
+    restore_events(sim, state["events"], targets)
+    return sim
+
+
+def write_checkpoint(checkpoint_file, sim):
+    # Written aside and renamed, so a crash mid-save never leaves a broken checkpoint
+    data = dump_checkpoint(sim)
+    temporary_file = checkpoint_file + ".tmp"
+    with open(temporary_file, "wb") as f:
+        f.write(data)
+    os.replace(temporary_file, checkpoint_file)
+    return len(data)
+
+
+def read_checkpoint(checkpoint_file, simulation_class=Simulation):
+    with open(checkpoint_file, "rb") as f:
+        data = f.read()
+    try:
+        return load_checkpoint(data, simulation_class)
+    except CheckpointError as e:
+        raise CheckpointError(f"{checkpoint_file}: {e}")
+
+
+def main(argv=None):
+    import argparse
+    parser = argparse.ArgumentParser(description="Summarize a checkpoint and time loading it.")
+    parser.add_argument("checkpoint_file")
+    parser.add_argument("--arrays", action="store_true", help="load into the NumPy array-backed simulation")
+    args = parser.parse_args(argv)
+
+    simulation_class = Simulation
+    if args.arrays:
+        from core.arrays import ArraySimulation
+        simulation_class = ArraySimulation
+    started = time.perf_counter()
+    sim = read_checkpoint(args.checkpoint_file, simulation_class)
+    loaded = time.perf_counter() - started
+    started = time.perf_counter()
+    size = len(dump_checkpoint(sim))
+    dumped = time.perf_counter() - started
+    print(json.dumps({
+        "tick": sim.tick_count,
+        "wave": sim.wave,
+        "money": sim.money,
+        "lives": sim.lives,
+        "towers": len(sim.towers),
+        "enemies": len(sim.enemies),
+        "projectiles": len(sim.projectiles),
+        "timed_events": len(sim.scheduler),
+        "bytes": size,
+        "load_ms": round(loaded * 1000, 3),
+        "dump_ms": round(dumped * 1000, 3),
+    }))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,113 @@
+"""
+Path coverage of every tower placement: for each point of the tower grid and
+each tower level's range, the length of enemy path within range. Built once per
+path (vectorized when NumPy is available), then looked up by the editor.
+"""
+import heapq
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; the index is then built in pure Python
+    np = None
+
+from core.geometry import segment_length_in_circle
+from entities.tower import Tower
+
+
+def tower_ranges(levels):
+    # Range at each level, as Tower.upgrade() actually grows it
+    tower = Tower(0, 0)
+    ranges = []
+    for _ in range(levels):
+        ranges.append(tower.range)
+        tower.upgrade()
+    return ranges
+
+
+class CoverageIndex:
+    """
+    Grid points are the positions towers snap to: multiples of grid_size from 0
+    to the canvas size. coverage[level - 1][row][column] is the path length in
+    range of a level `level` tower at (column * grid_size, row * grid_size).
+    """
+
+    def __init__(self, path, width, height, grid_size, levels=4):
+        self.path = path
+        self.grid_size = grid_size
+        self.columns = int(width // grid_size) + 1
+        self.rows = int(height // grid_size) + 1
+        self.ranges = tower_ranges(levels)
+        if np is not None:
+            self.coverage = self.build_arrays()
+        else:
+            self.coverage = self.build_lists()
+
+    def segments(self):
+        return [(x1, y1, x2, y2) for (x1, y1), (x2, y2) in zip(self.path.points, self.path.points[1:])]
+
+    def build_arrays(self):
+        # Every grid point against every segment at once, per range
+        segments = np.array(self.segments(), dtype=np.float64).reshape(-1, 4)
+        x1, y1, x2, y2 = (segments[:, i] for i in range(4))
+        dx = x2 - x1
+        dy = y2 - y1
+        length = np.hypot(dx, dy)
+        safe_length = np.where(length > 0, length, 1.0)
+
+        gx, gy = np.meshgrid(np.arange(self.columns) * self.grid_size,
+                             np.arange(self.rows) * self.grid_size)
+        cx = gx.reshape(-1, 1)
+        cy = gy.reshape(-1, 1)
+        b = ((x1 - cx) * dx + (y1 - cy) * dy) / safe_length
+        c0 = (x1 - cx) ** 2 + (y1 - cy) ** 2
+
+        coverage = []
+        for radius in self.ranges:
+            discriminant = b * b - (c0 - radius * radius)
+            root = np.sqrt(np.maximum(discriminant, 0.0))
+            inside = np.minimum(length, -b + root) - np.maximum(0.0, -b - root)
+            inside = np.where((discriminant > 0) & (length > 0), np.maximum(inside, 0.0), 0.0)
+            coverage.append(inside.sum(axis=1).reshape(self.rows, self.columns).tolist())
+        return coverage
+
+    def build_lists(self):
+        segments = self.segments()
+        coverage = []
+        for radius in self.ranges:
+            coverage.append([
+                [sum(segment_length_in_circle(column * self.grid_size, row * self.grid_size, radius, *segment)
+                     for segment in segments)
+                 for column in range(self.columns)]
+                for row in range(self.rows)
+            ])
+        return coverage
+
+    def grid_cell(self, x, y):
+        return int(round(y / self.grid_size)), int(round(x / self.grid_size))
+
+    def at(self, x, y, level=1):
+        """
+        Path length in range of a tower of `level` placed at (x, y), snapped to the
+        grid; 0 outside the canvas.
+        """
+        row, column = self.grid_cell(x, y)
+        if not (0 <= row < self.rows and 0 <= column < self.columns):
+            return 0.0
+        return self.coverage[min(level, len(self.ranges)) - 1][row][column]
+
+    def maximum(self, level=1):
+        return max(max(row) for row in self.coverage[min(level, len(self.ranges)) - 1])
+
+    def top_cells(self, k, level=1, exclude=()):
+        """
+        The k best placements as (x, y, covered length), best first, skipping the
+        positions in `exclude` (e.g. existing towers).
+        """
+        excluded = {self.grid_cell(x, y) for x, y in exclude}
+        grid = self.coverage[min(level, len(self.ranges)) - 1]
+        cells = ((value, row, column)
+                 for row, values in enumerate(grid)
+                 for column, value in enumerate(values)
+                 if value > 0 and (row, column) not in excluded)
+        return [(column * self.grid_size, row * self.grid_size, value)
+                for value, row, column in heapq.nlargest(k, cells)]
@@ -1,59 +1,98 @@
 import tkinter as tk
-from tkinter import ttk, messagebox, simpledialog
+from tkinter import messagebox, simpledialog, filedialog
 import json
 import math
 import time
 import os
-from PIL import Image, ImageTk, ImageDraw
-from entities.tower import Tower
-from entities.enemy import Enemy
-from entities.projectile import Projectile
-from ui.interface import setup_user_interface, load_images, setup_bindings
 import random
+from core.simulation import Simulation
+from core.levels import load_level_data, list_level_files
+from core.profiler import FrameProfiler
+from core.replay import ReplayRecorder, ReplayPlayback, prune_replays
+from core.sim_thread import SimulationThread, interpolate_states
+from core.path_simplify import prepare_path, format_report
+from core.stream import StreamServer
+from core.checkpoint import dump_checkpoint, load_checkpoint, write_checkpoint, CheckpointError
+from core.telemetry import Telemetry, TelemetryWriter, prune_sessions
+from core.mods import discover_mods
+from ui.renderer import CanvasRenderer
+from ui.pacing import FramePacer
+from ui.background import BackgroundCache
+from ui.interface import setup_user_interface, load_images, setup_bindings
 
+# PIL, NumPy (via core.coverage) and the level browser are imported where they are
+# first used; together they would add most of the import time before the first frame
 class TowerDefenseGame:
-    def __init__(self, root):
+    def __init__(self, root, startup=None):
         self.root = root
+        self.startup = startup  # core.startup.StartupTimer, until the first frame is drawn
         self.root.title("Tower Defense Game")
 
         # Game constants
         self.CANVAS_WIDTH = 800
         self.CANVAS_HEIGHT = 600
-        self.GRID_SIZE = 50
-        self.TOWER_COST = 100
-        self.UPGRADE_COST = 150  # Cost to upgrade a tower
-
-        # Wave configuration
-        self.WAVE_COOLDOWN = 10000  # 10 seconds between waves
-        self.SPAWN_INTERVAL = 2000  # 2 seconds between enemies
-        self.ENEMIES_PER_WAVE = 5  # Starting number of enemies per wave
-        self.ENEMY_HEALTH_INCREASE = 20  # Health increase per wave
-        self.ENEMY_SPEED_INCREASE = 0.2  # Speed increase per wave
+        self.PATH_SPRITE = "path.jpg"
+        self.GAME_SPEEDS = (1, 2, 4, 16, None)  # None runs as fast as possible
+        self.ANNOUNCEMENT_SECONDS = 2  # Simulated seconds a rare enemy announcement stays up
+        self.HUD_REFRESH_FRAMES = 15  # Redraw the performance HUD every this many frames
+        self.TARGET_FPS = 60
+        self.LOD_RAISE_LOAD = 0.9  # Drop detail when frames average this share of their budget...
+        self.LOD_LOWER_LOAD = 0.5  # ...and restore it below this share
+        self.LOD_WINDOW_FRAMES = 30  # Frames averaged, and the minimum frames between LOD changes
+        self.CLUSTER_CELL = 60  # Grid cell size for aggregated enemy markers
+        self.CLUSTER_MIN_ENEMIES = 6  # Enemies in a cell before it's drawn as one marker
+        self.COVERAGE_TOP_K = 3  # Best free placements outlined on the coverage heatmap
+        self.PATH_TOLERANCE = 3.0  # Pixels saved paths may be simplified by
+        self.PATH_SMOOTH_SPACING = None  # Sample spacing of a smoothed path; None keeps it angular
+        self.FRAME_TRACE_FILE = "frame_trace.jsonl"
+        self.REPLAYS_DIR = "replays"
+        self.RECORD_REPLAYS = True  # Log every game's inputs to REPLAYS_DIR
+        self.REPLAYS_KEPT = 50  # Older recordings are deleted when a new one starts
+        self.STREAM_PORT = 47800  # Local port spectators (observe.py) connect to
+        self.SAVES_DIR = "saves"
+        self.TELEMETRY_DIR = "telemetry"  # One directory of samples and wave stats per session
+        self.RECORD_TELEMETRY = True
+        self.TELEMETRY_SESSIONS_KEPT = 20  # Older session directories are deleted when a new one starts
+        self.STARTUP_LOG = "startup.jsonl"  # Time-to-first-frame of every launch; None to not log it
+        self.STARTUP_LOG_KEPT = 200  # Launches kept in STARTUP_LOG
+        self.STARTUP_TARGET_MS = 500
+        self.AUTOSAVE_FILE = "autosave.tdc"  # In SAVES_DIR, rewritten after every wave
+
+        # Headless world (economy, waves, entities); this class only drives and draws it.
+        # Every game gets its own seed and is recorded so it can be replayed exactly.
+        # Once the simulation thread runs, the world is only changed through
+        # sim_thread.call() and only read through its snapshots
+        self.sim = Simulation(seed=random.randrange(2 ** 32))
+        self.GRID_SIZE = self.sim.GRID_SIZE
+        self.telemetry_writer = None
+        self.start_recording()
+        self.start_telemetry()
+        self.sim_thread = SimulationThread(self.sim)
+        self.snapshot = self.sim_thread.snapshots()[1]  # Latest world state drawn
+        self.replaying = False
 
         # Game state
         self.editor_mode = False
         self.selected_tool = "path"
-        self.money = 500
-        self.score = 0
-        self.lives = 10
-        self.wave = 1
-        self.enemy_path = []
-        self.towers = []
-        self.enemies = []
-        self.projectiles = []
-
-        # Wave management
-        self.wave_in_progress = False
-        self.enemies_spawned = 0
-        self.enemies_defeated = 0
-        self.last_spawn_time = 0
-        self.wave_cooldown_start = 0
         self.wave_status = "Ready to start"
         self.game_paused = False
-        self.game_over = False  # New attribute to track game over state
+        self.game_speed = 1
 
         # Settings
         self.show_enemy_health = True  # Toggle for showing enemy health
+        self.show_performance_hud = False  # Toggle for the frame profiler overlay
+        self.show_coverage = False  # Toggle for the tower coverage heatmap
+
+        # Path length in range of every tower placement, rebuilt when the path changes
+        self.coverage = None
+        self.coverage_image = None
+
+        # Spectator stream (F7); publishes snapshots to observe.py from its own thread
+        self.stream_server = None
+
+        # Frame profiling; only active while the HUD is shown or a trace is recording
+        self.profiler = FrameProfiler()
+        self.hud_items = None
 
         # Tower selection
         self.selected_tower = None  # Track the currently selected tower
@@ -61,35 +100,222 @@ class TowerDefenseGame:
         # Rare enemy announcement
         self.rare_enemy_announcement = None
 
+        # Last text pushed to each status label, so unchanged labels aren't reconfigured
+        self.label_texts = {}
+
+        self.mark_startup("setup")
         setup_user_interface(self)
+        self.mark_startup("interface")
+        self.renderer = CanvasRenderer(
+            self.canvas, (self.CANVAS_WIDTH, self.CANVAS_HEIGHT),
+            self.CLUSTER_CELL, self.CLUSTER_MIN_ENEMIES
+        )
+        self.frame_pacer = FramePacer(self.TARGET_FPS, self.LOD_RAISE_LOAD, self.LOD_LOWER_LOAD,
+                                      self.LOD_WINDOW_FRAMES)
         load_images(self)
+        self.mark_startup("images")
         setup_bindings(self)
+        # The Tk path_image only gives the size sprites are drawn at; the background
+        # itself is rendered from ui.background.load_sprite() on the first draw_path()
+        self.background_cache = BackgroundCache(
+            self.PATH_SPRITE,
+            (self.path_image.width(), self.path_image.height()),
+            self.CANVAS_WIDTH, self.CANVAS_HEIGHT
+        )
+        self.background_image = None
+        self.thumbnail_cache = None  # Level browser thumbnails, kept between openings
+        self.root.bind('<KeyPress-f>', lambda event: self.cycle_game_speed())
+        self.root.bind('<F3>', lambda event: self.toggle_performance_hud())
+        self.root.bind('<F4>', lambda event: self.toggle_frame_trace())
+        self.root.bind('<F5>', lambda event: self.open_replay())
+        self.root.bind('<F6>', lambda event: self.toggle_coverage_heatmap())
+        self.root.bind('<F7>', lambda event: self.toggle_stream())
+        self.root.bind('<F8>', lambda event: self.save_checkpoint())
+        self.root.bind('<F9>', lambda event: self.open_checkpoint())
+
+        # Installed mods (name, description), listed from a cached manifest; none are imported
+        self.mods = discover_mods()
+        self.mark_startup("mods")
+
+        self.sim_thread.start()
         self.game_loop()
 
+    def mark_startup(self, phase):
+        if self.startup is not None:
+            self.startup.mark(phase)
+
+    def finish_startup(self):
+        # Called at the end of the first frame
+        self.mark_startup("first_frame")
+        if self.STARTUP_LOG:
+            self.startup.write(self.STARTUP_LOG, self.STARTUP_TARGET_MS, self.STARTUP_LOG_KEPT)
+        self.startup = None
+
+    def start_recording(self, checkpoint=None):
+        if not self.RECORD_REPLAYS:
+            return
+        os.makedirs(self.REPLAYS_DIR, exist_ok=True)
+        prune_replays(self.REPLAYS_DIR, self.REPLAYS_KEPT - 1)  # Room for the new one
+        replay_file = os.path.join(self.REPLAYS_DIR, time.strftime("replay_%Y%m%d_%H%M%S.jsonl"))
+        self.sim.recorder = ReplayRecorder(replay_file, self.sim, checkpoint=checkpoint)
+
+    def stop_recording(self):
+        def close_recorder(sim):
+            if sim.recorder:
+                sim.recorder.close(sim)
+                sim.recorder = None
+        self.sim_thread.call(close_recorder).result()
+
+    def start_telemetry(self):
+        # The simulation only fills a ring buffer; a background thread writes the files
+        if not self.RECORD_TELEMETRY:
+            return
+        prune_sessions(self.TELEMETRY_DIR, self.TELEMETRY_SESSIONS_KEPT - 1)  # Room for the new one
+        session_dir = os.path.join(self.TELEMETRY_DIR, time.strftime("session_%Y%m%d_%H%M%S"))
+        self.sim.telemetry = Telemetry()
+        self.telemetry_writer = TelemetryWriter(self.sim.telemetry, session_dir)
+        self.telemetry_writer.start()
+
+    def stop_telemetry(self):
+        if self.telemetry_writer is None:
+            return
+        def detach_telemetry(sim):
+            sim.telemetry = None
+        self.sim_thread.call(detach_telemetry).result()
+        self.telemetry_writer.close()  # Writes whatever is still buffered
+        self.telemetry_writer = None
+
+    def open_replay(self):
+        replay_file = filedialog.askopenfilename(
+            title="Open Replay", initialdir=self.REPLAYS_DIR,
+            filetypes=[("Replays", "*.jsonl"), ("All files", "*.*")]
+        )
+        if replay_file:
+            self.play_replay(replay_file)
+
+    def play_replay(self, replay_file):
+        """
+        Swap in a fresh simulation driven by a recorded input log. It runs at the
+        current game speed; the log's checksums are verified as it goes.
+        """
+        try:
+            playback = ReplayPlayback.load(replay_file)
+        except (OSError, ValueError) as e:
+            messagebox.showerror("Error", f"Failed to load replay: {str(e)}")
+            return
+
+        self.sim_thread.stop()
+        self.stop_recording()
+        self.stop_telemetry()
+        self.sim = playback.create_simulation()
+        self.sim_thread = SimulationThread(self.sim)
+        self.snapshot = self.sim_thread.snapshots()[1]
+        self.replaying = True
+        self.update_profiling()
+        self.renderer.clear()
+        self.canvas.delete('path')
+        self.editor_mode = False
+        self.game_paused = False
+        self.wave_status = "Replay"
+        self.set_game_speed(self.game_speed)
+        self.sync_sim_thread()
+        self.sim_thread.start()
+        self.root.title("Tower Defense Game (replay)")
+
+    def autosave(self):
+        # Serialized between ticks on the simulation thread; this thread doesn't wait
+        checkpoint_file = os.path.join(self.SAVES_DIR, self.AUTOSAVE_FILE)
+
+        def save(sim):
+            try:
+                os.makedirs(self.SAVES_DIR, exist_ok=True)
+                write_checkpoint(checkpoint_file, sim)
+            except OSError as e:
+                sim.events.append(("autosave_failed", str(e)))
+        self.sim_thread.call(save)
+
+    def save_checkpoint(self):
+        if self.replaying:
+            return
+        os.makedirs(self.SAVES_DIR, exist_ok=True)
+        checkpoint_file = filedialog.asksaveasfilename(
+            title="Save Game", initialdir=self.SAVES_DIR, defaultextension=".tdc",
+            filetypes=[("Saved games", "*.tdc"), ("All files", "*.*")]
+        )
+        if not checkpoint_file:
+            return
+        try:
+            self.sim_thread.call(lambda sim: write_checkpoint(checkpoint_file, sim)).result()
+        except OSError as e:
+            messagebox.showerror("Error", f"Failed to save game: {str(e)}")
+
+    def open_checkpoint(self):
+        checkpoint_file = filedialog.askopenfilename(
+            title="Resume Game", initialdir=self.SAVES_DIR,
+            filetypes=[("Saved games", "*.tdc"), ("All files", "*.*")]
+        )
+        if checkpoint_file:
+            self.resume_checkpoint(checkpoint_file)
+
+    def resume_checkpoint(self, checkpoint_file):
+        """
+        Swap in the simulation saved in a checkpoint and carry on playing it. The
+        new recording embeds the checkpoint, so it replays from the same point.
+        """
+        try:
+            with open(checkpoint_file, "rb") as f:
+                checkpoint = f.read()
+            sim = load_checkpoint(checkpoint)
+        except (OSError, CheckpointError) as e:
+            messagebox.showerror("Error", f"Failed to resume game: {str(e)}")
+            return
+
+        self.sim_thread.stop()
+        self.stop_recording()
+        self.stop_telemetry()
+        self.sim = sim
+        self.start_recording(checkpoint)
+        self.start_telemetry()
+        self.sim_thread = SimulationThread(self.sim)
+        self.snapshot = self.sim_thread.snapshots()[1]
+        self.replaying = False
+        self.update_profiling()
+        self.renderer.clear()
+        self.selected_tower = None
+        self.canvas.delete('selected_tower')
+        self.editor_mode = False
+        self.game_paused = False
+        self.pause_button.config(text="Pause")
+        self.wave_status = f"Wave {sim.wave} in progress" if sim.wave_in_progress else "Ready to start"
+        waiting = sim.wave_in_progress or sim.wave_cooldown_start is not None
+        self.start_wave_button.config(state='disabled' if waiting else 'normal')
+        self.set_game_speed(self.game_speed)
+        self.sync_sim_thread()
+        self.draw_path()
+        self.update_labels()
+        self.sim_thread.start()
+        self.root.title("Tower Defense Game")
+
     def canvas_clicked(self, event):
-        if not self.editor_mode:
+        if not self.editor_mode or self.replaying:
             return
 
         x, y = event.x, event.y
         if self.selected_tool == "path":
-            self.enemy_path.append((x, y))
+            self.sim_thread.call("add_path_point", x, y).result()
             self.draw_path()
-        elif self.selected_tool == "tower" and self.money >= self.TOWER_COST:
+        elif self.selected_tool == "tower" and self.latest_snapshot().money >= self.sim.TOWER_COST:
             # Snap to grid
             grid_x = round(x / self.GRID_SIZE) * self.GRID_SIZE
             grid_y = round(y / self.GRID_SIZE) * self.GRID_SIZE
 
-            # Check if tower already exists at this location
-            for tower in self.towers:
-                if tower.x == grid_x and tower.y == grid_y:
-                    return
-
-            self.towers.append(Tower(grid_x, grid_y))
-            self.money -= self.TOWER_COST
-            self.update_labels()
+            if self.sim_thread.call("place_tower", grid_x, grid_y).result():
+                self.update_labels()
+                if self.show_coverage:
+                    self.draw_coverage_heatmap()  # Top placements exclude the new tower
         else:
             # Check if a tower is clicked for selection
-            for tower in self.towers:
+            for tower in self.latest_snapshot().towers:
                 # Check if the click is within the tower's bounding box
                 if (tower.x - 25 <= x <= tower.x + 25 and
                     tower.y - 25 <= y <= tower.y + 25):
@@ -110,8 +336,25 @@ class TowerDefenseGame:
                 outline='blue', tags='preview'
             )
 
+            # Range and how much of the path it would cover, straight from the index
+            coverage = self.get_coverage()
+            tower_range = coverage.ranges[0]
+            self.canvas.create_oval(
+                grid_x - tower_range, grid_y - tower_range,
+                grid_x + tower_range, grid_y + tower_range,
+                outline='blue', dash=(4, 4), tags='preview'
+            )
+            self.canvas.create_text(
+                grid_x, grid_y + 35,
+                text=f"{coverage.at(grid_x, grid_y):.0f} px of path",
+                fill='blue', font=("Arial", 9), tags='preview'
+            )
+
     def toggle_editor(self):
+        if self.replaying:
+            return
         self.editor_mode = not self.editor_mode
+        self.sim_thread.call("record", "editor", self.editor_mode)
         if self.editor_mode:
             self.tools_frame.pack(fill='x', pady=5)
             self.pause_button.config(state='disabled')
@@ -122,6 +365,7 @@ class TowerDefenseGame:
             self.pause_button.config(state='normal')
             self.game_paused = False
             self.canvas.delete('arrow')  # Clear arrows when exiting editor mode
+        self.sync_sim_thread()
 
     def set_tool(self, tool):
         self.selected_tool = tool
@@ -131,10 +375,12 @@ class TowerDefenseGame:
         if not level_name:
             return
 
-        level_data = {
-            "path": self.enemy_path,
-            "towers": [(tower.x, tower.y) for tower in self.towers],
-        }
+        level_data = self.sim_thread.call("level_data").result()
+        # Hand-drawn paths are full of near-collinear clicks; play on what gets saved
+        level_data["path"], path_report = prepare_path(
+            level_data["path"], self.PATH_TOLERANCE, self.PATH_SMOOTH_SPACING
+        )
+        self.sim_thread.call("set_path", level_data["path"]).result()
 
         # Create the levels folder if it doesn't exist
         if not os.path.exists("levels"):
@@ -144,14 +390,16 @@ class TowerDefenseGame:
         level_file = os.path.join("levels", f"{level_name}.json")
         with open(level_file, "w") as f:
             json.dump(level_data, f)
+        self.draw_path(persist=True)  # Cache the finished background on disk
 
         # Generate a thumbnail programmatically
         thumbnail = self.create_level_thumbnail(level_data)
         thumbnail.save(os.path.join("levels", f"{level_name}_thumb.png"))
 
-        messagebox.showinfo("Success", "Level saved successfully!")
+        messagebox.showinfo("Success", f"Level saved successfully!\nPath: {format_report(path_report)}")
 
     def create_level_thumbnail(self, level_data):
+        from PIL import Image, ImageDraw
         # Create a blank 128x128 thumbnail image
         thumbnail = Image.new("RGB", (128, 128), "white")
         draw = ImageDraw.Draw(thumbnail)
@@ -186,171 +434,207 @@ class TowerDefenseGame:
         if not os.path.exists("levels"):
             os.makedirs("levels")
 
-        # Get all level files
-        level_files = [f for f in os.listdir("levels") if f.endswith(".json")]
-
-        if not level_files:
+        if not list_level_files():
             messagebox.showinfo("Info", "No levels available to load.")
             return
 
-        # Create a new window to display the levels
-        load_window = tk.Toplevel(self.root)
-        load_window.title("Load Level")
-
-        # Create a frame to hold the level thumbnails and names
-        level_frame = ttk.Frame(load_window)
-        level_frame.pack(fill='both', expand=True)
-
-        # Load and display each level with its thumbnail
-        for level_file in level_files:
-            level_name = level_file.replace(".json", "")
-            thumbnail_path = os.path.join("levels", f"{level_name}_thumb.png")
-
-            if os.path.exists(thumbnail_path):
-                thumbnail = Image.open(thumbnail_path)
-                thumbnail = thumbnail.resize((128, 128), Image.Resampling.LANCZOS)  # Ensure thumbnail is 128x128
-                thumbnail = ImageTk.PhotoImage(thumbnail)
-
-                # Create a button with the thumbnail
-                level_button = ttk.Button(level_frame, image=thumbnail, text=level_name, compound=tk.BOTTOM,
-                                         command=lambda lf=level_file: self.load_selected_level(lf, load_window))
-                level_button.image = thumbnail  # Keep a reference to avoid garbage collection
-                level_button.pack(side='left', padx=5, pady=5)
+        # The browser lists levels and decodes thumbnails in the background
+        from ui.level_browser import LevelBrowser, PhotoCache
+        if self.thumbnail_cache is None:
+            self.thumbnail_cache = PhotoCache()
+        LevelBrowser(self.root, self.load_selected_level, self.create_level_thumbnail,
+                     self.thumbnail_cache)
 
     def load_selected_level(self, level_file, load_window):
         try:
-            with open(os.path.join("levels", level_file), "r") as f:
-                level_data = json.load(f)
-                self.enemy_path = level_data["path"]
-                self.towers = [Tower(x, y) for x, y in level_data["towers"]]
-                self.draw_path()
+            level_data = load_level_data(os.path.join("levels", level_file))
+            self.sim_thread.call("load_level", level_data).result()
+            self.draw_path(persist=True)
             messagebox.showinfo("Success", "Level loaded successfully!")
             load_window.destroy()
         except Exception as e:
             messagebox.showerror("Error", f"Failed to load level: {str(e)}")
 
     def clear_level(self):
-        self.enemy_path = []
-        self.towers = []
-        self.enemies = []
-        self.projectiles = []
+        self.sim_thread.call("clear").result()
+        self.renderer.clear()
         self.canvas.delete('all')
+        # Everything drawn on the canvas is gone; forget the ids of what was
+        self.hud_items = None
+        self.rare_enemy_announcement = None
+        self.coverage_image = None
 
     def toggle_pause(self):
         self.game_paused = not self.game_paused
+        self.sim_thread.call("record", "pause", self.game_paused)
+        self.sync_sim_thread()
         self.pause_button.config(text="Resume" if self.game_paused else "Pause")
 
-    def update_labels(self):
-        self.money_label.config(text=f"Money: ${self.money}")
-        self.lives_label.config(text=f"Lives: {self.lives}")
-        self.score_label.config(text=f"Score: {self.score}")
-        self.wave_label.config(text=f"Wave: {self.wave}")
+    def sync_sim_thread(self):
+        self.sim_thread.paused = self.game_paused or self.editor_mode
+        self.sim_thread.speed = self.game_speed
+
+    def latest_snapshot(self):
+        # Newest published state, which includes the effect of any finished call()
+        return self.sim_thread.snapshots()[1]
+
+    def set_game_speed(self, speed):
+        self.game_speed = speed
+        self.sim_thread.speed = speed
+        label = "max" if speed is None else f"x{speed}"
+        self.root.title("Tower Defense Game" if speed == 1 else f"Tower Defense Game ({label})")
 
-    def draw_path(self):
+    def cycle_game_speed(self):
+        index = self.GAME_SPEEDS.index(self.game_speed)
+        self.set_game_speed(self.GAME_SPEEDS[(index + 1) % len(self.GAME_SPEEDS)])
+
+    def update_labels(self):
+        snapshot = self.latest_snapshot()
+        self.set_label_text(self.money_label, f"Money: ${snapshot.money}")
+        self.set_label_text(self.lives_label, f"Lives: {snapshot.lives}")
+        self.set_label_text(self.score_label, f"Score: {snapshot.score}")
+        self.set_label_text(self.wave_label, f"Wave: {snapshot.wave}")
+
+    def set_label_text(self, label, text):
+        if self.label_texts.get(label) != text:
+            label.config(text=text)
+            self.label_texts[label] = text
+
+    def draw_path(self, persist=False):
         self.canvas.delete('path')
-        if len(self.enemy_path) > 1:
-            # Calculate the total length of the path
-            total_length = 0
-            for i in range(len(self.enemy_path) - 1):
-                x1, y1 = self.enemy_path[i]
-                x2, y2 = self.enemy_path[i + 1]
-                dx = x2 - x1
-                dy = y2 - y1
-                total_length += math.sqrt(dx**2 + dy**2)
-
-            # Place sprites along the path at regular intervals
-            sprite_interval = 40  # Distance between sprites (adjust as needed)
-            num_sprites = int(total_length / sprite_interval)
-
-            # Draw sprites along the path
-            for i in range(num_sprites):
-                t = i / num_sprites
-                # Interpolate the position along the path
-                x, y = self.interpolate_path(t)
-                self.canvas.create_image(x, y, image=self.path_image, tags='path')
+        path = self.latest_snapshot().path
+        if len(path.points) > 1:
+            # The whole path is pre-rendered into a single background image
+            from PIL import ImageTk
+            background = self.background_cache.get(path, persist=persist)
+            self.background_image = ImageTk.PhotoImage(background)  # Keep a reference
+            self.canvas.create_image(0, 0, image=self.background_image, anchor='nw', tags='path')
+            self.canvas.tag_lower('path')  # Keep the path under retained game objects
+        if self.show_coverage:
+            self.draw_coverage_heatmap()
+
+    def get_coverage(self):
+        path = self.latest_snapshot().path
+        if self.coverage is None or self.coverage.path is not path:
+            from core.coverage import CoverageIndex
+            self.coverage = CoverageIndex(path, self.CANVAS_WIDTH, self.CANVAS_HEIGHT, self.GRID_SIZE)
+        return self.coverage
+
+    def toggle_coverage_heatmap(self):
+        self.show_coverage = not self.show_coverage
+        if self.show_coverage:
+            self.draw_coverage_heatmap()
+        else:
+            self.canvas.delete('coverage')
+            self.coverage_image = None
+
+    def draw_coverage_heatmap(self):
+        """
+        One translucent cell per grid point, centred on it, from transparent (no
+        path in range) to red (the best placement), with the best free placements
+        outlined.
+        """
+        from PIL import Image, ImageTk
+        self.canvas.delete('coverage')
+        coverage = self.get_coverage()
+        best = coverage.maximum() or 1.0
+        cells = Image.new("RGBA", (coverage.columns, coverage.rows))
+        cells.putdata([
+            (255, int(255 * (1 - value / best)), 0, int(140 * value / best))
+            for row in coverage.coverage[0] for value in row
+        ])
+        size = self.GRID_SIZE
+        heatmap = cells.resize((coverage.columns * size, coverage.rows * size), Image.NEAREST)
+        self.coverage_image = ImageTk.PhotoImage(heatmap)  # Keep a reference
+        self.canvas.create_image(-size // 2, -size // 2, image=self.coverage_image,
+                                 anchor='nw', tags='coverage')
+
+        towers = [(tower.x, tower.y) for tower in self.latest_snapshot().towers]
+        for x, y, _ in coverage.top_cells(self.COVERAGE_TOP_K, exclude=towers):
+            self.canvas.create_oval(x - 25, y - 25, x + 25, y + 25,
+                                    outline='green', width=3, tags='coverage')
+        self.canvas.tag_lower('coverage')
+        self.canvas.tag_lower('path')  # Heatmap above the path, below everything else
 
     def interpolate_path(self, t):
         """
         Interpolate the position along the path based on a parameter t (0 to 1).
         """
-        if len(self.enemy_path) < 2:
-            return self.enemy_path[0] if self.enemy_path else (0, 0)
-
-        # Calculate the total length of the path
-        total_length = 0
-        segment_lengths = []
-        for i in range(len(self.enemy_path) - 1):
-            x1, y1 = self.enemy_path[i]
-            x2, y2 = self.enemy_path[i + 1]
-            dx = x2 - x1
-            dy = y2 - y1
-            segment_length = math.sqrt(dx**2 + dy**2)
-            segment_lengths.append(segment_length)
-            total_length += segment_length
-
-        # Find the segment where the interpolated point lies
-        target_length = t * total_length
-        accumulated_length = 0
-        for i in range(len(self.enemy_path) - 1):
-            x1, y1 = self.enemy_path[i]
-            x2, y2 = self.enemy_path[i + 1]
-            segment_length = segment_lengths[i]
-            if accumulated_length + segment_length >= target_length:
-                # Interpolate within this segment
-                segment_t = (target_length - accumulated_length) / segment_length
-                x = x1 + (x2 - x1) * segment_t
-                y = y1 + (y2 - y1) * segment_t
-                return x, y
-            accumulated_length += segment_length
-
-        # If t == 1, return the last point
-        return self.enemy_path[-1]
+        return self.snapshot.path.point_at_fraction(t)
 
     def start_wave(self):
-        if not self.wave_in_progress and not self.game_paused and not self.editor_mode:
-            self.wave_in_progress = True
-            self.enemies_spawned = 0
-            self.enemies_defeated = 0
-            self.wave_status = f"Wave {self.wave} in progress"
-            self.update_wave_status()
+        if self.replaying:
+            return
+        if (not self.game_paused and not self.editor_mode and
+                self.sim_thread.call("start_wave").result()):
+            self.wave_status = f"Wave {self.latest_snapshot().wave} in progress"
+            self.update_wave_status(self.latest_snapshot())
             self.start_wave_button.config(state='disabled')
 
-    def update_wave_status(self):
-        if self.wave_in_progress:
-            progress = f"({self.enemies_defeated}/{self.ENEMIES_PER_WAVE})"
-            self.wave_status_label.config(text=f"{self.wave_status} {progress}")
+    def update_wave_status(self, snapshot):
+        if snapshot.wave_in_progress:
+            progress = f"({snapshot.enemies_defeated}/{snapshot.wave_enemy_count})"
+            self.set_label_text(self.wave_status_label, f"{self.wave_status} {progress}")
         else:
-            if self.wave_cooldown_start > 0:
-                remaining = (self.WAVE_COOLDOWN - (time.time() * 1000 - self.wave_cooldown_start)) / 1000
+            remaining = snapshot.cooldown_remaining
+            if remaining is not None:
                 if remaining > 0:
-                    self.wave_status_label.config(text=f"Next wave in {remaining:.1f}s")
+                    self.set_label_text(self.wave_status_label, f"Next wave in {remaining:.1f}s")
                 else:
-                    self.wave_status_label.config(text="Ready to start next wave")
+                    self.set_label_text(self.wave_status_label, "Ready to start next wave")
             else:
-                self.wave_status_label.config(text=self.wave_status)
-
-    def spawn_enemy(self):
-        if (self.wave_in_progress and
-            self.enemies_spawned < self.ENEMIES_PER_WAVE and
-            time.time() * 1000 - self.last_spawn_time >= self.SPAWN_INTERVAL):
-
-            # Determine if a rare enemy should spawn (after tier 4)
-            is_rare = False
-            if self.wave > 4 and random.random() < 0.1:  # 10% chance to spawn a rare enemy
-                is_rare = True
+                self.set_label_text(self.wave_status_label, self.wave_status)
 
-            # Create enemy with increased stats based on wave number
-            enemy = Enemy(self.enemy_path, self.enemy_path[0], self.enemy_path[-1], is_rare)
-            enemy.health += (self.wave - 1) * self.ENEMY_HEALTH_INCREASE
-            enemy.speed += (self.wave - 1) * self.ENEMY_SPEED_INCREASE
-
-            self.enemies.append(enemy)
-            self.enemies_spawned += 1
-            self.last_spawn_time = time.time() * 1000
-
-            # Announce rare enemy appearance
-            if is_rare:
+    def handle_simulation_events(self):
+        for event in self.sim_thread.pop_events():
+            kind = event[0]
+            if kind == "rare_enemy":
                 self.announce_rare_enemy()
+            elif kind == "cooldown_over":
+                self.start_wave_button.config(state='normal')
+            elif kind == "wave_complete":
+                _, completed_wave, wave_bonus = event
+                self.wave_status = "Wave completed!"
+                if not self.replaying:
+                    self.autosave()
+                messagebox.showinfo("Wave Complete",
+                                    f"Wave {completed_wave} completed!\nBonus: ${wave_bonus}")
+            elif kind == "announcement_over":
+                self.remove_rare_enemy_announcement()
+            elif kind == "path_changed":
+                self.draw_path()
+            elif kind == "autosave_failed":
+                messagebox.showerror("Error", f"Autosave failed: {event[1]}")
+            elif kind == "replay_finished":
+                self.report_replay(*event[1:])
+            elif kind == "game_over":
+                self.stop_recording()
+                self.stop_telemetry()
+                messagebox.showinfo("Game Over", f"Final Score: {event[1]}")
+                self.root.quit()
+
+    def report_replay(self, verified, mismatches, first_mismatch):
+        # The simulation thread has detached the playback and paused itself. The
+        # player carries on from here, so this becomes a recorded session that
+        # starts from a checkpoint of the replayed state
+        self.replaying = False
+        self.game_paused = True
+        self.pause_button.config(text="Resume")
+        snapshot = self.latest_snapshot()
+        if not snapshot.game_over:
+            def record_from_here(sim):
+                self.start_recording(dump_checkpoint(sim))
+                self.start_telemetry()
+            self.sim_thread.call(record_from_here).result()
+        self.wave_status = f"Wave {snapshot.wave} in progress" if snapshot.wave_in_progress else "Ready to start"
+        waiting = snapshot.wave_in_progress or snapshot.cooldown_remaining is not None
+        self.start_wave_button.config(state='disabled' if waiting else 'normal')
+        self.set_game_speed(self.game_speed)  # Drops "(replay)" from the title
+        if mismatches:
+            messagebox.showwarning("Replay", f"Replay diverged at tick {first_mismatch} "
+                                             f"({mismatches} checksum mismatches)")
+        else:
+            messagebox.showinfo("Replay", f"Replay finished: {verified} checksums verified")
 
     def announce_rare_enemy(self):
         if self.rare_enemy_announcement:
@@ -372,166 +656,146 @@ class TowerDefenseGame:
             tags="rare_enemy_announcement"
         )
 
-        # Remove the announcement after 2 seconds
-        self.root.after(2000, self.remove_rare_enemy_announcement)
+        # Remove the announcement after 2 seconds of game time
+        self.sim_thread.call("notify_after", self.ANNOUNCEMENT_SECONDS, ("announcement_over",))
 
     def remove_rare_enemy_announcement(self):
         if self.rare_enemy_announcement:
             self.canvas.delete(self.rare_enemy_announcement)
             self.rare_enemy_announcement = None
 
-    def check_wave_completion(self):
-        if (self.wave_in_progress and
-            self.enemies_spawned >= self.ENEMIES_PER_WAVE and
-            len(self.enemies) == 0):
-
-            self.wave_in_progress = False
-            self.wave += 1
-            self.ENEMIES_PER_WAVE += 2  # Increase enemies per wave
-            self.wave_cooldown_start = time.time() * 1000
-            self.wave_status = "Wave completed!"
-
-            # Give wave completion bonus
-            wave_bonus = self.wave * 100
-            self.money += wave_bonus
-            self.score += wave_bonus
-
-            messagebox.showinfo("Wave Complete",
-                                f"Wave {self.wave-1} completed!\nBonus: ${wave_bonus}")
-
     def toggle_enemy_health_visibility(self):
         self.show_enemy_health = not self.show_enemy_health
 
+    def toggle_performance_hud(self):
+        self.show_performance_hud = not self.show_performance_hud
+        if not self.show_performance_hud and self.hud_items:
+            self.canvas.delete('hud')
+            self.hud_items = None
+        self.update_profiling()
+
+    def toggle_frame_trace(self):
+        if self.profiler.trace:
+            self.profiler.stop_trace()
+        else:
+            self.profiler.start_trace(self.FRAME_TRACE_FILE)
+        self.update_profiling()
+
+    def toggle_stream(self):
+        if self.stream_server:
+            stats = self.stream_server.stats()
+            self.stream_server.stop()
+            self.stream_server = None
+            messagebox.showinfo("Spectator Stream", f"Streaming stopped.\n"
+                                f"{stats['messages']} messages, {stats['bytes_per_message']} bytes and "
+                                f"{stats['encode_ms']} ms to encode on average")
+            return
+        # Reads whichever simulation thread is current, so replays are streamed too
+        server = StreamServer(lambda: self.sim_thread.snapshots()[1], port=self.STREAM_PORT)
+        try:
+            server.start()
+        except OSError as e:
+            messagebox.showerror("Error", f"Failed to start streaming: {str(e)}")
+            return
+        self.stream_server = server
+        messagebox.showinfo("Spectator Stream", f"Streaming on port {server.port}.\n"
+                            f"Watch with: python observe.py --port {server.port}")
+
+    def update_profiling(self):
+        self.profiler.enabled = self.show_performance_hud or self.profiler.trace is not None
+        # Phases are timed on the simulation thread; a tick that straddles end_frame()
+        # may be counted in either frame
+        def set_profiler(sim, profiler):
+            sim.profiler = profiler
+        self.sim_thread.call(set_profiler, self.profiler if self.profiler.enabled else None)
+
+    def end_profiled_frame(self, frame_started, render_started):
+        finished = time.perf_counter()
+        self.profiler.add("render", finished - render_started)
+        self.profiler.end_frame(
+            finished - frame_started,
+            enemies=len(self.snapshot.enemies),
+            projectiles=len(self.snapshot.projectiles),
+            canvas_items=self.renderer.item_count(),
+            lod=self.frame_pacer.level,
+            enemy_reuse=round(self.snapshot.enemy_reuse * 100),  # Percent of pool hits
+            shot_reuse=round(self.snapshot.projectile_reuse * 100),
+            # Telemetry records lost because the writer fell behind the ring buffer
+            tlm_dropped=self.telemetry_writer.stats()["dropped"] if self.telemetry_writer else 0,
+        )
+        if self.show_performance_hud and self.profiler.frame_count % self.HUD_REFRESH_FRAMES == 0:
+            self.draw_performance_hud()
+
+    def draw_performance_hud(self):
+        text = self.profiler.format_summary()
+        bbox = None
+        if self.hud_items is not None:
+            self.canvas.itemconfig(self.hud_items[1], text=text)
+            bbox = self.canvas.bbox(self.hud_items[1])
+        if bbox is None:
+            # First refresh, or the items went with something else that cleared the canvas
+            self.canvas.delete('hud')
+            background = self.canvas.create_rectangle(0, 0, 0, 0, fill='black', outline='', tags='hud')
+            label = self.canvas.create_text(
+                8, 8, anchor='nw', text=text,
+                fill='white', font=("Courier", 9), tags='hud'
+            )
+            self.hud_items = (background, label)
+            bbox = self.canvas.bbox(label)
+        x1, y1, x2, y2 = bbox
+        self.canvas.coords(self.hud_items[0], x1 - 4, y1 - 4, x2 + 4, y2 + 4)
+        self.canvas.tag_raise('hud')
+
     def game_loop(self):
-        if self.game_over:
+        # The simulation ticks on its own thread; each frame draws whatever it has
+        # published, interpolated between the last two snapshots
+        now = time.perf_counter()
+        self.handle_simulation_events()
+        previous, snapshot, alpha = self.sim_thread.interpolation(now)
+        self.snapshot = snapshot
+        if snapshot.game_over:
             return
 
         if not self.game_paused and not self.editor_mode:
-            # Check wave cooldown
-            if (not self.wave_in_progress and
-                self.wave_cooldown_start > 0 and
-                time.time() * 1000 - self.wave_cooldown_start >= self.WAVE_COOLDOWN):
-
-                self.wave_cooldown_start = 0
-                self.start_wave_button.config(state='normal')
-
-            self.spawn_enemy()
-
-            # Update game objects
-            for enemy in self.enemies[:]:
-                enemy.update()
-                if enemy.reached_end:
-                    self.enemies.remove(enemy)
-                    self.lives -= 1
-                    if self.lives <= 0:
-                        self.game_over = True
-                        messagebox.showinfo("Game Over", f"Final Score: {self.score}")
-                        self.root.quit()
-                        return
-                elif enemy.health <= 0:
-                    self.enemies.remove(enemy)
-                    self.enemies_defeated += 1
-                    self.money += 25
-                    self.score += 100
-
-            for tower in self.towers:
-                tower.update(self.enemies)
-                if tower.can_shoot:
-                    closest_enemy = tower.get_closest_enemy(self.enemies)
-                    if closest_enemy:
-                        self.projectiles.append(Projectile(tower.x, tower.y, closest_enemy))
-                        tower.last_shot = time.time()
-
-            for projectile in self.projectiles[:]:
-                projectile.update()
-                if projectile.hit_target():
-                    projectile.target.health -= 10
-                    self.projectiles.remove(projectile)
-
-            self.check_wave_completion()
-            self.update_wave_status()
+            self.update_wave_status(snapshot)
             self.update_labels()
 
-        # Clear and redraw
-        self.canvas.delete('game_object')
-
-        # Draw towers
-        for tower in self.towers:
-            # Draw the base of the tower
-            self.canvas.create_oval(
-                tower.x - 25, tower.y - 25,
-                tower.x + 25, tower.y + 25,
-                fill='blue', tags='game_object'
-            )
-
-            # Draw the rotating turret
-            turret_length = 20
-            turret_end_x = tower.x + turret_length * math.cos(math.radians(tower.turret_angle))
-            turret_end_y = tower.y + turret_length * math.sin(math.radians(tower.turret_angle))
-            self.canvas.create_line(
-                tower.x, tower.y,
-                turret_end_x, turret_end_y,
-                fill='white', width=4, tags='game_object'
-            )
-
-            # Draw the tower level
-            self.canvas.create_text(
-                tower.x, tower.y,
-                text=str(tower.level),
-                fill='white',
-                font=("Arial", 12),
-                tags='game_object'
-            )
-
-        # Draw enemies
-        for enemy in self.enemies:
-            radius = 15 * enemy.size_multiplier  # Adjust radius based on size multiplier
-            self.canvas.create_oval(
-                enemy.x - radius, enemy.y - radius,
-                enemy.x + radius, enemy.y + radius,
-                fill='red', tags='game_object'
-            )
-            if self.show_enemy_health:
-                health_percentage = int((enemy.health / 100) * 100)  # Assuming base health is 100
-                # Draw drop shadow
-                self.canvas.create_text(
-                    enemy.x + 1, enemy.y - radius - 4,  # Slightly offset
-                    text=f"{health_percentage}%",
-                    fill='black',
-                    font=("Arial", 8),
-                    tags='game_object'
-                )
-                # Draw actual health text
-                self.canvas.create_text(
-                    enemy.x, enemy.y - radius - 5,  # Position above the enemy
-                    text=f"{health_percentage}%",
-                    fill='white',
-                    font=("Arial", 8),
-                    tags='game_object'
-                )
-
-        # Draw projectiles
-        for projectile in self.projectiles:
-            self.canvas.create_oval(
-                projectile.x - 5, projectile.y - 5,
-                projectile.x + 5, projectile.y + 5,
-                fill='yellow', tags='game_object'
-            )
-
-        self.root.after(16, self.game_loop)  # ~60 FPS
+        render_started = time.perf_counter() if self.profiler.enabled else 0
+        enemies = snapshot.enemies
+        projectiles = snapshot.projectiles
+        if previous is not None:
+            enemies = interpolate_states(previous.enemies, enemies, alpha)
+            projectiles = interpolate_states(previous.projectiles, projectiles, alpha)
+        self.renderer.render(snapshot.towers, enemies, projectiles, self.show_enemy_health,
+                             self.frame_pacer.level)
+        if self.profiler.enabled:
+            self.end_profiled_frame(now, render_started)
+
+        # Next frame on the TARGET_FPS timeline, however long this one took
+        if self.startup is not None:
+            self.finish_startup()
+        self.root.after(self.frame_pacer.end_frame(now, time.perf_counter()), self.game_loop)
 
     def upgrade_tower(self):
-        if self.selected_tower and self.money >= self.UPGRADE_COST:
-            self.selected_tower.upgrade()
-            self.money -= self.UPGRADE_COST
+        if self.replaying:
+            return
+        if self.selected_tower and self.sim_thread.call(
+                "upgrade_tower_at", self.selected_tower.x, self.selected_tower.y).result():
             self.update_labels()
-            messagebox.showinfo("Upgrade", f"Tower upgraded!\nDamage: {self.selected_tower.damage}, Range: {self.selected_tower.range}")
+            tower = self.tower_at(self.selected_tower.x, self.selected_tower.y)
+            messagebox.showinfo("Upgrade", f"Tower upgraded!\nDamage: {tower.damage}, Range: {tower.range}")
             # Remove the highlight after upgrading
             self.canvas.delete('selected_tower')
             self.selected_tower = None
         else:
             messagebox.showerror("Error", "Not enough money to upgrade tower or no tower selected!")
 
+    def tower_at(self, x, y):
+        for tower in self.latest_snapshot().towers:
+            if tower.x == x and tower.y == y:
+                return tower
+        return None
+
     def select_tower(self, tower):
         self.selected_tower = tower
         messagebox.showinfo("Tower Selected", f"Tower at ({tower.x}, {tower.y}) selected for upgrade.")
@@ -551,7 +815,7 @@ class TowerDefenseGame:
         self.canvas.delete('arrow')
 
         # Draw arrows along the path
-        if len(self.enemy_path) > 1:
+        if len(self.snapshot.path.points) > 1:
             num_arrows = 1  # Number of arrows to draw
             for i in range(num_arrows):
                 t = (i / num_arrows) + (time.time() % 1)  # Animate arrows smoothly
@@ -559,20 +823,19 @@ class TowerDefenseGame:
                     t -= 1
 
                 # Get the position on the path
+                path = self.snapshot.path
                 x, y = self.interpolate_path(t)
 
-                # Get the direction of the path at this point
-                if t < 1:
-                    next_x, next_y = self.interpolate_path(t + 0.01)
-                    dx = next_x - x
-                    dy = next_y - y
-                    angle = math.degrees(math.atan2(dy, dx))
-
-                    # Draw the arrow
-                    self.canvas.create_line(
-                        x, y, x + dx * 10, y + dy * 10,
-                        arrow=tk.LAST, fill='black', width=2, tags='arrow'
-                    )
+                # Get the direction of the path at this point; the arrow spans a
+                # tenth of the path
+                dx, dy = path.direction_at(t * path.length)
+                size = path.length * 0.1
+
+                # Draw the arrow
+                self.canvas.create_line(
+                    x, y, x + dx * size, y + dy * size,
+                    arrow=tk.LAST, fill='black', width=2, tags='arrow'
+                )
 
         # Schedule the next update
         self.root.after(100, self.draw_arrows_on_path)
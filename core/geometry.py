@@ -0,0 +1,37 @@
+import math
+
+
+def point_segment_distance(px, py, x1, y1, x2, y2):
+    """
+    Distance from point (px, py) to the segment (x1, y1)-(x2, y2).
+    """
+    dx = x2 - x1
+    dy = y2 - y1
+    length_sq = dx * dx + dy * dy
+    if length_sq == 0:
+        return math.hypot(px - x1, py - y1)
+
+    # Project the point onto the segment and clamp to its ends
+    t = ((px - x1) * dx + (py - y1) * dy) / length_sq
+    t = max(0.0, min(1.0, t))
+    return math.hypot(px - (x1 + t * dx), py - (y1 + t * dy))
+
+
+def segment_length_in_circle(cx, cy, radius, x1, y1, x2, y2):
+    """
+    Length of the segment (x1, y1)-(x2, y2) that lies inside the circle.
+    """
+    dx = x2 - x1
+    dy = y2 - y1
+    length = math.hypot(dx, dy)
+    if length == 0:
+        return 0.0
+
+    # Solve |start + t * direction - centre| = radius for t along the segment
+    b = ((x1 - cx) * dx + (y1 - cy) * dy) / length
+    c = (x1 - cx) ** 2 + (y1 - cy) ** 2 - radius * radius
+    discriminant = b * b - c
+    if discriminant <= 0:
+        return 0.0
+    root = math.sqrt(discriminant)
+    return max(0.0, min(length, -b + root) - max(0.0, -b - root))
@@ -0,0 +1,159 @@
+"""
+Compact binary level format (.tdl), an alternative to the JSON level files.
+
+Layout, little-endian, every section 4-byte aligned:
+
+    header      magic "TDLV", version u16, flags u16, path point count u32,
+                tower count u32, total path length f32
+    path        f32 x, y per path point
+    start/end   f32 start x, y, end x, y (only with FLAG_START_END)
+    towers      i16 x, y per tower
+    waves       u32 byte count, then the level's "waves" as UTF-8 JSON, zero padded
+                (only with FLAG_WAVES)
+
+Files are memory-mapped on load and each section is read with a single
+array.frombytes(), with no text parsing.
+
+Convert the JSON levels with:
+
+    python -m core.level_format [levels/*.json]
+"""
+import json
+import mmap
+import os
+import struct
+import sys
+from array import array
+from core.path import CompiledPath
+
+MAGIC = b"TDLV"
+VERSION = 2  # 2: no per-point lengths section; CompiledPath computes them anyway
+FLAG_START_END = 1
+FLAG_WAVES = 2
+HEADER = struct.Struct("<4sHHIIf")
+EXTENSION = ".tdl"
+
+
+class LevelFormatError(ValueError):
+    pass
+
+
+def binary_file_for(json_file):
+    return os.path.splitext(json_file)[0] + EXTENSION
+
+
+def write_binary_level(level_file, level_data):
+    path = CompiledPath(level_data["path"])
+    towers = level_data["towers"]
+    flags = FLAG_START_END if "start" in level_data and "end" in level_data else 0
+    if level_data.get("waves"):
+        flags |= FLAG_WAVES
+
+    sections = [
+        HEADER.pack(MAGIC, VERSION, flags, len(path.points), len(towers), path.length),
+        pack("<f", [value for point in path.points for value in point]),
+    ]
+    if flags & FLAG_START_END:
+        sections.append(pack("<f", list(level_data["start"]) + list(level_data["end"])))
+    sections.append(pack("<h", [int(round(value)) for tower in towers for value in tower]))
+    if flags & FLAG_WAVES:
+        waves = json.dumps(level_data["waves"], separators=(",", ":")).encode("utf-8")
+        sections.append(struct.pack("<I", len(waves)) + waves + b"\0" * (-len(waves) % 4))
+
+    with open(level_file, "wb") as f:
+        f.write(b"".join(sections))
+
+
+def pack(code, values):
+    return struct.pack(f"{code[0]}{len(values)}{code[1]}", *values)
+
+
+def map_binary_level(level_file):
+    """
+    Memory-map a .tdl file and return (mmap, header fields, section offsets).
+    """
+    with open(level_file, "rb") as f:
+        try:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            raise LevelFormatError(f"{level_file}: empty file")
+
+    try:
+        if len(mapped) < HEADER.size:
+            raise LevelFormatError(f"{level_file}: truncated header")
+        magic, version, flags, point_count, tower_count, length = HEADER.unpack_from(mapped, 0)
+        if magic != MAGIC:
+            raise LevelFormatError(f"{level_file}: not a binary level")
+        if version != VERSION:
+            raise LevelFormatError(f"{level_file}: unsupported version {version}")
+
+        offsets = {"path": HEADER.size}
+        offsets["start_end"] = offsets["path"] + 8 * point_count
+        offsets["towers"] = offsets["start_end"] + (16 if flags & FLAG_START_END else 0)
+        offsets["waves"] = offsets["towers"] + 4 * tower_count
+        if len(mapped) < offsets["towers"] + 4 * tower_count:
+            raise LevelFormatError(f"{level_file}: truncated data")
+    except LevelFormatError:
+        mapped.close()
+        raise
+
+    header = {"flags": flags, "points": point_count, "towers": tower_count, "length": length}
+    return mapped, header, offsets
+
+
+def read_array(mapped, code, offset, count):
+    values = array(code)
+    values.frombytes(mapped[offset:offset + values.itemsize * count])
+    if sys.byteorder != "little":
+        values.byteswap()
+    return values
+
+
+def pairs(values):
+    return [[values[i], values[i + 1]] for i in range(0, len(values), 2)]
+
+
+def load_binary_level(level_file):
+    """
+    Read a .tdl file into the same dict shape as a JSON level.
+    """
+    mapped, header, offsets = map_binary_level(level_file)
+    try:
+        level_data = {
+            "path": pairs(read_array(mapped, "f", offsets["path"], 2 * header["points"])),
+            "towers": pairs(read_array(mapped, "h", offsets["towers"], 2 * header["towers"])),
+        }
+        if header["flags"] & FLAG_START_END:
+            start_end = read_array(mapped, "f", offsets["start_end"], 4)
+            level_data["start"] = [start_end[0], start_end[1]]
+            level_data["end"] = [start_end[2], start_end[3]]
+        if header["flags"] & FLAG_WAVES:
+            level_data["waves"] = read_waves(mapped, offsets["waves"], level_file)
+    finally:
+        mapped.close()
+    return level_data
+
+
+def read_waves(mapped, offset, level_file):
+    if len(mapped) < offset + 4:
+        raise LevelFormatError(f"{level_file}: truncated waves")
+    size, = struct.unpack_from("<I", mapped, offset)
+    if len(mapped) < offset + 4 + size:
+        raise LevelFormatError(f"{level_file}: truncated waves")
+    return json.loads(mapped[offset + 4:offset + 4 + size].decode("utf-8"))
+
+
+def convert(json_files):
+    for json_file in json_files:
+        with open(json_file, "r") as f:
+            level_data = json.load(f)
+        binary_file = binary_file_for(json_file)
+        write_binary_level(binary_file, level_data)
+        print(f"{json_file}: {os.path.getsize(json_file)} -> {os.path.getsize(binary_file)} bytes")
+
+
+if __name__ == "__main__":
+    from core.levels import LEVELS_DIR
+    files = sys.argv[1:] or [os.path.join(LEVELS_DIR, f)
+                             for f in sorted(os.listdir(LEVELS_DIR)) if f.endswith(".json")]
+    convert(files)
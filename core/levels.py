@@ -0,0 +1,151 @@
+import json
+import os
+from core.path import CompiledPath
+from core.level_format import (EXTENSION as BINARY_EXTENSION, LevelFormatError,
+                               binary_file_for, load_binary_level)
+
+LEVELS_DIR = "levels"
+
+
+def load_level_data(level_file):
+    """
+    Read a level file into a dict with "path" and "towers" (and "start"/"end" when
+    the file has them). For a JSON level, an up-to-date binary copy next to it is
+    read instead; if that copy can't be read the JSON is used.
+    """
+    if level_file.endswith(BINARY_EXTENSION):
+        level_data = load_binary_level(level_file)
+    else:
+        level_data = None
+        binary_file = binary_file_for(level_file)
+        try:
+            if os.path.getmtime(binary_file) >= os.path.getmtime(level_file):
+                level_data = load_binary_level(binary_file)
+        except (OSError, LevelFormatError):
+            pass  # No binary copy, or an unreadable one
+        if level_data is None:
+            with open(level_file, "r") as f:
+                level_data = json.load(f)
+    validate_waves(level_data.get("waves", []))
+    return level_data
+
+
+def validate_waves(waves):
+    """
+    Raise ValueError unless `waves` is a list of {"groups": [...]} waves whose
+    groups each have a whole, non-negative "count" (and numeric optional fields).
+    """
+    if not isinstance(waves, list):
+        raise ValueError("waves must be a list")
+    for number, wave in enumerate(waves, 1):
+        if not isinstance(wave, dict) or not isinstance(wave.get("groups"), list):
+            raise ValueError(f"wave {number}: \"groups\" must be a list")
+        for group in wave["groups"]:
+            if not isinstance(group, dict):
+                raise ValueError(f"wave {number}: each group must be an object")
+            count = group.get("count")
+            if not isinstance(count, int) or isinstance(count, bool) or count < 0:
+                raise ValueError(f"wave {number}: group count must be a whole number >= 0, not {count!r}")
+            for field in ("interval", "delay", "rare_chance"):
+                value = group.get(field, 0)
+                if not isinstance(value, (int, float)) or isinstance(value, bool) or value < 0:
+                    raise ValueError(f"wave {number}: group {field} must be a number >= 0, not {value!r}")
+
+
+def list_level_files(levels_dir=LEVELS_DIR):
+    """
+    Level file names in levels_dir: every JSON level, plus binary levels that have
+    no JSON source.
+    """
+    files = os.listdir(levels_dir)
+    json_names = {f[:-len(".json")] for f in files if f.endswith(".json")}
+    binary_only = [f for f in files
+                   if f.endswith(BINARY_EXTENSION) and f[:-len(BINARY_EXTENSION)] not in json_names]
+    return sorted([f for f in files if f.endswith(".json")] + binary_only)
+
+
+def thumbnail_file(levels_dir, level_name):
+    return os.path.join(levels_dir, f"{level_name}_thumb.png")
+
+
+class LevelIndex:
+    """
+    Summary of every level in a directory (name, mtime, path length, tower count,
+    thumbnail hash), persisted under levels/.cache so only new or modified level
+    files have to be read again.
+    """
+
+    def __init__(self, levels_dir=LEVELS_DIR, index_file=None):
+        self.levels_dir = levels_dir
+        self.index_file = index_file or os.path.join(levels_dir, ".cache", "index.json")
+        self.entries = {}  # Level name -> entry dict
+        self.dirty = False
+
+    def load(self):
+        try:
+            with open(self.index_file, "r") as f:
+                self.entries = {entry["name"]: entry for entry in json.load(f)}
+        except (OSError, ValueError, KeyError, TypeError):
+            self.entries = {}  # Missing or unreadable index, rebuild from scratch
+
+    def save(self):
+        if not self.dirty:
+            return
+        os.makedirs(os.path.dirname(self.index_file), exist_ok=True)
+        with open(self.index_file, "w") as f:
+            json.dump(sorted(self.entries.values(), key=lambda entry: entry["name"]), f)
+        self.dirty = False
+
+    def refresh(self):
+        """
+        Re-read level files whose mtime changed, drop entries for deleted files and
+        return a sorted list of entry copies.
+        """
+        names = set()
+        for level_file in list_level_files(self.levels_dir):
+            name = os.path.splitext(level_file)[0]
+            names.add(name)
+            mtime = os.path.getmtime(os.path.join(self.levels_dir, level_file))
+            entry = self.entries.get(name)
+            if entry is not None and entry["mtime"] == mtime:
+                if entry["thumbnail_hash"] and self.thumbnail_mtime(name) != entry["thumbnail_mtime"]:
+                    entry["thumbnail_hash"] = None  # Thumbnail replaced on disk
+                    self.dirty = True
+                continue
+
+            try:
+                level_data = load_level_data(os.path.join(self.levels_dir, level_file))
+                path = CompiledPath(level_data["path"])
+                towers = len(level_data["towers"])
+            except (OSError, ValueError, KeyError, TypeError):
+                path = CompiledPath([])  # Broken level: list it, loading will report the error
+                towers = 0
+            self.entries[name] = {
+                "name": name,
+                "file": level_file,
+                "mtime": mtime,
+                "path_points": len(path.points),
+                "path_length": round(path.length, 1),
+                "towers": towers,
+                "thumbnail_hash": None,
+                "thumbnail_mtime": None,
+            }
+            self.dirty = True
+
+        for name in set(self.entries) - names:
+            del self.entries[name]
+            self.dirty = True
+        return [dict(self.entries[name]) for name in sorted(self.entries)]
+
+    def thumbnail_mtime(self, name):
+        try:
+            return os.path.getmtime(thumbnail_file(self.levels_dir, name))
+        except OSError:
+            return None
+
+    def set_thumbnail(self, name, digest, mtime):
+        entry = self.entries.get(name)
+        if entry is not None and (entry["thumbnail_hash"], entry["thumbnail_mtime"]) != (digest, mtime):
+            entry["thumbnail_hash"] = digest
+            entry["thumbnail_mtime"] = mtime
+            self.dirty = True
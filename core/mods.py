@@ -0,0 +1,70 @@
+"""
+Mod discovery. Every package under mods/ is a mod. What a scan finds is kept in
+mods/.manifest.json and reused while the same packages exist with unchanged
+__init__.py mtimes, so startup doesn't re-read and parse every mod's source.
+
+A mod's description is the first line of its module docstring. Discovery never
+imports a mod.
+"""
+import ast
+import json
+import os
+
+MODS_DIR = "mods"
+MANIFEST_FILE = ".manifest.json"
+MANIFEST_VERSION = 1
+
+
+def mod_packages(mods_dir):
+    # (name, __init__.py) of each package; cheap enough to run on every start
+    packages = []
+    for name in sorted(os.listdir(mods_dir)):
+        init_file = os.path.join(mods_dir, name, "__init__.py")
+        if not name.startswith((".", "_")) and os.path.isfile(init_file):
+            packages.append((name, init_file))
+    return packages
+
+
+def describe_mod(name, init_file):
+    with open(init_file, "r", encoding="utf-8") as f:
+        source = f.read()
+    try:
+        docstring = ast.get_docstring(ast.parse(source)) or ""
+    except SyntaxError:
+        docstring = ""  # Reported properly when the mod is imported
+    return {
+        "name": name,
+        "mtime": os.path.getmtime(init_file),
+        "description": docstring.strip().split("\n")[0],
+    }
+
+
+def discover_mods(mods_dir=MODS_DIR):
+    """
+    The mods in `mods_dir` as {"name", "mtime", "description"} dicts, from the
+    manifest while it is current.
+    """
+    if not os.path.isdir(mods_dir):
+        return []
+    packages = mod_packages(mods_dir)
+    manifest_file = os.path.join(mods_dir, MANIFEST_FILE)
+    try:
+        with open(manifest_file, "r") as f:
+            manifest = json.load(f)
+        mods = manifest["mods"]
+        if (manifest.get("version") == MANIFEST_VERSION and
+                [mod["name"] for mod in mods] == [name for name, _ in packages] and
+                all(mod["mtime"] == os.path.getmtime(init_file)
+                    for mod, (_, init_file) in zip(mods, packages))):
+            return mods
+    except (OSError, ValueError, KeyError, TypeError):
+        pass
+
+    mods = [describe_mod(name, init_file) for name, init_file in packages]
+    try:
+        with open(manifest_file, "w") as f:
+            json.dump({"version": MANIFEST_VERSION, "mods": mods}, f, indent=2)
+    except OSError:
+        pass  # Read-only install; scan again next time
+    return mods
+
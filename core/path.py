@@ -0,0 +1,55 @@
+import math
+from bisect import bisect_right
+
+
+class CompiledPath:
+    """
+    Arc-length table for an enemy path: cumulative segment lengths and unit
+    direction vectors, built once so any distance along the path can be turned
+    into a position or heading with a binary search.
+    """
+
+    def __init__(self, points):
+        self.points = [tuple(point) for point in points]
+        self.cumulative = [0.0]  # Distance along the path at each point
+        self.directions = []  # Unit vector of each segment
+        for (x1, y1), (x2, y2) in zip(self.points, self.points[1:]):
+            dx = x2 - x1
+            dy = y2 - y1
+            segment_length = math.hypot(dx, dy)
+            self.cumulative.append(self.cumulative[-1] + segment_length)
+            if segment_length > 0:
+                self.directions.append((dx / segment_length, dy / segment_length))
+            else:
+                self.directions.append((0.0, 0.0))
+        self.length = self.cumulative[-1]
+
+    def segment_at(self, distance):
+        """
+        Index of the segment containing `distance`, clamped to the path.
+        """
+        index = bisect_right(self.cumulative, distance) - 1
+        return max(0, min(index, len(self.directions) - 1))
+
+    def position_at(self, distance):
+        if len(self.points) < 2:
+            return self.points[0] if self.points else (0, 0)
+        if distance >= self.length:
+            return self.points[-1]
+
+        index = self.segment_at(distance)
+        offset = max(distance - self.cumulative[index], 0.0)
+        x, y = self.points[index]
+        ux, uy = self.directions[index]
+        return x + ux * offset, y + uy * offset
+
+    def direction_at(self, distance):
+        if not self.directions:
+            return (0.0, 0.0)
+        return self.directions[self.segment_at(distance)]
+
+    def point_at_fraction(self, t):
+        """
+        Position at a fraction t (0 to 1) of the total path length.
+        """
+        return self.position_at(t * self.length)
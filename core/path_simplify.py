@@ -0,0 +1,133 @@
+"""
+Clean-up for hand-drawn paths: Ramer-Douglas-Peucker simplification to a
+tolerance, optionally followed by a Catmull-Rom curve through the remaining
+points, sampled at a fixed spacing.
+
+Rewrite every level in place (other level fields are kept) with:
+
+    python -m core.path_simplify [--tolerance 3] [--smooth SPACING] [--dry-run] [levels/*.json]
+"""
+import json
+import math
+import os
+import sys
+from core.geometry import point_segment_distance
+
+DEFAULT_TOLERANCE = 3.0  # Pixels a simplified path may stray from the drawn one
+
+
+def simplify_path(points, tolerance=DEFAULT_TOLERANCE):
+    """
+    Ramer-Douglas-Peucker: drop every point whose removal moves the path by no
+    more than `tolerance`. The end points are always kept.
+    """
+    points = [tuple(point) for point in points]
+    if len(points) < 3:
+        return points
+
+    keep = [False] * len(points)
+    keep[0] = keep[-1] = True
+    stack = [(0, len(points) - 1)]
+    while stack:
+        first, last = stack.pop()
+        x1, y1 = points[first]
+        x2, y2 = points[last]
+        farthest = None
+        farthest_distance = tolerance
+        for index in range(first + 1, last):
+            distance = point_segment_distance(*points[index], x1, y1, x2, y2)
+            if distance > farthest_distance:
+                farthest = index
+                farthest_distance = distance
+        if farthest is not None:
+            keep[farthest] = True
+            stack.append((first, farthest))
+            stack.append((farthest, last))
+    return [point for point, kept in zip(points, keep) if kept]
+
+
+def smooth_path(points, spacing=10.0):
+    """
+    Catmull-Rom spline through `points`, sampled roughly every `spacing` pixels
+    along each span. Passes through every input point.
+    """
+    points = [tuple(point) for point in points]
+    if len(points) < 3:
+        return points
+
+    # Repeat the end points so the curve starts and ends on them
+    control = [points[0]] + points + [points[-1]]
+    smoothed = [points[0]]
+    for i in range(1, len(control) - 2):
+        p0, p1, p2, p3 = control[i - 1], control[i], control[i + 1], control[i + 2]
+        steps = max(1, int(math.ceil(math.hypot(p2[0] - p1[0], p2[1] - p1[1]) / spacing)))
+        for step in range(1, steps + 1):
+            t = step / steps
+            t2 = t * t
+            t3 = t2 * t
+            smoothed.append(tuple(
+                0.5 * (2 * p1[axis] + (p2[axis] - p0[axis]) * t +
+                       (2 * p0[axis] - 5 * p1[axis] + 4 * p2[axis] - p3[axis]) * t2 +
+                       (3 * p1[axis] - p0[axis] - 3 * p2[axis] + p3[axis]) * t3)
+                for axis in (0, 1)
+            ))
+    return smoothed
+
+
+def max_deviation(original, simplified):
+    # Farthest any original point lies from the new path
+    segments = list(zip(simplified, simplified[1:]))
+    if not segments:
+        return 0.0
+    return max(min(point_segment_distance(x, y, *start, *end) for start, end in segments)
+               for x, y in original)
+
+
+def prepare_path(points, tolerance=DEFAULT_TOLERANCE, smooth_spacing=None):
+    """
+    The ingest pipeline: simplify, then optionally smooth. Returns the new points
+    (rounded to 0.1 px) and a report dict.
+    """
+    result = simplify_path(points, tolerance)
+    if smooth_spacing:
+        result = smooth_path(result, smooth_spacing)
+    result = [[round(x, 1), round(y, 1)] for x, y in result]
+    report = {
+        "points_before": len(points),
+        "points_after": len(result),
+        "max_deviation": round(max_deviation(points, result), 2),
+    }
+    return result, report
+
+
+def format_report(report):
+    return (f"{report['points_before']} -> {report['points_after']} points "
+            f"(max deviation {report['max_deviation']} px)")
+
+
+def main(argv=None):
+    import argparse
+    from core.levels import LEVELS_DIR
+    parser = argparse.ArgumentParser(description="Simplify (and optionally smooth) level paths in place.")
+    parser.add_argument("level_files", nargs="*", help="JSON levels (default: every level in levels/)")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE,
+                        help="maximum distance in pixels a removed point may lie from the new path")
+    parser.add_argument("--smooth", type=float, metavar="SPACING",
+                        help="fit a Catmull-Rom curve sampled every SPACING pixels")
+    parser.add_argument("--dry-run", action="store_true", help="report without rewriting files")
+    args = parser.parse_args(argv)
+
+    files = args.level_files or [os.path.join(LEVELS_DIR, f)
+                                 for f in sorted(os.listdir(LEVELS_DIR)) if f.endswith(".json")]
+    for level_file in files:
+        with open(level_file, "r") as f:
+            level_data = json.load(f)
+        level_data["path"], report = prepare_path(level_data["path"], args.tolerance, args.smooth)
+        if not args.dry_run:
+            with open(level_file, "w") as f:
+                json.dump(level_data, f)
+        print(f"{level_file}: {format_report(report)}")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
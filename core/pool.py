@@ -0,0 +1,44 @@
+class ObjectPool:
+    """
+    Free list of reusable entities. acquire() hands back a released object after
+    calling its reset() with the same arguments as the constructor, or builds a new
+    one when the pool is empty; release() returns an object for reuse. The caller
+    must make sure nothing still refers to an object it releases.
+    """
+
+    def __init__(self, factory, max_free=4096):
+        self.factory = factory
+        self.max_free = max_free  # Released objects beyond this are left to the GC
+        self.free = []
+        self.acquired = 0
+        self.reused = 0
+        self.released = 0
+
+    def acquire(self, *args):
+        self.acquired += 1
+        if self.free:
+            obj = self.free.pop()
+            obj.reset(*args)
+            self.reused += 1
+            return obj
+        return self.factory(*args)
+
+    def release(self, obj):
+        self.released += 1
+        if len(self.free) < self.max_free:
+            self.free.append(obj)
+
+    def live_count(self):
+        return self.acquired - self.released
+
+    def hit_rate(self):
+        return self.reused / self.acquired if self.acquired else 0.0
+
+    def stats(self):
+        return {
+            "acquired": self.acquired,
+            "reused": self.reused,
+            "hit_rate": round(self.hit_rate(), 4),
+            "live": self.live_count(),
+            "free": len(self.free),
+        }
@@ -0,0 +1,93 @@
+import json
+import threading
+from collections import deque
+
+
+def percentile(sorted_samples, fraction):
+    if not sorted_samples:
+        return 0.0
+    index = min(len(sorted_samples) - 1, int(len(sorted_samples) * fraction))
+    return sorted_samples[index]
+
+
+class FrameProfiler:
+    """
+    Per-phase frame timings. Phases add their perf_counter() durations during a
+    frame and end_frame() folds them into rolling windows (and the trace file, if
+    one is open). Nothing calls into it while it is disabled.
+
+    The simulation thread add()s its phases while the Tk thread renders and ends
+    frames, so the running totals are only touched under `lock`.
+    """
+
+    SIMULATION_PHASES = ("waves", "enemies", "towers", "projectiles")
+    PHASES = SIMULATION_PHASES + ("render",)
+
+    def __init__(self, history=600):
+        self.enabled = False
+        self.frame_times = deque(maxlen=history)
+        self.phase_times = {phase: deque(maxlen=history) for phase in self.PHASES}
+        self.counts = {}
+        self.current = dict.fromkeys(self.PHASES, 0.0)
+        self.lock = threading.Lock()
+        self.frame_count = 0
+        self.trace = None
+
+    def add(self, phase, seconds):
+        with self.lock:
+            self.current[phase] += seconds
+
+    def end_frame(self, frame_seconds, **counts):
+        """
+        Close the current frame. `counts` are entity/item counts to record with it.
+        """
+        with self.lock:
+            current = self.current
+            self.current = dict.fromkeys(self.PHASES, 0.0)
+
+        self.frame_count += 1
+        self.frame_times.append(frame_seconds)
+        for phase, seconds in current.items():
+            self.phase_times[phase].append(seconds)
+        self.counts = counts
+
+        if self.trace:
+            record = {"frame": self.frame_count, "frame_ms": round(frame_seconds * 1000, 4)}
+            for phase, seconds in current.items():
+                record[phase + "_ms"] = round(seconds * 1000, 4)
+            record.update(counts)
+            self.trace.write(json.dumps(record) + "\n")
+
+    def start_trace(self, trace_file):
+        self.stop_trace()
+        self.trace = open(trace_file, "w")
+
+    def stop_trace(self):
+        if self.trace:
+            self.trace.close()
+            self.trace = None
+
+    def summary(self):
+        frames = sorted(self.frame_times)
+        return {
+            "frames": len(frames),
+            "p50_ms": percentile(frames, 0.50) * 1000,
+            "p95_ms": percentile(frames, 0.95) * 1000,
+            "p99_ms": percentile(frames, 0.99) * 1000,
+            "phase_mean_ms": {
+                phase: (sum(samples) / len(samples) * 1000 if samples else 0.0)
+                for phase, samples in self.phase_times.items()
+            },
+            "counts": dict(self.counts),
+        }
+
+    def format_summary(self):
+        summary = self.summary()
+        lines = [f"frame p50 {summary['p50_ms']:.1f}  p95 {summary['p95_ms']:.1f}  "
+                 f"p99 {summary['p99_ms']:.1f} ms"]
+        for phase, mean in summary["phase_mean_ms"].items():
+            lines.append(f"{phase:<12}{mean:7.2f} ms")
+        for name, count in summary["counts"].items():
+            lines.append(f"{name:<12}{count:7d}")
+        return "\n".join(lines)
+
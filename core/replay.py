@@ -0,0 +1,203 @@
+"""
+Replay files: a JSON header line (seed, settings, and for games resumed from a
+checkpoint the checkpoint itself) followed by one compact JSON array per line, [tick, kind, *args], appended as the game is played. Every
+CHECKSUM_INTERVAL ticks a [tick, "#", checksum] line records the world state so
+playback can prove it stayed in sync.
+
+Verify a recording headlessly (and time it) with:
+
+    python -m core.replay replays/<file>.jsonl [--arrays]
+"""
+import base64
+import json
+import os
+import sys
+import time
+import zlib
+from core.simulation import Simulation
+from core.checkpoint import load_checkpoint
+
+FORMAT_VERSION = 3  # 3: shots deal their tower's damage
+CHECKSUM_INTERVAL = 60  # Ticks between state checksums (one per simulated second)
+
+# Actions that change the world; anything else in a log (pauses, editor toggles)
+# is kept for context only
+STATE_ACTIONS = ("place_tower", "upgrade_tower", "start_wave", "load_level", "path_point", "set_path", "clear")
+
+
+def prune_replays(replays_dir, keep):
+    """
+    Delete all but the newest `keep` recordings (replay_<time>.jsonl) in
+    replays_dir. Other files there are left alone.
+    """
+    try:
+        names = sorted(name for name in os.listdir(replays_dir)
+                       if name.startswith("replay_") and name.endswith(".jsonl"))
+    except OSError:
+        return
+    for name in names[:max(len(names) - keep, 0)]:
+        try:
+            os.remove(os.path.join(replays_dir, name))
+        except OSError:
+            pass  # Open elsewhere or already gone; try again next time
+
+
+def simulation_settings(sim):
+    # The upper-case instance attributes are the tunable game constants
+    return {name: value for name, value in vars(sim).items() if name.isupper()}
+
+
+class ReplayRecorder:
+    """
+    Appends a simulation's player inputs and periodic checksums to a replay file.
+    Attach with `sim.recorder = recorder`; Simulation calls record() and after_tick().
+    """
+
+    def __init__(self, replay_file, sim, checksum_interval=CHECKSUM_INTERVAL, checkpoint=None):
+        """
+        `checkpoint` is the dump_checkpoint() data a resumed game started from;
+        playback then starts from it rather than from a fresh world.
+        """
+        self.file = open(replay_file, "w")
+        self.checksum_interval = checksum_interval
+        header = {
+            "version": FORMAT_VERSION,
+            "seed": sim.seed,
+            "tick": sim.tick_count,
+            "checksum_interval": checksum_interval,
+            "settings": simulation_settings(sim),
+        }
+        if checkpoint is not None:
+            header["checkpoint"] = base64.b64encode(zlib.compress(checkpoint)).decode("ascii")
+        self.write(header)
+
+    def write(self, record):
+        self.file.write(json.dumps(record, separators=(",", ":")) + "\n")
+        self.file.flush()  # Keep the log usable if the game dies mid-session
+
+    def record(self, tick, kind, args):
+        self.write([tick, kind, *args])
+
+    def after_tick(self, sim):
+        if sim.tick_count % self.checksum_interval == 0:
+            self.write([sim.tick_count, "#", sim.state_checksum()])
+
+    def close(self, sim):
+        if not self.file.closed:
+            self.write([sim.tick_count, "end"])
+            self.file.close()
+
+
+class ReplayPlayback:
+    """
+    Feeds a recorded input log back into a simulation at the recorded ticks and
+    checks the recorded checksums. Attach with `sim.playback = playback`.
+    """
+
+    def __init__(self, header, records):
+        self.header = header
+        self.actions = [record for record in records if record[1] not in ("#", "end")]
+        self.checksums = {record[0]: record[2] for record in records if record[1] == "#"}
+        self.end_tick = max([header.get("tick", 0)] + [record[0] for record in records])
+        self.next_action = 0
+        self.verified = 0
+        self.mismatches = []  # (tick, recorded, actual)
+
+    @classmethod
+    def load(cls, replay_file):
+        with open(replay_file, "r") as f:
+            header = json.loads(f.readline())
+            if header.get("version") != FORMAT_VERSION:
+                raise ValueError(f"{replay_file}: unsupported replay version {header.get('version')}")
+            records = [json.loads(line) for line in f if line.strip()]
+        return cls(header, records)
+
+    def create_simulation(self, simulation_class=Simulation):
+        if "checkpoint" in self.header:
+            sim = load_checkpoint(zlib.decompress(base64.b64decode(self.header["checkpoint"])),
+                                  simulation_class)
+        else:
+            sim = simulation_class(seed=self.header["seed"], settings=self.header["settings"])
+        sim.playback = self
+        return sim
+
+    def finished(self, sim):
+        return sim.tick_count >= self.end_tick
+
+    def before_tick(self, sim):
+        # Inputs recorded at tick N happened after N ticks had run
+        while (self.next_action < len(self.actions) and
+               self.actions[self.next_action][0] <= sim.tick_count):
+            tick, kind, *args = self.actions[self.next_action]
+            self.next_action += 1
+            self.apply(sim, kind, args)
+
+    def apply(self, sim, kind, args):
+        if kind == "place_tower":
+            sim.place_tower(*args)
+        elif kind == "upgrade_tower":
+            sim.upgrade_tower(sim.towers[args[0]])
+        elif kind == "start_wave":
+            sim.start_wave()
+        elif kind == "load_level":
+            sim.load_level(args[0])
+            sim.events.append(("path_changed",))
+        elif kind == "path_point":
+            sim.add_path_point(*args)
+            sim.events.append(("path_changed",))
+        elif kind == "set_path":
+            sim.set_path(args[0])
+            sim.events.append(("path_changed",))
+        elif kind == "clear":
+            sim.clear()
+            sim.events.append(("path_changed",))
+
+    def after_tick(self, sim):
+        recorded = self.checksums.get(sim.tick_count)
+        if recorded is not None:
+            actual = sim.state_checksum()
+            if actual == recorded:
+                self.verified += 1
+            else:
+                self.mismatches.append((sim.tick_count, recorded, actual))
+
+    def run(self, sim):
+        """
+        Re-simulate headlessly up to the last recorded tick. Returns a summary dict.
+        """
+        started = time.perf_counter()
+        while not self.finished(sim) and not sim.game_over:
+            sim.step()
+        self.before_tick(sim)  # Inputs recorded after the final tick
+        seconds = time.perf_counter() - started
+        return {
+            "ticks": sim.tick_count,
+            "seconds": round(seconds, 4),
+            "ticks_per_second": round(sim.tick_count / seconds) if seconds else None,
+            "checksums_verified": self.verified,
+            "mismatches": self.mismatches[:10],
+            "wave": sim.wave,
+            "lives": sim.lives,
+            "score": sim.score,
+        }
+
+
+def main(argv=None):
+    import argparse
+    parser = argparse.ArgumentParser(description="Re-simulate a replay headlessly and verify its checksums.")
+    parser.add_argument("replay_file")
+    parser.add_argument("--arrays", action="store_true", help="use the NumPy array-backed simulation")
+    args = parser.parse_args(argv)
+
+    playback = ReplayPlayback.load(args.replay_file)
+    simulation_class = Simulation
+    if args.arrays:
+        from core.arrays import ArraySimulation
+        simulation_class = ArraySimulation
+    summary = playback.run(playback.create_simulation(simulation_class))
+    print(json.dumps(summary))
+    return 1 if summary["mismatches"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,34 @@
+import heapq
+
+
+class Scheduler:
+    """
+    Priority queue of timed events. Entries are (due, sequence, kind, args); the
+    sequence number keeps events due at the same time in the order they were
+    scheduled. Checking for due events is a single comparison against the head of
+    the heap, so idle ticks cost next to nothing.
+    """
+
+    def __init__(self):
+        self.heap = []
+        self.sequence = 0
+
+    def __len__(self):
+        return len(self.heap)
+
+    def schedule(self, due, kind, *args):
+        self.sequence += 1
+        heapq.heappush(self.heap, (due, self.sequence, kind, args))
+
+    def pop_due(self, now):
+        """
+        Remove and return (kind, args) of the earliest event due at or before now,
+        or None. Events scheduled while handling one are seen by the next call.
+        """
+        if self.heap and self.heap[0][0] <= now:
+            _, _, kind, args = heapq.heappop(self.heap)
+            return kind, args
+        return None
+
+    def clear(self):
+        self.heap = []
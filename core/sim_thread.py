@@ -0,0 +1,212 @@
+"""
+Runs a Simulation on its own thread at the fixed tick rate, independent of how
+fast (or whether) the Tk side is drawing.
+
+The two sides share no locks on the hot path:
+
+- the simulation thread publishes immutable WorldSnapshots by replacing the
+  (previous, latest) pair in one assignment; readers take the pair once per frame
+- front-end events come back through a SimpleQueue
+- player actions go in through a SimpleQueue and run between ticks
+"""
+import queue
+import threading
+import time
+from collections import namedtuple
+from concurrent.futures import Future
+
+TowerState = namedtuple("TowerState", "x y level turret_angle damage range")
+
+WorldSnapshot = namedtuple("WorldSnapshot", [
+    "tick", "wall_time", "path",
+    "money", "score", "lives", "wave", "wave_in_progress", "enemies_defeated",
+    "wave_enemy_count", "cooldown_remaining", "game_over",
+    "towers", "enemies", "projectiles",
+    "enemy_reuse", "projectile_reuse",  # Object pool hit rates, 0-1
+])
+
+
+def take_snapshot(sim, wall_time):
+    return WorldSnapshot(
+        tick=sim.tick_count,
+        wall_time=wall_time,
+        path=sim.get_compiled_path(),  # Replaced, never modified, when the path changes
+        money=sim.money,
+        score=sim.score,
+        lives=sim.lives,
+        wave=sim.wave,
+        wave_in_progress=sim.wave_in_progress,
+        enemies_defeated=sim.enemies_defeated,
+        wave_enemy_count=sim.wave_enemy_count,
+        cooldown_remaining=sim.cooldown_remaining(),
+        game_over=sim.game_over,
+        towers=tuple(TowerState(tower.x, tower.y, tower.level, tower.turret_angle,
+                                tower.damage, tower.range) for tower in sim.towers),
+        enemies=tuple(sim.enemy_states()),
+        projectiles=tuple(sim.projectile_states()),
+        enemy_reuse=sim.enemy_pool.hit_rate(),
+        projectile_reuse=sim.projectile_pool.hit_rate(),
+    )
+
+
+def interpolate_states(previous, states, alpha):
+    """
+    Entity states (id, x, y, ...) moved `alpha` of the way from where the same
+    ids were in `previous`. New entities are drawn where they are.
+    """
+    if alpha >= 1.0 or not previous:
+        return states
+    previous_positions = {state[0]: (state[1], state[2]) for state in previous}
+    result = []
+    for state in states:
+        start = previous_positions.get(state[0])
+        if start is None:
+            result.append(state)
+        else:
+            x = start[0] + (state[1] - start[0]) * alpha
+            y = start[1] + (state[2] - start[1]) * alpha
+            result.append((state[0], x, y) + tuple(state[3:]))
+    return result
+
+
+class SimulationThread:
+    """
+    Owns a Simulation while it runs. Only the simulation thread touches it; other
+    threads use call(), read snapshots() and drain events.
+    """
+
+    FAST_FRAME_BUDGET = 0.012  # Seconds of simulation per loop at max speed
+    FAST_YIELD = 0.002  # Pause between max-speed loops so the Tk thread gets the GIL
+
+    def __init__(self, sim):
+        self.sim = sim
+        self.commands = queue.SimpleQueue()  # (future, function, args)
+        self.events = queue.SimpleQueue()  # Simulation events, in order
+        self.paused = False
+        self.speed = 1  # Game speed multiplier; None runs as fast as possible
+        self.running = False
+        self.thread = None
+        self.snapshot_pair = (None, take_snapshot(sim, time.perf_counter()))
+
+    def start(self):
+        self.running = True
+        self.thread = threading.Thread(target=self.run, name="simulation", daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        self.running = False
+        if self.thread is not None and self.thread is not threading.current_thread():
+            self.thread.join()
+        self.thread = None
+        self.run_commands()  # Anything queued after the last loop still gets an answer
+
+    def call(self, function, *args):
+        """
+        Run sim.<function>(*args) (for a method name) or function(sim, *args) on
+        the simulation thread between ticks. Returns a Future; its result is
+        available once a snapshot including the change has been published.
+        """
+        future = Future()
+        self.commands.put((future, function, args))
+        if not self.running:
+            self.run_commands()  # No thread (not started, stopped or game over)
+        return future
+
+    def snapshots(self):
+        return self.snapshot_pair
+
+    def interpolation(self, now):
+        """
+        (previous, latest, alpha) for drawing at wall time `now`: the frame shows
+        previous -> latest over the time it took the simulation to get from one to
+        the other, so motion stays smooth whatever the two loops' rates.
+        """
+        previous, latest = self.snapshot_pair
+        if previous is None or latest.tick == previous.tick:
+            return previous, latest, 1.0
+        interval = latest.wall_time - previous.wall_time
+        alpha = (now - latest.wall_time) / interval if interval > 0 else 1.0
+        return previous, latest, min(max(alpha, 0.0), 1.0)
+
+    def pop_events(self):
+        events = []
+        while True:
+            try:
+                events.append(self.events.get_nowait())
+            except queue.Empty:
+                return events
+
+    # Simulation thread
+
+    def run(self):
+        sim = self.sim
+        last = time.perf_counter()
+        while self.running:
+            changed = self.run_commands()
+
+            now = time.perf_counter()
+            elapsed = now - last
+            last = now
+            ticks = 0
+            if not self.paused and not sim.game_over:
+                if self.speed is None:
+                    ticks = sim.run_for(self.FAST_FRAME_BUDGET)
+                else:
+                    ticks = sim.advance(elapsed * self.speed, sim.MAX_TICKS_PER_ADVANCE * self.speed)
+            else:
+                sim.accumulator = 0.0  # Don't catch up on time spent paused
+
+            if sim.playback is not None and (sim.playback.finished(sim) or sim.game_over):
+                self.finish_playback()
+            if ticks or changed:
+                self.publish()
+            if sim.game_over:
+                # Stop before the front end hears about it, so its calls from then
+                # on run directly
+                self.running = False
+                self.forward_events()
+                self.run_commands()
+                break
+            self.forward_events()
+
+            if self.speed is None:
+                time.sleep(self.FAST_YIELD)
+            else:
+                time.sleep(max(0.0, sim.TICK - (time.perf_counter() - now)))
+
+    def run_commands(self):
+        changed = False
+        while True:
+            try:
+                future, function, args = self.commands.get_nowait()
+            except queue.Empty:
+                return changed
+            self.run_command(future, function, args)
+            changed = True
+
+    def run_command(self, future, function, args):
+        try:
+            if isinstance(function, str):
+                result = getattr(self.sim, function)(*args)
+            else:
+                result = function(self.sim, *args)
+        except Exception as e:
+            future.set_exception(e)
+            return
+        self.publish()  # Callers waiting on the result see the change in the snapshot
+        future.set_result(result)
+
+    def publish(self):
+        self.snapshot_pair = (self.snapshot_pair[1], take_snapshot(self.sim, time.perf_counter()))
+
+    def forward_events(self):
+        for event in self.sim.pop_events():
+            self.events.put(event)
+
+    def finish_playback(self):
+        # End of a replay: report how it went, hand the world back to the player, paused
+        playback = self.sim.playback
+        first_mismatch = playback.mismatches[0][0] if playback.mismatches else None
+        self.sim.playback = None
+        self.paused = True
+        self.events.put(("replay_finished", playback.verified, len(playback.mismatches), first_mismatch))
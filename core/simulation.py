@@ -0,0 +1,664 @@
+import math
+import random
+import time
+import zlib
+from entities.tower import Tower
+from entities.enemy import Enemy
+from entities.projectile import Projectile
+from core.spatial import SpatialGrid
+from core.path import CompiledPath
+from core.pool import ObjectPool
+from core.scheduler import Scheduler
+from core.levels import validate_waves
+
+
+class Simulation:
+    """
+    Headless game world. Advances in fixed ticks of simulated time and has no
+    Tk dependency, so it can be driven by the Tk front end or run on its own.
+    """
+
+    TICK_RATE = 60  # Simulation ticks per simulated second
+    TICK = 1.0 / TICK_RATE
+    MAX_TICKS_PER_ADVANCE = 15  # Drop backlog after a stall instead of spiralling
+    SPATIAL_INDEX_MIN_ENEMIES = 32  # Below this, towers scan the enemy list directly
+    PROJECTILE_SPEED = 10  # Matches Projectile.speed
+    ENEMY_RADIUS = 15  # Matches Projectile.hit_target()
+    MAX_FLIGHT_TICKS = 120  # Longest predicted flight in the analytic combat model
+
+    def __init__(self, enemy_path=None, towers=None, seed=None, settings=None):
+        self.GRID_SIZE = 50  # Tower placement grid, also the spatial index cell size
+
+        # Economy
+        self.TOWER_COST = 100
+        self.UPGRADE_COST = 150  # Cost to upgrade a tower
+        self.ENEMY_REWARD = 25
+        self.ENEMY_SCORE = 100
+
+        # Wave configuration
+        self.WAVE_COOLDOWN = 10000  # 10 seconds between waves
+        self.SPAWN_INTERVAL = 2000  # 2 seconds between enemies
+        self.ENEMIES_PER_WAVE = 5  # Starting number of enemies per wave
+        self.ENEMY_HEALTH_INCREASE = 20  # Health increase per wave
+        self.ENEMY_SPEED_INCREASE = 0.2  # Speed increase per wave
+        self.RARE_ENEMY_CHANCE = 0.1  # Chance of a rare enemy once they're unlocked
+        self.RARE_ENEMY_MIN_WAVE = 5  # First wave with rare enemies
+
+        # Combat: "projectiles" steps every shot as a homing projectile; "analytic"
+        # predicts each shot's impact tick and schedules the damage instead
+        self.COMBAT_MODEL = "projectiles"
+
+        # Overrides of the constants above (replays, checkpoints, batch sweeps), applied
+        # before anything below is built from them
+        for name, value in (settings or {}).items():
+            setattr(self, name, value)
+
+        # World state
+        self.money = 500
+        self.score = 0
+        self.lives = 10
+        self.wave = 1
+        self.enemy_path = list(enemy_path or [])
+        self.compiled_path = None  # Built on demand by get_compiled_path()
+        self.towers = [Tower(x, y) for x, y in (towers or [])]
+        self.enemies = []
+        self.projectiles = []
+        self.enemy_grid = SpatialGrid(self.GRID_SIZE)
+
+        # Recycled entities, so waves and heavy fire don't churn the allocator and GC
+        self.enemy_pool = ObjectPool(Enemy)
+        self.projectile_pool = ObjectPool(Projectile)
+
+        # Wave management
+        self.wave_in_progress = False
+        self.enemies_spawned = 0
+        self.enemies_defeated = 0
+        self.wave_enemy_count = 0  # Enemies in the current wave, over all its groups
+        self.wave_definitions = []  # Per-wave spawn groups from the level file, if any
+        self.wave_cooldown_start = None
+        self.game_over = False
+
+        # Timed events (spawns, cooldown expiry, delayed notifications), due in ticks
+        self.scheduler = Scheduler()
+
+        # Clock
+        self.tick_count = 0
+        self.time = 0.0  # Simulated seconds
+        self.accumulator = 0.0
+
+        # Per-game random source (rare enemy rolls), seeded for reproducible runs
+        self.seed = seed
+        self.random = random.Random(seed)
+
+        # Notifications for the front end, drained with pop_events()
+        self.events = []
+
+        # FrameProfiler timing each tick phase; None (the default) costs nothing
+        self.profiler = None
+
+        # Replay hooks (core.replay): input log being written / being played back
+        self.recorder = None
+        self.playback = None
+
+        # core.telemetry.Telemetry collecting samples and wave summaries; None costs nothing
+        self.telemetry = None
+
+        # Stable ids for enemies and projectiles, so renderers can track them
+        self.next_entity_id = 0
+
+    def load_level(self, level_data):
+        validate_waves(level_data.get("waves", []))
+        recorded = {"path": level_data["path"], "towers": level_data["towers"]}
+        if level_data.get("waves"):
+            recorded["waves"] = level_data["waves"]
+        self.record("load_level", recorded)
+        self.enemy_path = level_data["path"]
+        self.invalidate_path()
+        self.towers = [Tower(x, y) for x, y in level_data["towers"]]
+        self.wave_definitions = level_data.get("waves", [])
+
+    def clear(self):
+        self.record("clear")
+        self.enemy_path = []
+        self.invalidate_path()
+        self.towers = []
+        self.release_entities()
+        # Pending spawns, hits and cooldowns belonged to the old level
+        self.scheduler.clear()
+        self.wave_in_progress = False
+        self.wave_cooldown_start = None
+        self.enemies_spawned = 0
+        self.wave_enemy_count = 0
+
+    def release_entities(self):
+        # Return every live enemy and projectile to its pool, leaving none on the board
+        for enemy in self.enemies:
+            self.remove_enemy(enemy)
+        release = self.projectile_pool.release
+        for projectile in self.projectiles:
+            release(projectile)
+        self.enemies = []
+        self.projectiles = []
+
+    def add_path_point(self, x, y):
+        self.record("path_point", x, y)
+        self.enemy_path.append((x, y))
+        self.invalidate_path()
+
+    def set_path(self, points):
+        self.record("set_path", points)
+        self.enemy_path = [tuple(point) for point in points]
+        self.invalidate_path()
+
+    def invalidate_path(self):
+        # Call after any change to enemy_path so the arc-length table is rebuilt
+        self.compiled_path = None
+
+    def get_compiled_path(self):
+        if self.compiled_path is None:
+            self.compiled_path = CompiledPath(self.enemy_path)
+        return self.compiled_path
+
+    def record(self, kind, *args):
+        # Player inputs go to the replay log, tagged with the number of ticks run so far
+        if self.recorder is not None:
+            self.recorder.record(self.tick_count, kind, args)
+
+    def state_checksum(self):
+        """
+        CRC of the world state, rounded so it only changes with meaningful divergence.
+        """
+        state = (
+            self.tick_count, self.money, self.lives, self.score, self.wave,
+            self.enemies_spawned, self.enemies_defeated, self.wave_in_progress,
+            [(tower.x, tower.y, tower.level) for tower in self.towers],
+            [(enemy_id, round(float(x), 3), round(float(y), 3), round(float(health), 3))
+             for enemy_id, x, y, health, _ in self.enemy_states()],
+        )
+        return zlib.crc32(repr(state).encode("ascii"))
+
+    def pop_events(self):
+        events = self.events
+        self.events = []
+        return events
+
+    def new_entity_id(self):
+        self.next_entity_id += 1
+        return self.next_entity_id
+
+    def enemy_states(self):
+        """
+        (id, x, y, health, size_multiplier) for every live enemy.
+        """
+        return [(enemy.id, enemy.x, enemy.y, enemy.health, enemy.size_multiplier)
+                for enemy in self.enemies]
+
+    def projectile_states(self):
+        """
+        (id, x, y) for every projectile in flight.
+        """
+        return [(projectile.id, projectile.x, projectile.y) for projectile in self.projectiles]
+
+    def entity_columns(self):
+        """
+        Enemy and projectile fields as ({name: values}, {name: values}) for
+        checkpoints. Projectiles refer to their target by enemy id and to their
+        tower by index (-1 for none).
+        """
+        enemies = self.enemies
+        projectiles = self.projectiles
+        tower_index = {id(tower): index for index, tower in enumerate(self.towers)}
+        return {
+            "ids": [enemy.id for enemy in enemies],
+            "x": [enemy.x for enemy in enemies],
+            "y": [enemy.y for enemy in enemies],
+            "speed": [enemy.speed for enemy in enemies],
+            "health": [enemy.health for enemy in enemies],
+            "size_multiplier": [enemy.size_multiplier for enemy in enemies],
+            "distance": [enemy.distance for enemy in enemies],
+        }, {
+            "ids": [projectile.id for projectile in projectiles],
+            "x": [projectile.x for projectile in projectiles],
+            "y": [projectile.y for projectile in projectiles],
+            "prev_x": [projectile.prev_x for projectile in projectiles],
+            "prev_y": [projectile.prev_y for projectile in projectiles],
+            "speed": [projectile.speed for projectile in projectiles],
+            "target": [projectile.target.id for projectile in projectiles],
+            "source": [tower_index.get(id(projectile.source), -1) for projectile in projectiles],
+            "damage": [projectile.damage for projectile in projectiles],
+        }
+
+    def restore_entities(self, enemies, projectiles):
+        """
+        Replace the live entities with entity_columns()-shaped columns. Returns
+        {enemy id: enemy} for re-linking pending hits.
+        """
+        path = self.get_compiled_path()
+        targets = {}
+        self.release_entities()
+        for enemy_id, x, y, speed, health, size_multiplier, distance in zip(
+                enemies["ids"], enemies["x"], enemies["y"], enemies["speed"],
+                enemies["health"], enemies["size_multiplier"], enemies["distance"]):
+            enemy = self.enemy_pool.acquire(path, size_multiplier != 1)
+            enemy.id = enemy_id
+            enemy.x, enemy.y = x, y
+            enemy.speed = speed
+            enemy.health = health
+            enemy.size_multiplier = size_multiplier
+            enemy.distance = distance
+            self.enemies.append(enemy)
+            targets[enemy_id] = enemy
+
+        for projectile_id, x, y, prev_x, prev_y, speed, target_id, source, damage in zip(
+                projectiles["ids"], projectiles["x"], projectiles["y"], projectiles["prev_x"],
+                projectiles["prev_y"], projectiles["speed"], projectiles["target"],
+                projectiles["source"], projectiles["damage"]):
+            target = targets.get(target_id)
+            if target is None:
+                continue
+            projectile = self.projectile_pool.acquire(x, y, target, self.towers[source] if source >= 0 else None)
+            projectile.id = projectile_id
+            projectile.prev_x, projectile.prev_y = prev_x, prev_y
+            projectile.speed = speed
+            projectile.damage = damage
+            self.projectiles.append(projectile)
+        return targets
+
+    def tower_at(self, x, y):
+        for tower in self.towers:
+            if tower.x == x and tower.y == y:
+                return tower
+        return None
+
+    def level_data(self):
+        """
+        The current layout as a level dict, in the shape load_level() takes.
+        """
+        level_data = {
+            "path": list(self.enemy_path),
+            "towers": [(tower.x, tower.y) for tower in self.towers],
+        }
+        if self.wave_definitions:
+            level_data["waves"] = self.wave_definitions  # Keep the loaded level's waves
+        return level_data
+
+    def pool_stats(self):
+        return {"enemies": self.enemy_pool.stats(), "projectiles": self.projectile_pool.stats()}
+
+    # Player actions
+
+    def place_tower(self, x, y):
+        if self.money < self.TOWER_COST:
+            return None
+        for tower in self.towers:
+            if tower.x == x and tower.y == y:
+                return None
+
+        tower = Tower(x, y)
+        self.towers.append(tower)
+        self.money -= self.TOWER_COST
+        self.record("place_tower", x, y)
+        return tower
+
+    def upgrade_tower(self, tower):
+        if self.money < self.UPGRADE_COST or tower not in self.towers:
+            return False
+        self.record("upgrade_tower", self.towers.index(tower))
+        tower.upgrade()
+        self.money -= self.UPGRADE_COST
+        return True
+
+    def upgrade_tower_at(self, x, y):
+        # For front ends that only know towers by position (snapshots)
+        return self.upgrade_tower(self.tower_at(x, y))
+
+    def can_start_wave(self):
+        return (not self.wave_in_progress and
+                not self.game_over and
+                len(self.enemy_path) > 1 and
+                self.wave_cooldown_start is None)
+
+    def start_wave(self):
+        if not self.can_start_wave():
+            return False
+        self.record("start_wave")
+        self.wave_in_progress = True
+        self.enemies_spawned = 0
+        self.enemies_defeated = 0
+        if self.telemetry is not None:
+            self.telemetry.wave_started(self)
+
+        # Each group spawns on its own timer; the first enemy of an undelayed group
+        # appears on the next tick
+        groups = self.wave_groups()
+        self.wave_enemy_count = sum(group["count"] for group in groups)
+        for group in groups:
+            if group["count"] > 0:
+                self.scheduler.schedule(self.tick_count + self.ms_to_ticks(group["delay"]),
+                                        "spawn", group, group["count"])
+        if self.wave_enemy_count == 0:
+            self.check_wave_completion()  # Nothing will be removed to end it
+        return True
+
+    def wave_groups(self):
+        """
+        Spawn groups for the current wave: the level's own definition for it if it
+        has one, otherwise a single group of ENEMIES_PER_WAVE enemies. Missing group
+        fields fall back to the simulation's settings.
+        """
+        rare_chance = self.RARE_ENEMY_CHANCE if self.wave >= self.RARE_ENEMY_MIN_WAVE else 0
+        if self.wave <= len(self.wave_definitions):
+            definitions = self.wave_definitions[self.wave - 1]["groups"]
+        else:
+            definitions = [{"count": self.ENEMIES_PER_WAVE}]
+        return [{
+            "count": definition["count"],
+            "interval": definition.get("interval", self.SPAWN_INTERVAL),  # ms between enemies
+            "delay": definition.get("delay", 0),  # ms after the wave starts
+            "rare_chance": definition.get("rare_chance", rare_chance),
+        } for definition in definitions]
+
+    def ms_to_ticks(self, ms):
+        # Whole ticks, rounded up, so nothing fires before its time
+        return max(0, math.ceil(ms * self.TICK_RATE / 1000 - 1e-9))
+
+    def notify_after(self, seconds, event):
+        """
+        Queue a front-end event to come out of pop_events() after `seconds` of
+        simulated time.
+        """
+        self.scheduler.schedule(self.tick_count + self.ms_to_ticks(seconds * 1000), "notify", event)
+
+    def cooldown_remaining(self):
+        """
+        Seconds left before the next wave may start, or None if no cooldown is running.
+        """
+        if self.wave_cooldown_start is None:
+            return None
+        remaining = (self.WAVE_COOLDOWN - (self.time * 1000 - self.wave_cooldown_start)) / 1000
+        return max(remaining, 0.0)
+
+    # Clock
+
+    def advance(self, dt, max_ticks=None):
+        """
+        Advance the world by dt seconds of (scaled) real time, running as many fixed
+        ticks as fit. Returns the number of ticks run.
+        """
+        if max_ticks is None:
+            max_ticks = self.MAX_TICKS_PER_ADVANCE
+
+        self.accumulator += dt
+        ticks = 0
+        while self.accumulator >= self.TICK and not self.game_over:
+            if ticks >= max_ticks:
+                self.accumulator = 0.0
+                break
+            self.step()
+            self.accumulator -= self.TICK
+            ticks += 1
+        return ticks
+
+    def run_for(self, budget, check_every=8):
+        """
+        Run ticks back to back until `budget` seconds of wall-clock time are spent.
+        Used for the "as fast as possible" game speed. Returns the number of ticks run.
+        """
+        deadline = time.perf_counter() + budget
+        ticks = 0
+        while not self.game_over:
+            for _ in range(check_every):
+                self.step()
+            ticks += check_every
+            if time.perf_counter() >= deadline:
+                break
+        self.accumulator = 0.0
+        return ticks
+
+    def run_waves(self, count, max_ticks=None):
+        """
+        Play `count` waves back to back, starting each one as soon as the cooldown
+        allows. Returns the number of ticks run.
+        """
+        target_wave = self.wave + count
+        ticks = 0
+        while self.wave < target_wave and not self.game_over:
+            if max_ticks is not None and ticks >= max_ticks:
+                break
+            if self.can_start_wave():
+                self.start_wave()
+            elif not self.wave_in_progress and self.wave_cooldown_start is None:
+                break  # Nothing to play on (no path)
+            self.step()
+            ticks += 1
+        return ticks
+
+    def step(self):
+        """
+        Advance the world by exactly one tick.
+        """
+        if self.game_over:
+            return
+        if self.playback is not None:
+            self.playback.before_tick(self)
+
+        self.tick_count += 1
+        self.time = self.tick_count / self.TICK_RATE
+        if self.profiler is not None:
+            self.step_profiled()
+        else:
+            self.step_phases()
+
+        if self.recorder is not None:
+            self.recorder.after_tick(self)
+        if self.telemetry is not None:
+            self.telemetry.after_tick(self)
+        if self.playback is not None:
+            self.playback.after_tick(self)
+
+    def step_phases(self):
+        self.run_scheduled()
+        self.update_enemies()
+        if self.game_over:
+            return
+        self.update_towers()
+        self.update_projectiles()
+
+    def step_profiled(self):
+        # Same phases as step(), each timed into the profiler
+        profiler = self.profiler
+        started = time.perf_counter()
+        self.run_scheduled()
+        profiler.add("waves", time.perf_counter() - started)
+
+        started = time.perf_counter()
+        self.update_enemies()
+        profiler.add("enemies", time.perf_counter() - started)
+        if self.game_over:
+            return
+
+        started = time.perf_counter()
+        self.update_towers()
+        profiler.add("towers", time.perf_counter() - started)
+
+        started = time.perf_counter()
+        self.update_projectiles()
+        profiler.add("projectiles", time.perf_counter() - started)
+
+    # Tick phases
+
+    def run_scheduled(self):
+        # Handle every event that has come due; usually there is none
+        while True:
+            due = self.scheduler.pop_due(self.tick_count)
+            if due is None:
+                return
+            kind, args = due
+            if kind == "spawn":
+                self.spawn_enemy(*args)
+            elif kind == "cooldown_over":
+                self.wave_cooldown_start = None
+                self.events.append(("cooldown_over",))
+            elif kind == "notify":
+                self.events.append(args[0])
+            elif kind == "hit":
+                self.resolve_hit(*args)
+
+    def spawn_enemy(self, group, remaining):
+        # Roll for a rare enemy only when the group can have them, so the random
+        # sequence (and with it every seeded game) stays the same
+        is_rare = group["rare_chance"] > 0 and self.random.random() < group["rare_chance"]
+
+        self.add_enemy(self.create_enemy(is_rare))
+        self.enemies_spawned += 1
+        if remaining > 1:
+            self.scheduler.schedule(self.tick_count + self.ms_to_ticks(group["interval"]),
+                                    "spawn", group, remaining - 1)
+
+        if is_rare:
+            self.events.append(("rare_enemy",))
+
+    def create_enemy(self, is_rare):
+        # Create enemy with increased stats based on wave number
+        enemy = self.enemy_pool.acquire(self.get_compiled_path(), is_rare)
+        enemy.health += (self.wave - 1) * self.ENEMY_HEALTH_INCREASE
+        enemy.speed += (self.wave - 1) * self.ENEMY_SPEED_INCREASE
+        enemy.id = self.new_entity_id()
+        return enemy
+
+    def add_enemy(self, enemy):
+        self.enemies.append(enemy)
+
+    def update_enemies(self):
+        # After a path edit, enemies already on the board carry on from the same
+        # distance along the new path, as rows of ArraySimulation do. Enemies spawn
+        # in order, so if the first one is on the current path they all are.
+        path = self.get_compiled_path()
+        if self.enemies and self.enemies[0].path is not path:
+            for enemy in self.enemies:
+                enemy.path = path
+
+        survivors = []
+        for enemy in self.enemies:
+            enemy.update()
+            if enemy.reached_end:
+                self.lives -= 1
+                if self.lives <= 0:
+                    self.game_over = True
+                    self.events.append(("game_over", self.score))
+                    return
+                self.remove_enemy(enemy)
+            elif enemy.health <= 0:
+                self.enemies_defeated += 1
+                self.money += self.ENEMY_REWARD
+                self.score += self.ENEMY_SCORE
+                self.remove_enemy(enemy)
+            else:
+                survivors.append(enemy)
+        if len(survivors) < len(self.enemies):
+            self.enemies = survivors
+            self.check_wave_completion()
+
+    def remove_enemy(self, enemy):
+        # Projectiles still chasing it see alive == False and are dropped in this
+        # tick's update_projectiles(), before the pool can hand the enemy out again
+        enemy.alive = False
+        self.enemy_pool.release(enemy)
+
+    def update_towers(self):
+        # Each tower only looks at enemies in the grid cells its range overlaps, and
+        # the target it finds is shared by turret tracking and firing. Small waves
+        # are cheaper to scan directly than to index.
+        use_grid = len(self.enemies) >= self.SPATIAL_INDEX_MIN_ENEMIES
+        if use_grid:
+            self.enemy_grid.rebuild(self.enemies)
+        for tower in self.towers:
+            if use_grid:
+                candidates = self.enemy_grid.query(tower.x, tower.y, tower.range)
+            else:
+                candidates = self.enemies
+            tower.update(candidates, self.time)
+            if tower.can_shoot:
+                closest_enemy = tower.target
+                if closest_enemy:
+                    if self.COMBAT_MODEL == "analytic":
+                        self.schedule_hit(tower, closest_enemy, closest_enemy.id, closest_enemy.path,
+                                          closest_enemy.distance, closest_enemy.speed,
+                                          closest_enemy.size_multiplier)
+                    else:
+                        projectile = self.projectile_pool.acquire(tower.x, tower.y, closest_enemy, tower)
+                        projectile.id = self.new_entity_id()
+                        self.projectiles.append(projectile)
+                    tower.last_shot = self.time
+                    tower.shots_fired += 1
+
+    def flight_ticks(self, x, y, path, distance, speed, size_multiplier):
+        """
+        Ticks a projectile fired from (x, y) this tick needs to reach an enemy at
+        `distance` along `path`, assuming the enemy keeps walking at `speed`. The
+        projectile moves before the hit test on the tick it is fired, the enemy
+        moves before the projectile on every later tick.
+        """
+        reach = self.ENEMY_RADIUS * size_multiplier
+        # The enemy closes in by at most `speed` a tick, which rules out every tick
+        # before `first`; usually the answer is within a tick or two of it
+        target_x, target_y = path.position_at(distance)
+        gap = math.hypot(target_x - x, target_y - y) - reach
+        first = max(1, int((gap + speed) // (self.PROJECTILE_SPEED + speed)) + 1)
+        for ticks in range(first, self.MAX_FLIGHT_TICKS):
+            ahead = min(distance + (ticks - 1) * speed, path.length)
+            target_x, target_y = path.position_at(ahead)
+            if math.hypot(target_x - x, target_y - y) - reach < ticks * self.PROJECTILE_SPEED:
+                return ticks
+        return self.MAX_FLIGHT_TICKS
+
+    def schedule_hit(self, tower, target, target_id, path, distance, speed, size_multiplier):
+        # Same tick the projectile model would take the enemy off the board
+        ticks = self.flight_ticks(tower.x, tower.y, path, distance, speed, size_multiplier)
+        self.scheduler.schedule(self.tick_count + ticks, "hit", target, target_id, tower, tower.damage)
+
+    def resolve_hit(self, target, target_id, tower, damage):
+        # The enemy may have died or got through meanwhile, and a pooled enemy
+        # object may already be walking the path again under a new id
+        if target.alive and target.id == target_id:
+            target.health -= damage
+            tower.damage_dealt += damage
+
+    def update_projectiles(self):
+        in_flight = []
+        release = self.projectile_pool.release
+        for projectile in self.projectiles:
+            if not projectile.target.alive:
+                release(projectile)  # Target died or got through; nothing left to hit
+                continue
+            projectile.update()
+            if projectile.hit_target():
+                projectile.target.health -= projectile.damage
+                if projectile.source:
+                    projectile.source.damage_dealt += projectile.damage
+                release(projectile)
+            else:
+                in_flight.append(projectile)
+        self.projectiles = in_flight
+
+    def check_wave_completion(self):
+        # Called whenever enemies are removed; the last one out ends the wave
+        if (self.wave_in_progress and
+            self.enemies_spawned >= self.wave_enemy_count and
+            len(self.enemies) == 0):
+
+            self.wave_in_progress = False
+            self.wave += 1
+            self.ENEMIES_PER_WAVE += 2  # Increase enemies per wave
+            self.wave_cooldown_start = self.time * 1000
+            self.scheduler.schedule(self.tick_count + self.ms_to_ticks(self.WAVE_COOLDOWN),
+                                    "cooldown_over")
+
+            # Give wave completion bonus
+            wave_bonus = self.wave * 100
+            self.money += wave_bonus
+            self.score += wave_bonus
+            if self.telemetry is not None:
+                self.telemetry.wave_complete(self, wave_bonus)
+
+            self.events.append(("wave_complete", self.wave - 1, wave_bonus))
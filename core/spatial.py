@@ -0,0 +1,48 @@
+class SpatialGrid:
+    """
+    Uniform spatial hash over entities with x/y attributes. Rebuilt once per tick;
+    range queries only visit the cells overlapping the query circle.
+    """
+
+    def __init__(self, cell_size):
+        self.cell_size = cell_size
+        self.cells = {}
+
+    def rebuild(self, entities):
+        cells = {}
+        size = self.cell_size
+        for entity in entities:
+            key = (int(entity.x // size), int(entity.y // size))
+            bucket = cells.get(key)
+            if bucket is None:
+                cells[key] = [entity]
+            else:
+                bucket.append(entity)
+        self.cells = cells
+
+    def query(self, x, y, radius):
+        """
+        Entities in the cells overlapping the circle at (x, y). This is a superset of
+        the entities within `radius`; callers still check the exact distance.
+        """
+        size = self.cell_size
+        min_cx = int((x - radius) // size)
+        max_cx = int((x + radius) // size)
+        min_cy = int((y - radius) // size)
+        max_cy = int((y + radius) // size)
+
+        result = []
+        if (max_cx - min_cx + 1) * (max_cy - min_cy + 1) > len(self.cells):
+            # Fewer occupied cells than cells in range: walk the occupied ones instead
+            for (cx, cy), bucket in self.cells.items():
+                if min_cx <= cx <= max_cx and min_cy <= cy <= max_cy:
+                    result.extend(bucket)
+            return result
+
+        cells = self.cells
+        for cx in range(min_cx, max_cx + 1):
+            for cy in range(min_cy, max_cy + 1):
+                bucket = cells.get((cx, cy))
+                if bucket:
+                    result.extend(bucket)
+        return result
@@ -0,0 +1,103 @@
+"""
+Cold-start measurement: phase marks from the start of main.py to the first
+frame, appended to a JSON-lines log so time-to-first-frame can be tracked.
+
+For a per-module breakdown of import time, run the game under -X importtime
+and summarize its output:
+
+    python -X importtime main.py 2> imports.txt
+    python -m core.startup imports.txt [--top 20]
+"""
+import json
+import sys
+import time
+
+
+class StartupTimer:
+    def __init__(self, started=None):
+        self.started = time.perf_counter() if started is None else started
+        self.marks = []  # (phase, perf_counter() at its end), in order
+
+    def mark(self, phase):
+        self.marks.append((phase, time.perf_counter()))
+
+    def phases(self):
+        # Milliseconds spent in each phase, each from the end of the one before
+        result = {}
+        previous = self.started
+        for phase, ended in self.marks:
+            result[phase] = round((ended - previous) * 1000, 2)
+            previous = ended
+        return result
+
+    def total_ms(self):
+        return round((self.marks[-1][1] - self.started) * 1000, 2) if self.marks else 0.0
+
+    def report(self, target_ms=None):
+        report = {
+            "time": time.strftime("%Y-%m-%d %H:%M:%S"),
+            "total_ms": self.total_ms(),
+            "phases": self.phases(),
+        }
+        if target_ms is not None:
+            report["target_ms"] = target_ms
+            report["within_target"] = report["total_ms"] <= target_ms
+        return report
+
+    def write(self, log_file, target_ms=None, keep=None):
+        """
+        Append this launch's report to `log_file`, trimming it to the newest
+        `keep` launches if given.
+        """
+        report = self.report(target_ms)
+        with open(log_file, "a") as f:
+            f.write(json.dumps(report) + "\n")
+        if keep is not None:
+            with open(log_file, "r") as f:
+                lines = f.readlines()
+            if len(lines) > keep:
+                with open(log_file, "w") as f:
+                    f.writelines(lines[-keep:])
+        return report
+
+
+def parse_importtime(lines):
+    """
+    (self us, cumulative us, depth, module) for each entry of `python -X importtime`
+    output; depth 0 is a module imported directly rather than by another import.
+    """
+    entries = []
+    for line in lines:
+        if not line.startswith("import time:"):
+            continue
+        fields = line[len("import time:"):].split("|")
+        if len(fields) != 3 or not fields[0].strip().isdigit():
+            continue  # The column header
+        name = fields[2].rstrip()
+        depth = (len(name) - len(name.lstrip())) // 2 - 1
+        entries.append((int(fields[0]), int(fields[1]), max(depth, 0), name.strip()))
+    return entries
+
+
+def main(argv=None):
+    import argparse
+    parser = argparse.ArgumentParser(description="Summarize `python -X importtime` output.")
+    parser.add_argument("importtime_file", help="stderr of `python -X importtime main.py`")
+    parser.add_argument("--top", type=int, default=15, help="modules to list")
+    args = parser.parse_args(argv)
+
+    with open(args.importtime_file, "r") as f:
+        entries = parse_importtime(f)
+    top_level = sorted((entry for entry in entries if entry[2] == 0), key=lambda entry: -entry[1])
+    total = sum(entry[1] for entry in top_level)
+    print(f"{len(entries)} modules, {total / 1000:.1f} ms of imports")
+    print("Slowest imports, including what they import:")
+    for _, cumulative, _, name in top_level[:args.top]:
+        print(f"  {cumulative / 1000:8.1f} ms  {name}")
+    print("Slowest modules on their own:")
+    for own, _, _, name in sorted(entries, key=lambda entry: -entry[0])[:args.top]:
+        print(f"  {own / 1000:8.1f} ms  {name}")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
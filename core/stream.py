@@ -0,0 +1,449 @@
+"""
+Spectator stream: world state published over a local TCP socket as a keyframe
+followed by per-tick binary deltas, for observers in other processes
+(see observe.py).
+
+Wire format, little-endian. Every message is a u32 byte count followed by:
+
+    header      kind u8 (KEYFRAME or DELTA), sections u8, tick u32
+    scalars     money i32, score i32, lives i32, wave u32, enemies defeated u32,
+                wave enemy count u32, cooldown remaining f32 (-1 for none),
+                status u8 (only with SECTION_SCALARS)
+    path        u32 point count, then i16 x, y per point (only with SECTION_PATH)
+    towers      } each: u32 changed count, the changed records,
+    enemies     }       u32 removed count, u32 id per removed entity
+    projectiles }
+
+Records (positions in 1/POSITION_SCALE px):
+
+    tower       id u32 (x << 16 | y), x i16, y i16, level u8, turret angle u16
+    enemy       id u32, x i16, y i16, health u16, size multiplier u8 (tenths)
+    projectile  id u32, x i16, y i16
+
+A keyframe carries every section, with every entity as changed. A delta only
+carries what differs, after quantization, from the message before it, so
+entities that don't move cost nothing.
+"""
+import select
+import socket
+import struct
+import threading
+import time
+from collections import deque, namedtuple
+from itertools import starmap
+from core.sim_thread import TowerState
+
+KEYFRAME = 1
+DELTA = 2
+SECTION_SCALARS = 1
+SECTION_PATH = 2
+STATUS_WAVE_IN_PROGRESS = 1
+STATUS_GAME_OVER = 2
+
+POSITION_SCALE = 8  # Quantization steps per pixel; i16 covers -4096..4096 px
+ANGLE_SCALE = 65536 / 360
+
+LENGTH = struct.Struct("<I")
+HEADER = struct.Struct("<BBI")
+SCALARS = struct.Struct("<iiiIIIfB")
+COUNT = struct.Struct("<I")
+POINT = struct.Struct("<hh")
+RECORDS = {
+    "towers": struct.Struct("<IhhBH"),
+    "enemies": struct.Struct("<IhhHB"),
+    "projectiles": struct.Struct("<Ihh"),
+}
+KINDS = ("towers", "enemies", "projectiles")
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 47800
+
+StreamScalars = namedtuple("StreamScalars", [
+    "money", "score", "lives", "wave", "enemies_defeated", "wave_enemy_count",
+    "cooldown_remaining", "wave_in_progress", "game_over",
+])
+
+
+class StreamError(ValueError):
+    pass
+
+
+def quantize(value):
+    value = int(round(value * POSITION_SCALE))
+    return -32768 if value < -32768 else 32767 if value > 32767 else value
+
+
+def quantize_scalars(snapshot):
+    cooldown = snapshot.cooldown_remaining
+    status = ((STATUS_WAVE_IN_PROGRESS if snapshot.wave_in_progress else 0) |
+              (STATUS_GAME_OVER if snapshot.game_over else 0))
+    return (int(snapshot.money), int(snapshot.score), snapshot.lives, snapshot.wave,
+            snapshot.enemies_defeated, snapshot.wave_enemy_count,
+            -1.0 if cooldown is None else cooldown, status)
+
+
+def quantize_entities(snapshot):
+    """
+    {kind: {id: record}} for a WorldSnapshot, each record the tuple packed on the wire.
+    """
+    towers = {}
+    for tower in snapshot.towers:
+        tower_id = (int(tower.x) & 0xFFFF) << 16 | (int(tower.y) & 0xFFFF)
+        towers[tower_id] = (tower_id, quantize(tower.x), quantize(tower.y), min(tower.level, 255),
+                            int(round(tower.turret_angle % 360 * ANGLE_SCALE)) & 0xFFFF)
+    enemies = {
+        enemy_id: (enemy_id, quantize(x), quantize(y),
+                   min(max(int(round(health)), 0), 65535), int(round(size_multiplier * 10)))
+        for enemy_id, x, y, health, size_multiplier in snapshot.enemies
+    }
+    projectiles = {
+        projectile_id: (projectile_id, quantize(x), quantize(y))
+        for projectile_id, x, y in snapshot.projectiles
+    }
+    return {"towers": towers, "enemies": enemies, "projectiles": projectiles}
+
+
+def pack_message(kind, tick, scalars, path, changes):
+    sections = (SECTION_SCALARS if scalars is not None else 0) | (SECTION_PATH if path is not None else 0)
+    parts = [HEADER.pack(kind, sections, tick & 0xFFFFFFFF)]
+    if scalars is not None:
+        parts.append(SCALARS.pack(*scalars))
+    if path is not None:
+        parts.append(COUNT.pack(len(path)))
+        parts.append(b"".join(starmap(POINT.pack, path)))
+    for name in KINDS:
+        changed, removed = changes[name]
+        parts.append(COUNT.pack(len(changed)))
+        parts.append(b"".join(starmap(RECORDS[name].pack, changed)))
+        parts.append(COUNT.pack(len(removed)))
+        parts.append(struct.pack(f"<{len(removed)}I", *removed))
+    body = b"".join(parts)
+    return LENGTH.pack(len(body)) + body
+
+
+class StreamEncoder:
+    """
+    Turns successive WorldSnapshots into messages. Remembers what it last sent,
+    so encode() only emits the difference and keyframe() can bring a new
+    observer up to the same point.
+    """
+
+    def __init__(self):
+        self.tick = 0
+        self.scalars = None
+        self.path_source = None  # CompiledPath the path points were taken from
+        self.path = None
+        self.entities = {name: {} for name in KINDS}
+
+    def encode(self, snapshot):
+        scalars = quantize_scalars(snapshot)
+        path = None
+        if snapshot.path is not self.path_source:  # Replaced, never modified, when edited
+            path = [(quantize(x), quantize(y)) for x, y in snapshot.path.points]
+            self.path_source = snapshot.path
+            self.path = path
+        entities = quantize_entities(snapshot)
+
+        changes = {}
+        for name in KINDS:
+            previous = self.entities[name]
+            current = entities[name]
+            changes[name] = (
+                [record for key, record in current.items() if previous.get(key) != record],
+                [key for key in previous if key not in current],
+            )
+        message = pack_message(DELTA, snapshot.tick, scalars if scalars != self.scalars else None,
+                               path, changes)
+        self.tick = snapshot.tick
+        self.scalars = scalars
+        self.entities = entities
+        return message
+
+    def keyframe(self):
+        if self.scalars is None:
+            raise StreamError("nothing has been encoded yet")
+        changes = {name: (list(self.entities[name].values()), []) for name in KINDS}
+        return pack_message(KEYFRAME, self.tick, self.scalars, self.path, changes)
+
+
+class StreamDecoder:
+    """
+    Rebuilds the world from a byte stream. feed() takes data in whatever pieces
+    it arrives; the state reflects every complete message so far.
+    """
+
+    def __init__(self):
+        self.buffer = bytearray()
+        self.synced = False  # Deltas are meaningless until the first keyframe
+        self.tick = None
+        self.scalars = None
+        self.path = []
+        self.path_version = 0  # Bumped when the path changes, so observers know to redraw it
+        self.entities = {name: {} for name in KINDS}
+        self.messages = 0
+        self.bytes = 0
+
+    def feed(self, data):
+        """
+        Add received bytes and apply every message they complete. Returns the
+        number of messages applied.
+        """
+        self.buffer += data
+        applied = 0
+        offset = 0
+        while len(self.buffer) - offset >= LENGTH.size:
+            (length,) = LENGTH.unpack_from(self.buffer, offset)
+            end = offset + LENGTH.size + length
+            if len(self.buffer) < end:
+                break
+            self.apply(bytes(self.buffer[offset + LENGTH.size:end]))
+            self.bytes += end - offset
+            offset = end
+            applied += 1
+        del self.buffer[:offset]
+        return applied
+
+    def apply(self, body):
+        try:
+            kind, sections, tick = HEADER.unpack_from(body, 0)
+            offset = HEADER.size
+            if kind == KEYFRAME:
+                self.synced = True
+                self.entities = {name: {} for name in KINDS}
+            elif kind != DELTA:
+                raise StreamError(f"unknown message kind {kind}")
+            elif not self.synced:
+                raise StreamError("delta received before a keyframe")
+
+            if sections & SECTION_SCALARS:
+                values = SCALARS.unpack_from(body, offset)
+                offset += SCALARS.size
+                cooldown = values[6]
+                self.scalars = StreamScalars(
+                    *values[:6], None if cooldown < 0 else cooldown,
+                    bool(values[7] & STATUS_WAVE_IN_PROGRESS), bool(values[7] & STATUS_GAME_OVER)
+                )
+            if sections & SECTION_PATH:
+                (count,) = COUNT.unpack_from(body, offset)
+                offset += COUNT.size
+                points = struct.unpack_from(f"<{2 * count}h", body, offset)
+                offset += POINT.size * count
+                self.path = [(points[i] / POSITION_SCALE, points[i + 1] / POSITION_SCALE)
+                             for i in range(0, len(points), 2)]
+                self.path_version += 1
+
+            for name in KINDS:
+                record = RECORDS[name]
+                table = self.entities[name]
+                (count,) = COUNT.unpack_from(body, offset)
+                offset += COUNT.size
+                for values in record.iter_unpack(body[offset:offset + record.size * count]):
+                    table[values[0]] = values
+                offset += record.size * count
+                (count,) = COUNT.unpack_from(body, offset)
+                offset += COUNT.size
+                for key in struct.unpack_from(f"<{count}I", body, offset):
+                    table.pop(key, None)
+                offset += 4 * count
+        except struct.error as e:
+            raise StreamError(f"truncated message: {e}")
+        self.tick = tick
+        self.messages += 1
+
+    def towers(self):
+        return [TowerState(x / POSITION_SCALE, y / POSITION_SCALE, level, angle / ANGLE_SCALE, None, None)
+                for _, x, y, level, angle in self.entities["towers"].values()]
+
+    def enemy_states(self):
+        return [(enemy_id, x / POSITION_SCALE, y / POSITION_SCALE, health, size / 10)
+                for enemy_id, x, y, health, size in self.entities["enemies"].values()]
+
+    def projectile_states(self):
+        return [(projectile_id, x / POSITION_SCALE, y / POSITION_SCALE)
+                for projectile_id, x, y in self.entities["projectiles"].values()]
+
+
+class ObserverConnection:
+    def __init__(self, sock, address):
+        self.sock = sock
+        self.address = address
+        self.synced = False
+        self.pending = deque()  # Messages not fully sent yet
+        self.offset = 0  # Bytes of pending[0] already sent
+        self.queued = 0
+
+    def send(self, message):
+        self.pending.append(message)
+        self.queued += len(message)
+        self.flush()
+
+    def flush(self):
+        while self.pending:
+            head = self.pending[0]
+            try:
+                sent = self.sock.send(memoryview(head)[self.offset:])
+            except BlockingIOError:
+                return
+            self.offset += sent
+            self.queued -= sent
+            if self.offset < len(head):
+                return
+            self.pending.popleft()
+            self.offset = 0
+
+    def drop_backlog(self):
+        # Keep a half-sent message so the stream stays framed; the rest is replaced by a keyframe
+        while len(self.pending) > (1 if self.offset else 0):
+            self.queued -= len(self.pending.pop())
+        self.synced = False
+
+
+class StreamServer:
+    """
+    Publishes the latest snapshot from `source` (a callable returning a
+    WorldSnapshot) to every connected observer, RATE times a second, from its
+    own thread. Nothing is encoded while no one is watching; observers that fall
+    MAX_BACKLOG bytes behind skip ahead to a fresh keyframe.
+    """
+
+    RATE = 30  # Messages per second; observers interpolate nothing, so this is their frame rate
+    MAX_BACKLOG = 1 << 20
+
+    def __init__(self, source, host=DEFAULT_HOST, port=DEFAULT_PORT):
+        self.source = source
+        self.host = host
+        self.port = port
+        self.listener = None
+        self.observers = {}  # Socket -> ObserverConnection
+        self.encoder = StreamEncoder()
+        self.last_snapshot = None
+        self.running = False
+        self.thread = None
+        # Bandwidth and encode cost, over every message sent
+        self.messages = 0
+        self.bytes = 0
+        self.encode_seconds = 0.0
+        self.entities = 0
+
+    def start(self):
+        listener = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        listener.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        try:
+            listener.bind((self.host, self.port))
+            listener.listen()
+        except OSError:
+            listener.close()
+            raise
+        listener.setblocking(False)
+        self.listener = listener
+        self.port = listener.getsockname()[1]  # The real port when 0 asked for any free one
+        self.running = True
+        self.thread = threading.Thread(target=self.run, name="stream", daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        self.running = False
+        if self.thread is not None:
+            self.thread.join()
+        self.thread = None
+        for sock in list(self.observers):
+            self.disconnect(sock)
+        if self.listener is not None:
+            self.listener.close()
+            self.listener = None
+
+    def stats(self):
+        messages = max(self.messages, 1)
+        return {
+            "observers": len(self.observers),
+            "messages": self.messages,
+            "bytes_per_message": round(self.bytes / messages, 1),
+            "encode_ms": round(self.encode_seconds / messages * 1000, 4),
+            "encode_us_per_entity": round(self.encode_seconds / max(self.entities, 1) * 1e6, 3),
+        }
+
+    # Stream thread
+
+    def run(self):
+        interval = 1.0 / self.RATE
+        next_publish = time.perf_counter()
+        while self.running:
+            readers = [self.listener] + list(self.observers)
+            writers = [sock for sock, observer in self.observers.items() if observer.pending]
+            timeout = max(0.0, next_publish - time.perf_counter())
+            readable, writable, _ = select.select(readers, writers, [], timeout)
+            for sock in readable:
+                if sock is self.listener:
+                    self.accept()
+                else:
+                    self.receive(sock)
+            for sock in writable:
+                if sock in self.observers:
+                    self.flush(sock)
+
+            now = time.perf_counter()
+            if now >= next_publish:
+                self.publish()
+                next_publish = max(next_publish + interval, now)
+
+    def accept(self):
+        try:
+            sock, address = self.listener.accept()
+        except BlockingIOError:
+            return
+        sock.setblocking(False)
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self.observers[sock] = ObserverConnection(sock, address)
+
+    def receive(self, sock):
+        # Observers never send anything; a readable socket means it closed
+        try:
+            data = sock.recv(4096)
+        except BlockingIOError:
+            return
+        except OSError:
+            data = b""
+        if not data:
+            self.disconnect(sock)
+
+    def flush(self, sock):
+        try:
+            self.observers[sock].flush()
+        except OSError:
+            self.disconnect(sock)
+
+    def disconnect(self, sock):
+        self.observers.pop(sock, None)
+        sock.close()
+
+    def publish(self):
+        if not self.observers:
+            self.last_snapshot = None  # Re-encode from scratch for the next observer
+            return
+        snapshot = self.source()
+        if snapshot is not self.last_snapshot:
+            started = time.perf_counter()
+            message = self.encoder.encode(snapshot)
+            self.encode_seconds += time.perf_counter() - started
+            self.messages += 1
+            self.bytes += len(message)
+            self.entities += len(snapshot.towers) + len(snapshot.enemies) + len(snapshot.projectiles)
+            self.last_snapshot = snapshot
+            self.send(message, synced=True)
+
+        if any(not observer.synced for observer in self.observers.values()):
+            self.send(self.encoder.keyframe(), synced=False)
+
+    def send(self, message, synced):
+        for sock, observer in list(self.observers.items()):
+            if observer.synced != synced:
+                continue
+            if observer.queued > self.MAX_BACKLOG:
+                observer.drop_backlog()
+                continue
+            try:
+                observer.send(message)
+            except OSError:
+                self.disconnect(sock)
+                continue
+            observer.synced = True
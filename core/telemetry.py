@@ -0,0 +1,209 @@
+"""
+Session telemetry: periodic samples, per-wave summaries and per-tower wave stats.
+
+The simulation pushes plain tuples into a fixed-size RingBuffer (attach with
+`sim.telemetry = Telemetry()`); a TelemetryWriter thread drains it to disk, so
+ticks never wait on file I/O. If the writer falls behind, the oldest records
+are dropped and counted rather than the buffer growing.
+
+Files written to the session directory, per record kind ("samples", "waves",
+"towers"): <kind>.csv with a header row, and/or one telemetry.jsonl with a
+"type" field on every line.
+"""
+import csv
+import json
+import os
+import shutil
+import threading
+from collections import deque
+
+FIELDS = {
+    "samples": ("tick", "money", "score", "lives", "wave", "enemies", "projectiles", "enemies_defeated"),
+    "waves": ("wave", "start_tick", "end_tick", "enemies", "kills", "leaks", "money_earned",
+              "wave_bonus", "lives", "money", "score", "game_over"),
+    "towers": ("wave", "tower", "x", "y", "level", "shots_fired", "damage_dealt"),
+}
+
+
+def prune_sessions(telemetry_dir, keep):
+    """
+    Delete all but the newest `keep` session_<time> directories in telemetry_dir.
+    Anything else there (such as batch output) is left alone.
+    """
+    try:
+        names = sorted(name for name in os.listdir(telemetry_dir)
+                       if name.startswith("session_") and os.path.isdir(os.path.join(telemetry_dir, name)))
+    except OSError:
+        return
+    for name in names[:max(len(names) - keep, 0)]:
+        shutil.rmtree(os.path.join(telemetry_dir, name), ignore_errors=True)
+
+
+class RingBuffer:
+    """
+    Fixed-capacity record queue for one producer and one consumer thread. push()
+    never blocks or allocates beyond the record; when full the oldest record is
+    overwritten and counted in `dropped`.
+    """
+
+    def __init__(self, capacity=4096):
+        self.records = deque(maxlen=capacity)  # Appends and pops are atomic
+        self.pushed = 0  # Only the producer writes this...
+        self.drained = 0  # ...and only the consumer this
+
+    def __len__(self):
+        return len(self.records)
+
+    def push(self, record):
+        self.records.append(record)
+        self.pushed += 1
+
+    def drain(self):
+        records = []
+        pop = self.records.popleft
+        while True:
+            try:
+                records.append(pop())
+            except IndexError:
+                break
+        self.drained += len(records)
+        return records
+
+    @property
+    def dropped(self):
+        return self.pushed - self.drained - len(self.records)
+
+
+class Telemetry:
+    """
+    Simulation hooks that turn game state into records. Only wave starts and ends
+    do any real work; after_tick() is one comparison on most ticks.
+    """
+
+    def __init__(self, sample_interval=60, capacity=4096):
+        self.sample_interval = sample_interval  # Ticks between samples (one per simulated second)
+        self.buffer = RingBuffer(capacity)
+        self.wave_start_tick = 0
+        self.wave_start_lives = None
+        self.tower_totals = {}  # Tower position -> (shots fired, damage dealt) at the last wave end
+        self.finished = False
+
+    def after_tick(self, sim):
+        if sim.tick_count % self.sample_interval == 0:
+            self.buffer.push(("samples", (
+                sim.tick_count, sim.money, sim.score, sim.lives, sim.wave,
+                len(sim.enemies), len(sim.projectiles), sim.enemies_defeated,
+            )))
+        if sim.game_over and not self.finished:
+            self.finished = True  # The wave that ended the game still gets its summary
+            self.wave_ended(sim, sim.wave, 0)
+
+    def wave_started(self, sim):
+        self.wave_start_tick = sim.tick_count
+        self.wave_start_lives = sim.lives
+
+    def wave_complete(self, sim, wave_bonus):
+        # check_wave_completion() has already moved on to the next wave number
+        self.wave_ended(sim, sim.wave - 1, wave_bonus)
+
+    def wave_ended(self, sim, wave, wave_bonus):
+        start_lives = sim.lives if self.wave_start_lives is None else self.wave_start_lives
+        kills = sim.enemies_defeated
+        self.buffer.push(("waves", (
+            wave, self.wave_start_tick, sim.tick_count, sim.wave_enemy_count, kills,
+            max(start_lives - sim.lives, 0), kills * sim.ENEMY_REWARD + wave_bonus, wave_bonus,
+            sim.lives, sim.money, sim.score, sim.game_over,
+        )))
+        totals = {}
+        for index, tower in enumerate(sim.towers):
+            key = (tower.x, tower.y)
+            shots, damage = self.tower_totals.get(key, (0, 0))
+            totals[key] = (tower.shots_fired, tower.damage_dealt)
+            self.buffer.push(("towers", (
+                wave, index, tower.x, tower.y, tower.level,
+                tower.shots_fired - shots, tower.damage_dealt - damage,
+            )))
+        self.tower_totals = totals
+        self.wave_start_lives = None
+
+
+class TelemetryWriter:
+    """
+    Background thread that drains a Telemetry buffer into `directory` every
+    `interval` seconds, in the given formats ("jsonl" and/or "csv").
+    """
+
+    def __init__(self, telemetry, directory, formats=("jsonl", "csv"), interval=1.0):
+        self.telemetry = telemetry
+        self.directory = directory
+        self.formats = formats
+        self.interval = interval
+        self.jsonl_file = None
+        self.csv_files = {}  # Kind -> (file, csv writer)
+        self.stopping = threading.Event()
+        self.thread = None
+        self.records_written = 0
+
+    def start(self):
+        os.makedirs(self.directory, exist_ok=True)
+        self.thread = threading.Thread(target=self.run, name="telemetry", daemon=True)
+        self.thread.start()
+
+    def close(self):
+        """
+        Stop the thread after a last flush and close the files.
+        """
+        self.stopping.set()
+        if self.thread is not None:
+            self.thread.join()
+            self.thread = None
+        else:
+            os.makedirs(self.directory, exist_ok=True)
+            self.flush()
+        if self.jsonl_file:
+            self.jsonl_file.close()
+            self.jsonl_file = None
+        for f, _ in self.csv_files.values():
+            f.close()
+        self.csv_files = {}
+
+    def run(self):
+        while not self.stopping.wait(self.interval):
+            self.flush()
+        self.flush()
+
+    def flush(self):
+        records = self.telemetry.buffer.drain()
+        if not records:
+            return
+        for kind, values in records:
+            if "jsonl" in self.formats:
+                self.write_jsonl(kind, values)
+            if "csv" in self.formats:
+                self.csv_writer(kind).writerow(values)
+        if self.jsonl_file:
+            self.jsonl_file.flush()
+        for f, _ in self.csv_files.values():
+            f.flush()
+        self.records_written += len(records)
+
+    def write_jsonl(self, kind, values):
+        if self.jsonl_file is None:
+            self.jsonl_file = open(os.path.join(self.directory, "telemetry.jsonl"), "a")
+        record = {"type": kind}
+        record.update(zip(FIELDS[kind], values))
+        self.jsonl_file.write(json.dumps(record) + "\n")
+
+    def csv_writer(self, kind):
+        if kind not in self.csv_files:
+            csv_file = os.path.join(self.directory, kind + ".csv")
+            new_file = not os.path.exists(csv_file)
+            f = open(csv_file, "a", newline="")
+            writer = csv.writer(f)
+            if new_file:
+                writer.writerow(FIELDS[kind])
+            self.csv_files[kind] = (f, writer)
+        return self.csv_files[kind][1]
+
+    def stats(self):
+        return {"written": self.records_written, "dropped": self.telemetry.buffer.dropped}
@@ -1,13 +1,26 @@
 import math
+from core.geometry import point_segment_distance
 
 class Projectile:
-    def __init__(self, x, y, target):
+    __slots__ = ("x", "y", "prev_x", "prev_y", "target", "source", "damage", "speed", "id")
+
+    def __init__(self, x, y, target, source=None):
+        self.reset(x, y, target, source)
+
+    def reset(self, x, y, target, source=None):
+        # Also used to recycle a pooled projectile (core.pool.ObjectPool)
         self.x = x
         self.y = y
+        self.prev_x = x  # Position at the start of the last update, for swept hits
+        self.prev_y = y
         self.target = target
+        self.source = source  # Tower that fired it, for damage statistics
+        self.damage = source.damage if source else 10  # The tower's damage when it fired
         self.speed = 10
+        self.id = None
 
     def update(self):
+        self.prev_x, self.prev_y = self.x, self.y
         dx = self.target.x - self.x
         dy = self.target.y - self.y
         distance = math.sqrt(dx**2 + dy**2)
@@ -17,5 +30,9 @@ class Projectile:
             self.y += (dy / distance) * self.speed
 
     def hit_target(self):
-        distance = math.sqrt((self.x - self.target.x)**2 + (self.y - self.target.y)**2)
-        return distance < 15  # Enemy radius
+        # Test the whole segment travelled this update against the enemy circle so
+        # fast projectiles can't step over their target
+        radius = 15 * self.target.size_multiplier  # Enemy radius
+        distance = point_segment_distance(self.target.x, self.target.y,
+                                          self.prev_x, self.prev_y, self.x, self.y)
+        return distance < radius
@@ -1,20 +1,27 @@
-import time
 import math
 
 class Tower:
+    __slots__ = ("x", "y", "range", "damage", "fire_rate", "last_shot", "level",
+                 "turret_angle", "target", "can_shoot", "shots_fired", "damage_dealt")
+
     def __init__(self, x, y):
         self.x = x
         self.y = y
         self.range = 150
         self.damage = 10
         self.fire_rate = 1.0  # seconds
-        self.last_shot = 0
+        self.last_shot = float('-inf')  # Simulation time of the last shot
         self.level = 1
         self.turret_angle = 0  # Initial turret angle
+        self.target = None  # Closest enemy in range, refreshed once per tick by update()
+        self.can_shoot = False
+        self.shots_fired = 0
+        self.damage_dealt = 0
 
-    def update(self, enemies):
-        self.can_shoot = time.time() - self.last_shot >= self.fire_rate
-        self.track_enemy(enemies)  # Update turret angle to track the closest enemy
+    def update(self, enemies, now):
+        self.can_shoot = now - self.last_shot >= self.fire_rate
+        self.target = self.get_closest_enemy(enemies)
+        self.track_enemy()  # Update turret angle to track the closest enemy
 
     def get_closest_enemy(self, enemies):
         closest = None
@@ -26,8 +33,8 @@ class Tower:
                 min_dist = dist
         return closest
 
-    def track_enemy(self, enemies):
-        closest_enemy = self.get_closest_enemy(enemies)
+    def track_enemy(self):
+        closest_enemy = self.target
         if closest_enemy:
             # Calculate the angle to the closest enemy
             dx = closest_enemy.x - self.x
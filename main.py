@@ -1,7 +1,14 @@
+import time
+started = time.perf_counter()  # Before anything else, so imports are part of the start-up time
+
+from core.startup import StartupTimer
+startup = StartupTimer(started)
 import tkinter as tk
 from core.game import TowerDefenseGame
+startup.mark("imports")
 
 if __name__ == "__main__":
     root = tk.Tk()
-    game = TowerDefenseGame(root)
+    startup.mark("tk")
+    game = TowerDefenseGame(root, startup=startup)
     root.mainloop()
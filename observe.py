@@ -0,0 +1,139 @@
+import argparse
+import socket
+import sys
+import time
+from core.path import CompiledPath
+from core.stream import StreamDecoder, StreamError, DEFAULT_HOST, DEFAULT_PORT
+
+
+def connect(host, port):
+    try:
+        return socket.create_connection((host, port))
+    except OSError as e:
+        sys.exit(f"Cannot reach the game at {host}:{port} ({e}); press F7 in the game to start streaming")
+
+
+def status_line(decoder, bytes_per_second):
+    scalars = decoder.scalars
+    return (f"tick {decoder.tick}  money {scalars.money}  lives {scalars.lives}  wave {scalars.wave}  "
+            f"towers {len(decoder.entities['towers'])}  enemies {len(decoder.entities['enemies'])}  "
+            f"projectiles {len(decoder.entities['projectiles'])}  {bytes_per_second / 1024:.1f} KiB/s")
+
+
+def run_headless(sock, interval):
+    # Rebuild the world and print a status line every `interval` seconds
+    decoder = StreamDecoder()
+    last_report = time.perf_counter()
+    last_bytes = 0
+    while True:
+        data = sock.recv(1 << 16)
+        if not data:
+            print("Stream closed")
+            return
+        decoder.feed(data)
+        now = time.perf_counter()
+        if decoder.synced and now - last_report >= interval:
+            print(status_line(decoder, (decoder.bytes - last_bytes) / (now - last_report)), flush=True)
+            last_report = now
+            last_bytes = decoder.bytes
+
+
+class ObserverWindow:
+    """
+    Spectator view: draws the streamed world with the game's own renderer and
+    path background, polling the socket from the Tk loop.
+    """
+
+    CANVAS_WIDTH = 800
+    CANVAS_HEIGHT = 600
+    PATH_SPRITE = "path.jpg"
+    POLL_MS = 15
+
+    def __init__(self, root, sock):
+        import tkinter as tk
+        from ui.background import BackgroundCache, load_sprite
+        from ui.renderer import CanvasRenderer
+
+        self.root = root
+        self.root.title("Tower Defense Observer")
+        self.sock = sock
+        self.sock.setblocking(False)
+        self.decoder = StreamDecoder()
+        self.canvas = tk.Canvas(root, width=self.CANVAS_WIDTH, height=self.CANVAS_HEIGHT)
+        self.canvas.pack()
+        self.status = tk.Label(root, anchor='w')
+        self.status.pack(fill='x')
+        self.renderer = CanvasRenderer(self.canvas, (self.CANVAS_WIDTH, self.CANVAS_HEIGHT))
+        self.background_cache = BackgroundCache(self.PATH_SPRITE, load_sprite(self.PATH_SPRITE).size,
+                                                self.CANVAS_WIDTH, self.CANVAS_HEIGHT)
+        self.background_image = None
+        self.path_version = 0
+        self.last_report = time.perf_counter()
+        self.last_bytes = 0
+        self.poll()
+
+    def poll(self):
+        try:
+            while True:
+                data = self.sock.recv(1 << 16)
+                if not data:
+                    self.root.title("Tower Defense Observer (stream closed)")
+                    return
+                self.decoder.feed(data)
+        except BlockingIOError:
+            pass
+        except (OSError, StreamError) as e:
+            self.root.title(f"Tower Defense Observer ({e})")
+            return
+
+        if self.decoder.synced:
+            self.draw()
+        self.root.after(self.POLL_MS, self.poll)
+
+    def draw(self):
+        from PIL import ImageTk
+        decoder = self.decoder
+        if decoder.path_version != self.path_version:
+            self.path_version = decoder.path_version
+            self.canvas.delete('path')
+            path = CompiledPath(decoder.path)
+            if len(path.points) > 1:
+                self.background_image = ImageTk.PhotoImage(self.background_cache.get(path))
+                self.canvas.create_image(0, 0, image=self.background_image, anchor='nw', tags='path')
+                self.canvas.tag_lower('path')
+        self.renderer.render(decoder.towers(), decoder.enemy_states(), decoder.projectile_states(), True)
+
+        now = time.perf_counter()
+        if now - self.last_report >= 1.0:
+            self.status.config(text=status_line(decoder, (decoder.bytes - self.last_bytes) / (now - self.last_report)))
+            self.last_report = now
+            self.last_bytes = decoder.bytes
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Watch a running game through its spectator stream (F7 in the game).")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--headless", action="store_true", help="print the reconstructed state instead of drawing it")
+    parser.add_argument("--interval", type=float, default=1.0, help="seconds between headless status lines")
+    args = parser.parse_args(argv)
+
+    sock = connect(args.host, args.port)
+    try:
+        if args.headless:
+            run_headless(sock, args.interval)
+        else:
+            import tkinter as tk
+            root = tk.Tk()
+            ObserverWindow(root, sock)
+            root.mainloop()
+    except KeyboardInterrupt:
+        pass
+    except StreamError as e:
+        sys.exit(f"Bad stream: {e}")
+    finally:
+        sock.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+import argparse
+import json
+import os
+import sys
+import time
+from core.batch import make_jobs, run_batch
+from core.levels import LEVELS_DIR, list_level_files
+
+
+def parse_setting(text):
+    # NAME=VALUE[,VALUE...], e.g. WAVE_COOLDOWN=5000,10000
+    name, _, values = text.partition("=")
+    if not name or not values:
+        raise argparse.ArgumentTypeError(f"expected NAME=VALUE[,VALUE...], got {text!r}")
+    return name, [parse_value(value) for value in values.split(",")]
+
+
+def parse_value(text):
+    # JSON values, with bare words taken as strings (COMBAT_MODEL=analytic)
+    try:
+        return json.loads(text)
+    except ValueError:
+        return text
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Run seeded headless games in parallel and print one JSON result per line.")
+    parser.add_argument("levels", nargs="*",
+                        help="level files or checkpoints (.tdc) to play (default: every level in levels/)")
+    parser.add_argument("--runs", type=int, default=1, help="seeds per level/layout/setting combination")
+    parser.add_argument("--waves", type=int, default=10, help="waves to play per game")
+    parser.add_argument("--seed", type=int, default=0, help="first seed")
+    parser.add_argument("--layouts", help="JSON file with a list of tower layouts ([[x, y], ...] each)")
+    parser.add_argument("--random-towers", type=int, default=0,
+                        help="place this many towers at seeded random grid cells instead")
+    parser.add_argument("--set", dest="settings", action="append", type=parse_setting, default=[],
+                        metavar="NAME=VALUES", help="Simulation constant to sweep, e.g. WAVE_COOLDOWN=5000,10000")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: all cores)")
+    parser.add_argument("--arrays", action="store_true", help="use the NumPy array-backed simulation")
+    parser.add_argument("--output", help="write results here instead of stdout")
+    parser.add_argument("--telemetry", metavar="DIR",
+                        help="write per-tick samples and per-wave/per-tower stats for every game under DIR")
+    args = parser.parse_args(argv)
+
+    level_files = args.levels or [os.path.join(LEVELS_DIR, f) for f in list_level_files()]
+    layouts = None
+    if args.layouts:
+        with open(args.layouts, "r") as f:
+            layouts = json.load(f)
+
+    try:
+        jobs = make_jobs(level_files, args.runs, args.waves, layouts=layouts,
+                         random_towers=args.random_towers, settings=dict(args.settings),
+                         base_seed=args.seed, use_arrays=args.arrays, telemetry_dir=args.telemetry)
+    except ValueError as e:
+        parser.error(str(e))
+
+    out = open(args.output, "w") if args.output else sys.stdout
+    started = time.perf_counter()
+    try:
+        for result in run_batch(jobs, workers=args.workers):
+            out.write(json.dumps(result) + "\n")
+    finally:
+        if args.output:
+            out.close()
+    print(f"{len(jobs)} games in {time.perf_counter() - started:.2f}s", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
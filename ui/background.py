@@ -0,0 +1,126 @@
+import hashlib
+import json
+import os
+
+# Decoded sprites, shared by every BackgroundCache in the process
+_sprites = {}
+
+
+def load_sprite(sprite_file, size=None, mode="RGBA"):
+    """
+    `sprite_file` decoded once per process, and resized once per `size`; later
+    calls return the same PIL image, which callers must not modify.
+    """
+    key = (sprite_file, tuple(size) if size else None, mode)
+    sprite = _sprites.get(key)
+    if sprite is None:
+        if size:
+            # Every size is made from the one decoded original
+            original = load_sprite(sprite_file, None, mode)
+            sprite = original if original.size == tuple(size) else original.resize(tuple(size))
+        else:
+            from PIL import Image  # PIL takes a while to import; only pay for it once something is drawn
+            with Image.open(sprite_file) as image:
+                sprite = image.convert(mode)
+        _sprites[key] = sprite
+    return sprite
+
+
+class BackgroundCache:
+    """
+    Rasterizes the static level (path sprites) into one canvas-sized image. Images
+    are keyed by a hash of everything that affects them, kept in memory for the
+    current path and optionally persisted as PNGs under levels/.cache.
+    """
+
+    SPRITE_INTERVAL = 40  # Distance between path sprites
+    CACHE_FILES_KEPT = 32  # Least recently used background PNGs beyond this are deleted
+
+    def __init__(self, sprite_file, sprite_size, width, height, cache_dir=os.path.join("levels", ".cache")):
+        self.sprite_file = sprite_file
+        self.sprite_size = sprite_size
+        self.width = width
+        self.height = height
+        self.cache_dir = cache_dir
+        self.last_key = None
+        self.last_image = None
+
+    def cache_key(self, path):
+        try:
+            sprite_mtime = os.path.getmtime(self.sprite_file)
+        except OSError:
+            sprite_mtime = 0
+        content = json.dumps([
+            [list(point) for point in path.points],
+            self.SPRITE_INTERVAL, list(self.sprite_size), self.width, self.height,
+            self.sprite_file, sprite_mtime,
+        ])
+        return hashlib.sha1(content.encode("utf-8")).hexdigest()
+
+    def cache_file(self, key):
+        return os.path.join(self.cache_dir, f"background_{key}.png")
+
+    def get(self, path, persist=False):
+        """
+        Background image for a CompiledPath. With persist=True the image is also
+        written to (or read back from) the on-disk cache; the editor leaves it off
+        so half-drawn paths don't pile up on disk.
+        """
+        from PIL import Image
+        key = self.cache_key(path)
+        if key == self.last_key:
+            image = self.last_image
+        else:
+            image = None
+            cache_file = self.cache_file(key)
+            if os.path.exists(cache_file):
+                try:
+                    image = Image.open(cache_file)
+                    image.load()
+                    os.utime(cache_file)  # Mark it recently used for prune()
+                except OSError:
+                    image = None  # Unreadable cache entry, render it again
+            if image is None:
+                image = self.render(path)
+            self.last_key = key
+            self.last_image = image
+
+        if persist:
+            cache_file = self.cache_file(key)
+            if not os.path.exists(cache_file):
+                os.makedirs(self.cache_dir, exist_ok=True)
+                image.save(cache_file)
+                self.prune()
+        return image
+
+    def prune(self):
+        # Keep the CACHE_FILES_KEPT most recently used backgrounds; other cache files are left alone
+        try:
+            names = [name for name in os.listdir(self.cache_dir)
+                     if name.startswith("background_") and name.endswith(".png")]
+            files = sorted((os.path.getmtime(os.path.join(self.cache_dir, name)), name) for name in names)
+        except OSError:
+            return
+        for _, name in files[:max(len(files) - self.CACHE_FILES_KEPT, 0)]:
+            try:
+                os.remove(os.path.join(self.cache_dir, name))
+            except OSError:
+                pass
+
+    def render(self, path):
+        from PIL import Image
+        image = Image.new("RGBA", (self.width, self.height), (0, 0, 0, 0))
+        if len(path.points) < 2:
+            return image
+
+        sprite = load_sprite(self.sprite_file, self.sprite_size)
+        half_width = self.sprite_size[0] // 2
+        half_height = self.sprite_size[1] // 2
+
+        # Same sprite placement as the old per-sprite canvas items, centred on the path
+        num_sprites = int(path.length / self.SPRITE_INTERVAL)
+        for i in range(num_sprites):
+            x, y = path.position_at(i * path.length / num_sprites)
+            position = (int(round(x)) - half_width, int(round(y)) - half_height)
+            image.paste(sprite, position, sprite)
+        return image
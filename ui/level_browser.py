@@ -0,0 +1,198 @@
+import hashlib
+import io
+import os
+import queue
+import threading
+import tkinter as tk
+from collections import OrderedDict
+from tkinter import ttk
+from PIL import Image, ImageTk
+from core.levels import LEVELS_DIR, LevelIndex, load_level_data, thumbnail_file
+
+
+class PhotoCache:
+    """
+    LRU of PhotoImages keyed by thumbnail hash. Only used from the Tk thread.
+    """
+
+    def __init__(self, capacity=64):
+        self.capacity = capacity
+        self.photos = OrderedDict()
+
+    def get(self, key):
+        photo = self.photos.get(key)
+        if photo is not None:
+            self.photos.move_to_end(key)
+        return photo
+
+    def put(self, key, photo):
+        self.photos[key] = photo
+        self.photos.move_to_end(key)
+        while len(self.photos) > self.capacity:
+            self.photos.popitem(last=False)
+
+
+class ThumbnailWorker(threading.Thread):
+    """
+    Owns the LevelIndex and does all file work off the Tk thread: refreshing the
+    index and decoding (or generating) thumbnails. Jobs go in through `jobs`,
+    finished work comes back through `results`; None stops the thread.
+    """
+
+    THUMBNAIL_SIZE = (128, 128)
+
+    def __init__(self, index, make_thumbnail):
+        super().__init__(daemon=True)
+        self.index = index
+        self.make_thumbnail = make_thumbnail
+        self.jobs = queue.Queue()
+        self.results = queue.Queue()
+
+    def run(self):
+        self.index.load()
+        while True:
+            job = self.jobs.get()
+            if job is None:
+                break
+            try:
+                if job[0] == "refresh":
+                    self.results.put(("index", self.index.refresh()))
+                elif job[0] == "thumbnail":
+                    name = job[1]["name"]
+                    image, digest = self.load_thumbnail(job[1])
+                    self.results.put(("thumbnail", name, digest, image))
+            except Exception as e:
+                self.results.put(("error", job, str(e)))
+
+            # Persist the index once the burst of work is done
+            if self.jobs.empty():
+                self.index.save()
+        self.index.save()
+
+    def load_thumbnail(self, entry):
+        levels_dir = self.index.levels_dir
+        thumb_file = thumbnail_file(levels_dir, entry["name"])
+        if not os.path.exists(thumb_file):
+            # Levels without a thumbnail get one generated from the level data
+            level_data = load_level_data(os.path.join(levels_dir, entry["file"]))
+            self.make_thumbnail(level_data).save(thumb_file)
+
+        with open(thumb_file, "rb") as f:
+            data = f.read()
+        digest = hashlib.sha1(data).hexdigest()
+        self.index.set_thumbnail(entry["name"], digest, os.path.getmtime(thumb_file))
+
+        image = Image.open(io.BytesIO(data))
+        if image.size != self.THUMBNAIL_SIZE:
+            image = image.resize(self.THUMBNAIL_SIZE, Image.Resampling.LANCZOS)  # Ensure thumbnail is 128x128
+        image.load()
+        return image, digest
+
+
+class LevelBrowser:
+    """
+    Paged "Load Level" window. It opens straight away; the level list and the
+    thumbnails of the visible page arrive from a ThumbnailWorker as they finish.
+    """
+
+    COLUMNS = 4
+    ROWS = 3
+    POLL_MS = 50
+
+    def __init__(self, root, on_select, make_thumbnail, photo_cache, levels_dir=LEVELS_DIR):
+        self.on_select = on_select  # Called with (level_file, window)
+        self.photo_cache = photo_cache
+        self.entries = []
+        self.page = 0
+        self.buttons = {}  # Level name -> button on the current page
+        self.pending = set()  # Level names with a thumbnail job queued
+
+        self.window = tk.Toplevel(root)
+        self.window.title("Load Level")
+        self.grid_frame = ttk.Frame(self.window)
+        self.grid_frame.pack(fill='both', expand=True)
+        nav_frame = ttk.Frame(self.window)
+        nav_frame.pack(fill='x', pady=5)
+        self.prev_button = ttk.Button(nav_frame, text="< Prev", command=lambda: self.show_page(self.page - 1))
+        self.prev_button.pack(side='left', padx=5)
+        self.page_label = ttk.Label(nav_frame, text="Loading levels...")
+        self.page_label.pack(side='left', expand=True)
+        self.next_button = ttk.Button(nav_frame, text="Next >", command=lambda: self.show_page(self.page + 1))
+        self.next_button.pack(side='right', padx=5)
+        self.placeholder = tk.PhotoImage(width=128, height=128)
+
+        self.worker = ThumbnailWorker(LevelIndex(levels_dir), make_thumbnail)
+        self.worker.start()
+        self.worker.jobs.put(("refresh",))
+        self.window.bind("<Destroy>", self.on_destroy)
+        self.poll()
+
+    def on_destroy(self, event):
+        if event.widget is self.window:
+            self.worker.jobs.put(None)
+
+    def poll(self):
+        if not self.window.winfo_exists():
+            return
+        while True:
+            try:
+                result = self.worker.results.get_nowait()
+            except queue.Empty:
+                break
+            if result[0] == "index":
+                self.entries = result[1]
+                self.show_page(self.page)
+            elif result[0] == "thumbnail":
+                self.thumbnail_ready(*result[1:])
+            elif result[0] == "error" and result[1][0] == "thumbnail":
+                self.pending.discard(result[1][1]["name"])
+        self.window.after(self.POLL_MS, self.poll)
+
+    def page_count(self):
+        per_page = self.COLUMNS * self.ROWS
+        return max(1, (len(self.entries) + per_page - 1) // per_page)
+
+    def show_page(self, page):
+        self.page = max(0, min(page, self.page_count() - 1))
+        for button in self.buttons.values():
+            button.destroy()
+        self.buttons = {}
+
+        per_page = self.COLUMNS * self.ROWS
+        visible = self.entries[self.page * per_page:(self.page + 1) * per_page]
+        for i, entry in enumerate(visible):
+            photo = None
+            if entry["thumbnail_hash"]:
+                photo = self.photo_cache.get(entry["thumbnail_hash"])
+            if photo is None and entry["name"] not in self.pending:
+                # Only entries on the visible page are ever decoded
+                self.pending.add(entry["name"])
+                self.worker.jobs.put(("thumbnail", entry))
+
+            button = ttk.Button(self.grid_frame, image=photo or self.placeholder, text=entry["name"],
+                                compound=tk.BOTTOM,
+                                command=lambda lf=entry["file"]: self.on_select(lf, self.window))
+            button.image = photo  # Keep a reference to avoid garbage collection
+            button.grid(row=i // self.COLUMNS, column=i % self.COLUMNS, padx=5, pady=5)
+            self.buttons[entry["name"]] = button
+
+        self.page_label.config(text=f"Page {self.page + 1} of {self.page_count()} "
+                                    f"({len(self.entries)} levels)")
+        self.prev_button.config(state='normal' if self.page > 0 else 'disabled')
+        self.next_button.config(state='normal' if self.page < self.page_count() - 1 else 'disabled')
+
+    def thumbnail_ready(self, name, digest, image):
+        self.pending.discard(name)
+        photo = self.photo_cache.get(digest)
+        if photo is None:
+            photo = ImageTk.PhotoImage(image)
+            self.photo_cache.put(digest, photo)
+        for entry in self.entries:
+            if entry["name"] == name:
+                entry["thumbnail_hash"] = digest
+                break
+
+        button = self.buttons.get(name)
+        if button is not None:
+            button.config(image=photo)
+            button.image = photo
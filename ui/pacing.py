@@ -0,0 +1,44 @@
+class FramePacer:
+    """
+    Schedules Tk frames against a fixed timeline instead of "work + 16 ms", and
+    steps the renderer's level of detail up or down as the share of the frame
+    budget spent on work crosses the thresholds.
+    """
+
+    def __init__(self, target_fps=60, raise_load=0.9, lower_load=0.5, window=30, max_level=2):
+        self.period = 1.0 / target_fps
+        self.raise_load = raise_load  # Average work / period above which detail drops
+        self.lower_load = lower_load  # ...and below which it comes back
+        self.window = window  # Frames averaged, and the minimum frames between changes
+        self.max_level = max_level
+        self.level = 0  # 0 is full detail
+        self.load = 0.0  # Moving average of work / period
+        self.next_frame = None
+        self.frames_at_level = 0
+
+    def end_frame(self, frame_started, now):
+        """
+        Record a frame's work (frame_started to now) and return the delay in ms
+        before the next frame should start.
+        """
+        work = now - frame_started
+        self.load += (work / self.period - self.load) / self.window
+        self.update_level()
+
+        if self.next_frame is None:
+            self.next_frame = frame_started
+        self.next_frame += self.period
+        if self.next_frame < now:
+            self.next_frame = now  # Overran; start again from here rather than bursting
+        return max(1, int(round((self.next_frame - now) * 1000)))
+
+    def update_level(self):
+        self.frames_at_level += 1
+        if self.frames_at_level < self.window:
+            return
+        if self.load > self.raise_load and self.level < self.max_level:
+            self.level += 1
+            self.frames_at_level = 0
+        elif self.load < self.lower_load and self.level > 0:
+            self.level -= 1
+            self.frames_at_level = 0
@@ -0,0 +1,253 @@
+import math
+
+
+class CanvasRenderer:
+    """
+    Retained-mode drawing of towers, enemies and projectiles. Canvas items are
+    created when an entity first appears, moved with coords()/itemconfig() only
+    when what they show has changed, and deleted when the entity goes away.
+
+    Given a viewport, entities outside it are not drawn. The `lod` argument of
+    render() trades detail for speed: LOD_NO_HEALTH_TEXT drops the health labels,
+    LOD_CLUSTERS also draws crowded grid cells as one marker with a count.
+    """
+
+    TURRET_LENGTH = 20
+    ENEMY_RADIUS = 15
+    PROJECTILE_RADIUS = 5
+    CULL_MARGIN = 40  # Largest enemy radius plus its health label
+
+    LOD_FULL = 0
+    LOD_NO_HEALTH_TEXT = 1
+    LOD_CLUSTERS = 2
+
+    def __init__(self, canvas, viewport=None, cluster_cell=60, cluster_min_enemies=6):
+        self.canvas = canvas
+        self.viewport = viewport  # (width, height) to cull against, or None
+        self.cluster_cell = cluster_cell  # Size of the grid cells enemies are clustered in
+        self.cluster_min_enemies = cluster_min_enemies  # Enemies a cell needs to become a marker
+        self.tower_items = {}  # Tower position -> [base, turret, label, drawn state]
+        self.enemy_items = {}  # Enemy id -> [oval, shadow text, text, drawn state]
+        self.projectile_items = {}  # Projectile id -> [oval, drawn position]
+        self.cluster_items = {}  # Grid cell -> [oval, text, drawn state]
+
+    def clear(self):
+        for items in self.tower_items.values():
+            self.canvas.delete(*items[:3])
+        for items in self.enemy_items.values():
+            self.canvas.delete(*[item for item in items[:3] if item])
+        for items in self.projectile_items.values():
+            self.canvas.delete(items[0])
+        for items in self.cluster_items.values():
+            self.canvas.delete(*items[:2])
+        self.tower_items = {}
+        self.enemy_items = {}
+        self.projectile_items = {}
+        self.cluster_items = {}
+
+    def item_count(self):
+        return (3 * len(self.tower_items) +
+                sum(1 + (2 if items[1] else 0) for items in self.enemy_items.values()) +
+                len(self.projectile_items) + 2 * len(self.cluster_items))
+
+    def render(self, towers, enemy_states, projectile_states, show_enemy_health, lod=LOD_FULL):
+        """
+        `towers` are Tower objects or snapshot TowerStates (anything with x, y,
+        level and turret_angle); towers are told apart by position.
+        """
+        if self.viewport:
+            enemy_states = self.cull(enemy_states)
+            projectile_states = self.cull(projectile_states)
+        clusters = []
+        if lod >= self.LOD_CLUSTERS:
+            enemy_states, clusters = self.cluster(enemy_states)
+
+        created = self.render_towers(towers)
+        created |= self.render_enemies(enemy_states, show_enemy_health and lod < self.LOD_NO_HEALTH_TEXT)
+        created |= self.render_clusters(clusters)
+        created |= self.render_projectiles(projectile_states)
+
+        # New items land on top of older ones; restore the usual stacking order
+        if created:
+            self.canvas.tag_raise('enemy')
+            self.canvas.tag_raise('projectile')
+
+    def render_towers(self, towers):
+        canvas = self.canvas
+        created = False
+        seen = set()
+        for tower in towers:
+            key = (tower.x, tower.y)
+            seen.add(key)
+            state = (tower.turret_angle, tower.level)
+            items = self.tower_items.get(key)
+            if items is None:
+                # Draw the base of the tower, the rotating turret and the tower level
+                base = canvas.create_oval(
+                    tower.x - 25, tower.y - 25,
+                    tower.x + 25, tower.y + 25,
+                    fill='blue', tags=('game_object', 'tower')
+                )
+                turret = canvas.create_line(
+                    *self.turret_coords(tower),
+                    fill='white', width=4, tags=('game_object', 'tower')
+                )
+                label = canvas.create_text(
+                    tower.x, tower.y,
+                    text=str(tower.level),
+                    fill='white',
+                    font=("Arial", 12),
+                    tags=('game_object', 'tower')
+                )
+                self.tower_items[key] = [base, turret, label, state]
+                created = True
+            elif items[3] != state:
+                if items[3][0] != tower.turret_angle:
+                    canvas.coords(items[1], *self.turret_coords(tower))
+                if items[3][1] != tower.level:
+                    canvas.itemconfig(items[2], text=str(tower.level))
+                items[3] = state
+
+        for key in [key for key in self.tower_items if key not in seen]:
+            canvas.delete(*self.tower_items.pop(key)[:3])
+        return created
+
+    def turret_coords(self, tower):
+        angle = math.radians(tower.turret_angle)
+        return (tower.x, tower.y,
+                tower.x + self.TURRET_LENGTH * math.cos(angle),
+                tower.y + self.TURRET_LENGTH * math.sin(angle))
+
+    def render_enemies(self, enemy_states, show_enemy_health):
+        canvas = self.canvas
+        created = False
+        seen = set()
+        for enemy_id, x, y, health, size_multiplier in enemy_states:
+            seen.add(enemy_id)
+            radius = self.ENEMY_RADIUS * size_multiplier  # Adjust radius based on size multiplier
+            health_percentage = int((health / 100) * 100)  # Assuming base health is 100
+            items = self.enemy_items.get(enemy_id)
+            if items is None:
+                oval = canvas.create_oval(
+                    x - radius, y - radius,
+                    x + radius, y + radius,
+                    fill='red', tags=('game_object', 'enemy')
+                )
+                items = self.enemy_items[enemy_id] = [oval, None, None, (x, y, None)]
+                created = True
+            elif items[3][:2] != (x, y):
+                canvas.coords(items[0], x - radius, y - radius, x + radius, y + radius)
+                if items[1]:
+                    canvas.coords(items[1], x + 1, y - radius - 4)
+                    canvas.coords(items[2], x, y - radius - 5)
+
+            if show_enemy_health and not items[1]:
+                text = f"{health_percentage}%"
+                # Drop shadow, then the actual health text above the enemy
+                items[1] = canvas.create_text(
+                    x + 1, y - radius - 4,
+                    text=text, fill='black', font=("Arial", 8),
+                    tags=('game_object', 'enemy')
+                )
+                items[2] = canvas.create_text(
+                    x, y - radius - 5,
+                    text=text, fill='white', font=("Arial", 8),
+                    tags=('game_object', 'enemy')
+                )
+                created = True
+            elif not show_enemy_health and items[1]:
+                canvas.delete(items[1], items[2])
+                items[1] = items[2] = None
+            elif items[1] and items[3][2] != health_percentage:
+                text = f"{health_percentage}%"
+                canvas.itemconfig(items[1], text=text)
+                canvas.itemconfig(items[2], text=text)
+            items[3] = (x, y, health_percentage)
+
+        for enemy_id in [enemy_id for enemy_id in self.enemy_items if enemy_id not in seen]:
+            items = self.enemy_items.pop(enemy_id)
+            canvas.delete(*[item for item in items[:3] if item])
+        return created
+
+    def cull(self, states):
+        width, height = self.viewport
+        margin = self.CULL_MARGIN
+        return [state for state in states
+                if -margin <= state[1] <= width + margin and -margin <= state[2] <= height + margin]
+
+    def cluster(self, enemy_states):
+        """
+        Split enemies into those drawn on their own and (cell, count, x, y) for
+        every grid cell with at least cluster_min_enemies, centred on its enemies.
+        """
+        cell_size = self.cluster_cell
+        cells = {}
+        for state in enemy_states:
+            cells.setdefault((int(state[1] // cell_size), int(state[2] // cell_size)), []).append(state)
+
+        single = []
+        clusters = []
+        for cell, members in cells.items():
+            if len(members) < self.cluster_min_enemies:
+                single.extend(members)
+            else:
+                x = sum(state[1] for state in members) / len(members)
+                y = sum(state[2] for state in members) / len(members)
+                clusters.append((cell, len(members), x, y))
+        return single, clusters
+
+    def render_clusters(self, clusters):
+        canvas = self.canvas
+        created = False
+        seen = set()
+        for cell, count, x, y in clusters:
+            seen.add(cell)
+            radius = self.ENEMY_RADIUS * min(2.5, 1 + count / 10)  # Grows with the crowd
+            state = (round(x), round(y), count)
+            items = self.cluster_items.get(cell)
+            if items is None:
+                oval = canvas.create_oval(
+                    x - radius, y - radius,
+                    x + radius, y + radius,
+                    fill='darkred', outline='red', width=2, tags=('game_object', 'enemy')
+                )
+                text = canvas.create_text(
+                    x, y, text=str(count), fill='white', font=("Arial", 10, "bold"),
+                    tags=('game_object', 'enemy')
+                )
+                self.cluster_items[cell] = [oval, text, state]
+                created = True
+            elif items[2] != state:
+                canvas.coords(items[0], x - radius, y - radius, x + radius, y + radius)
+                canvas.coords(items[1], x, y)
+                if items[2][2] != count:
+                    canvas.itemconfig(items[1], text=str(count))
+                items[2] = state
+
+        for cell in [cell for cell in self.cluster_items if cell not in seen]:
+            canvas.delete(*self.cluster_items.pop(cell)[:2])
+        return created
+
+    def render_projectiles(self, projectile_states):
+        canvas = self.canvas
+        r = self.PROJECTILE_RADIUS
+        created = False
+        seen = set()
+        for projectile_id, x, y in projectile_states:
+            seen.add(projectile_id)
+            items = self.projectile_items.get(projectile_id)
+            if items is None:
+                oval = canvas.create_oval(
+                    x - r, y - r,
+                    x + r, y + r,
+                    fill='yellow', tags=('game_object', 'projectile')
+                )
+                self.projectile_items[projectile_id] = [oval, (x, y)]
+                created = True
+            elif items[1] != (x, y):
+                canvas.coords(items[0], x - r, y - r, x + r, y + r)
+                items[1] = (x, y)
+
+        for projectile_id in [pid for pid in self.projectile_items if pid not in seen]:
+            canvas.delete(self.projectile_items.pop(projectile_id)[0])
+        return created